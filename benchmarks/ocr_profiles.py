@@ -0,0 +1,116 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A benchmark comparing the accuracy and latency of each OCR preprocessing profile.
+-----------------'''
+
+#---Imports---#
+import argparse
+import difflib
+import json
+import random
+import time
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from raddish.ocr_engine import DEFAULT_PSM, getOCREngine
+from raddish.ocr_preprocess import PROFILES
+
+#---Constants---#
+# Words the synthetic labels are built from
+WORDS = ('Submit', 'Cancel', 'Username', 'Password', 'Settings', 'Total', 'Invoice', 'Search', 'Apply', 'Export', \
+         'Quantity', 'Remember', 'Account', 'Status', 'Pending', 'Approved', '2024', '$1,299.00', 'ID-4471')
+
+# The font sizes labels are drawn at, typical of desktop UIs
+FONT_SIZES = (11, 13, 16)
+
+# The themes labels are drawn in as (background, text)
+THEMES = {'light': (245, 30), 'dark': (35, 220)}
+
+
+def makeSamples(count : int, seed : int = 0) -> list[tuple]:
+    '''
+    Draw synthetic UI labels, returning each as (image, text, theme, font size).
+    '''
+    rng = random.Random(seed)
+    samples = []
+    for index in range(count):
+        text = ' '.join(rng.sample(WORDS, rng.randint(1, 3)))
+        size = FONT_SIZES[index % len(FONT_SIZES)]
+        theme = list(THEMES)[index // len(FONT_SIZES) % len(THEMES)]
+        background, foreground = THEMES[theme]
+
+        font = _loadFont(size)
+        left, top, right, bottom = font.getbbox(text)
+        image = Image.new('RGB', (right - left + 8, bottom - top + 6), (background,) * 3)
+        ImageDraw.Draw(image).text((4 - left, 3 - top), text, fill=(foreground,) * 3, font=font)
+        samples.append((np.asarray(image), text, theme, size))
+    return samples
+
+def runBenchmark(samples : list[tuple], profiles : list[str], ocr : bool = True) -> dict:
+    '''
+    Prepare and read every sample with every profile, returning the latency and accuracy of each.
+    '''
+    engine = getOCREngine()
+    results = {}
+    for name in profiles:
+        pipeline = PROFILES[name]
+        psm = pipeline.psm if pipeline.psm != None else DEFAULT_PSM
+        prepare, read, exact, similarity = [], [], 0, []
+
+        # Warm the pipeline's buffers and the engine's worker up before timing anything
+        pipeline(samples[0][0])
+        for image, text, _, _ in samples:
+            start = time.perf_counter()
+            prepared = pipeline(image)
+            prepare.append(time.perf_counter() - start)
+
+            if not ocr:
+                continue
+            start = time.perf_counter()
+            found = engine.read(prepared, psm=psm).strip()
+            read.append(time.perf_counter() - start)
+            exact += found == text
+            similarity.append(difflib.SequenceMatcher(None, found, text).ratio())
+
+        results[name] = {
+            'prepare_ms': 1000 * float(np.median(prepare)),
+            'read_ms': 1000 * float(np.median(read)) if read else None,
+            'exact': exact / len(samples) if ocr else None,
+            'similarity': float(np.mean(similarity)) if ocr else None,
+        }
+    return results
+
+
+#---Internal Functions---#
+def _loadFont(size : int) -> ImageFont.ImageFont:
+    '''
+    Load a common sans serif font at the given size, falling back to PIL's built in font.
+    '''
+    for name in ('DejaVuSans.ttf', 'Arial.ttf', 'LiberationSans-Regular.ttf'):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+def _format(value, pattern : str) -> str:
+    return '-' if value == None else pattern.format(value)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the OCR preprocessing profiles.')
+    parser.add_argument('--samples', type=int, default=60, help='The number of synthetic labels to read.')
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), help='The profiles to compare.')
+    parser.add_argument('--no-ocr', action='store_true', help='Only time the preprocessing, without reading any text.')
+    parser.add_argument('--json', help='A file to write the results to as JSON.')
+    arguments = parser.parse_args()
+
+    results = runBenchmark(makeSamples(arguments.samples), arguments.profiles, ocr=not arguments.no_ocr)
+    print(f"{'profile':<10} {'prepare ms':>10} {'read ms':>8} {'exact':>6} {'similar':>8}")
+    for name, result in results.items():
+        print(f"{name:<10} {result['prepare_ms']:>10.3f} {_format(result['read_ms'], '{:.1f}'):>8} "
+              f"{_format(result['exact'], '{:.0%}'):>6} {_format(result['similarity'], '{:.3f}'):>8}")
+
+    if arguments.json != None:
+        with open(arguments.json, 'w') as file:
+            json.dump(results, file, indent=2)
@@ -0,0 +1,267 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A benchmark suite measuring raddish searches against synthetic screens.
+-----------------'''
+
+#---Imports---#
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from PIL import Image, ImageDraw
+from raddish.frame_source import setFrameSource
+from raddish.image_search import locateImage, locateAllImages, waitForImage
+from raddish.text_reader import readText
+from benchmarks.synthetic import SyntheticFrameSource, loadTemplates, makeScreen, plant
+from benchmarks.ocr_profiles import _loadFont
+
+#---Constants---#
+# The resolutions screens are generated at, with the DPI scale their templates are enlarged by
+RESOLUTIONS = {'1280x720': 1, '1920x1080': 1, '3840x2160': 2}
+
+# The directory results are stored in, one file per commit
+RESULTS = os.path.join(os.path.dirname(__file__), 'results')
+
+# A case is flagged as a regression if its median gets this much slower
+REGRESSION_THRESHOLD = 0.10
+
+# The text drawn on screens for the OCR case
+OCR_TEXT = 'Invoice Total 1299'
+
+
+class Screen:
+    '''
+    A synthetic screen with templates planted at known positions. The templates are written
+     to a temporary directory so they are searched for by path, as in a real test.
+    '''
+
+    def __init__(self, resolution : str, seed : int = 0):
+        width, height = (int(value) for value in resolution.split('x'))
+        self.scale = RESOLUTIONS.get(resolution, 1)
+        pixels = loadTemplates(self.scale)
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.templates = {}
+        for name, template in pixels.items():
+            self.templates[name] = os.path.join(self.directory.name, os.path.splitext(name)[0] + '.png')
+            Image.fromarray(template).save(self.templates[name])
+
+        # A label for OCR, drawn in the top left corner where nothing is planted over it
+        image = Image.fromarray(makeScreen(width, height, seed))
+        font = _loadFont(16 * self.scale)
+        left, top, right, bottom = font.getbbox(OCR_TEXT)
+        self.label = [8, 8, right - left + 16, bottom - top + 12]
+        ImageDraw.Draw(image).rectangle([8, 8, 8 + self.label[2], 8 + self.label[3]], fill=(250, 250, 250))
+        ImageDraw.Draw(image).text((16 - left, 14 - top), OCR_TEXT, fill=(20, 20, 20), font=font)
+
+        # One screen with every template planted once, and one with several copies of each
+        self.pixels = np.asarray(image).copy()
+        self.blank = self.pixels.copy()
+        self.positions = plant(self.pixels, pixels, seed, reserved=[self.label])
+        self.crowded = makeScreen(width, height, seed + 1)
+        self.crowded_positions = plant(self.crowded, pixels, seed + 1, copies=4)
+
+
+#---Cases---#
+def caseLocate(screen : Screen) -> bool:
+    '''
+    Locate every template once on the full screen, without location hints.
+    '''
+    setFrameSource(SyntheticFrameSource([screen.pixels]))
+    correct = True
+    for name, template in screen.templates.items():
+        found = locateImage(template, hints=False)
+        correct &= (found.left, found.top) in screen.positions[name]
+    return correct
+
+def caseLocateHinted(screen : Screen) -> bool:
+    '''
+    Locate every template once with location hints, which are warmed up on the first repeat.
+    '''
+    setFrameSource(SyntheticFrameSource([screen.pixels]))
+    correct = True
+    for name, template in screen.templates.items():
+        found = locateImage(template)
+        correct &= (found.left, found.top) in screen.positions[name]
+    return correct
+
+def caseLocateAll(screen : Screen) -> bool:
+    '''
+    Locate every copy of every template on a crowded screen.
+    '''
+    setFrameSource(SyntheticFrameSource([screen.crowded]))
+    correct = True
+    for name, template in screen.templates.items():
+        found = {(box.left, box.top) for box in locateAllImages(template)}
+        correct &= found == set(screen.crowded_positions[name])
+    return correct
+
+def caseWait(screen : Screen) -> bool:
+    '''
+    Wait for a template that appears on the third capture.
+    '''
+    name, template = next(iter(screen.templates.items()))
+    setFrameSource(SyntheticFrameSource([screen.blank, screen.blank, screen.pixels]))
+    found = waitForImage(template, timeout=5, hints=False)
+    return (found.left, found.top) in screen.positions[name]
+
+def caseOCR(screen : Screen) -> bool:
+    '''
+    Read the label drawn on the screen.
+    '''
+    setFrameSource(SyntheticFrameSource([screen.pixels]))
+    return readText(screen.label, preprocess='label').strip() == OCR_TEXT
+
+CASES = {
+    'locate': caseLocate,
+    'locate_hinted': caseLocateHinted,
+    'locate_all': caseLocateAll,
+    'wait': caseWait,
+    'ocr': caseOCR,
+}
+
+
+def runSuite(resolutions : list[str], cases : list[str], repeats : int = 5) -> dict:
+    '''
+    Run every case at every resolution, measuring latency over several repeats and the peak
+     memory allocated by one further run.
+
+    Returns
+    -------
+    dict
+        The environment the suite ran in and the results of each case keyed by 'case@resolution'.
+    '''
+    results = {}
+    for resolution in resolutions:
+        screen = Screen(resolution)
+        for name in cases:
+            key = f'{name}@{resolution}'
+            try:
+                # Warm up caches and workers before timing anything
+                CASES[name](screen)
+                timings, correct = [], True
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    correct &= CASES[name](screen)
+                    timings.append(time.perf_counter() - start)
+
+                tracemalloc.start()
+                CASES[name](screen)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            except Exception as e:
+                results[key] = {'error': f'{type(e).__name__}: {e}'}
+                continue
+            finally:
+                setFrameSource(None)
+
+            results[key] = {
+                'median_ms': 1000 * float(np.median(timings)),
+                'p95_ms': 1000 * float(np.percentile(timings, 95)),
+                'min_ms': 1000 * float(np.min(timings)),
+                'peak_kib': peak / 1024,
+                'correct': bool(correct),
+            }
+
+    return {'commit': _commit(), 'timestamp': datetime.datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(), \
+            'numpy': np.__version__, 'machine': platform.machine(), 'cpus': os.cpu_count(), 'repeats': repeats, 'results': results}
+
+def saveResults(results : dict, directory : str = RESULTS) -> str:
+    '''
+    Save results under the commit they were measured at, returning the path written.
+    '''
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{results['commit']}.json")
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+    return path
+
+def loadResults(name : str, directory : str = RESULTS) -> dict:
+    '''
+    Load results by commit, or from a path.
+    '''
+    path = name if os.path.exists(name) else os.path.join(directory, f'{name}.json')
+    with open(path) as file:
+        return json.load(file)
+
+def compare(base : dict, head : dict, threshold : float = REGRESSION_THRESHOLD) -> tuple[str, bool]:
+    '''
+    Compare two sets of results case by case.
+
+    Returns
+    -------
+    tuple[str, bool]
+        A text table of the change in each case, and whether any case regressed.
+    '''
+    lines = [f"{'case':<28} {base['commit'][:12]:>12} {head['commit'][:12]:>12} {'change':>8}"]
+    regressed = False
+    for key in sorted(set(base['results']) | set(head['results'])):
+        before, after = base['results'].get(key, {}), head['results'].get(key, {})
+        if 'median_ms' not in before or 'median_ms' not in after:
+            lines.append(f"{key:<28} {before.get('median_ms', '-'):>12} {after.get('median_ms', '-'):>12}")
+            continue
+
+        change = after['median_ms'] / before['median_ms'] - 1 if before['median_ms'] > 0 else 0.0
+        flag = ''
+        if change > threshold:
+            flag, regressed = ' slower', True
+        if before.get('correct') and not after.get('correct'):
+            flag, regressed = flag + ' incorrect', True
+        lines.append(f"{key:<28} {before['median_ms']:>12.2f} {after['median_ms']:>12.2f} {change:>+8.1%}{flag}")
+    return '\n'.join(lines), regressed
+
+def formatResults(results : dict) -> str:
+    '''
+    Format results as a text table.
+    '''
+    lines = [f"{'case':<28} {'median ms':>10} {'p95 ms':>10} {'peak KiB':>10} {'correct':>8}"]
+    for key, result in results['results'].items():
+        if 'error' in result:
+            lines.append(f"{key:<28} {result['error']}")
+        else:
+            lines.append(f"{key:<28} {result['median_ms']:>10.2f} {result['p95_ms']:>10.2f} {result['peak_kib']:>10.0f} {str(result['correct']):>8}")
+    return '\n'.join(lines)
+
+
+#---Internal Functions---#
+def _commit() -> str:
+    '''
+    Return the short hash of the checked out commit, marked if the tree has changes.
+    '''
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short=12', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark raddish against synthetic screens, with no display needed for captures.')
+    parser.add_argument('--resolutions', nargs='+', default=list(RESOLUTIONS), help='The resolutions to run at, such as 1920x1080.')
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES), help='The cases to run.')
+    parser.add_argument('--repeats', type=int, default=5, help='The number of timed runs of each case.')
+    parser.add_argument('--save', action='store_true', help='Store the results under benchmarks/results/<commit>.json.')
+    parser.add_argument('--compare', nargs='+', metavar='COMMIT', help='Compare stored results of one commit against another, '
+                        'or against a fresh run if only one is given.')
+    arguments = parser.parse_args()
+
+    if arguments.compare != None and len(arguments.compare) == 2:
+        head = loadResults(arguments.compare[1])
+    else:
+        head = runSuite(arguments.resolutions, arguments.cases, arguments.repeats)
+        print(formatResults(head))
+        if arguments.save:
+            print(f'\nSaved to {saveResults(head)}')
+
+    if arguments.compare != None:
+        table, regressed = compare(loadResults(arguments.compare[0]), head)
+        print('\n' + table)
+        raise SystemExit(1 if regressed else 0)
@@ -0,0 +1,185 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing synthetic desktop screens and the frame source that serves them.
+-----------------'''
+
+#---Imports---#
+import glob
+import os
+import numpy as np
+from PIL import Image, ImageDraw
+from raddish.frame_source import Frame, FrameSource
+
+#---Constants---#
+# The directory holding the templates that are planted into screens
+RESOURCES = os.path.join(os.path.dirname(__file__), '..', 'raddish', 'tests', 'resources')
+
+# Templates too large to plant on every benchmarked resolution
+EXCLUDED_TEMPLATES = ('SRbasedimages.PNG',)
+
+# The palettes screens are drawn in as (desktop, window, title bar, text)
+PALETTES = {
+    'light': ((58, 110, 165), (243, 243, 243), (222, 225, 230), (40, 40, 40)),
+    'dark': ((20, 24, 30), (37, 37, 38), (51, 51, 52), (212, 212, 212)),
+}
+
+
+class SyntheticFrameSource(FrameSource):
+    '''
+    Serves a synthetic screen as if it were captured. Unlike 'ArrayFrameSource', every grab
+     returns a new 'Frame', so no grayscale conversion or pyramid is carried over from one
+     search to the next, just as with real captures.
+    '''
+
+    def __init__(self, frames : list[np.ndarray]):
+        '''
+        Initialize the 'SyntheticFrameSource' object.
+
+        Parameters
+        ----------
+        frames : list[np.ndarray]
+            The screens to serve in order. The last one is served again once the others are used up.
+        '''
+        self.frames = frames
+        self.index = 0
+
+    def grab(self, region : list[int] = None) -> Frame:
+        pixels = self.frames[min(self.index, len(self.frames) - 1)]
+        self.index += 1
+        frame = Frame(pixels)
+        return frame if region == None else frame.crop(region)
+
+    def size(self) -> tuple[int]:
+        return (self.frames[0].shape[1], self.frames[0].shape[0])
+
+
+def loadTemplates(scale : int = 1) -> dict[str, np.ndarray]:
+    '''
+    Load the templates from the test resources, enlarged by a whole number scale to stand
+     in for assets captured on a high DPI screen.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        The RGB pixels of each template keyed by its file name.
+    '''
+    templates = {}
+    for path in sorted(glob.glob(os.path.join(RESOURCES, '*'))):
+        name = os.path.basename(path)
+        if name in EXCLUDED_TEMPLATES:
+            continue
+        with Image.open(path) as image:
+            image = image.convert('RGB')
+            if scale != 1:
+                image = image.resize((image.width * scale, image.height * scale), Image.NEAREST)
+            templates[name] = np.asarray(image)
+    return templates
+
+def makeScreen(width : int, height : int, seed : int = 0, palette : str = 'light', windows : int = 6) -> np.ndarray:
+    '''
+    Draw a desktop-like screen: a gradient wallpaper with overlapping windows, each with a title
+     bar and rows of text-like marks.
+
+    Parameters
+    ----------
+    width : int
+        The width of the screen.
+
+    height : int
+        The height of the screen.
+
+    seed : int (Default = 0)
+        The seed the layout is drawn from, so the same screen can be drawn again.
+
+    palette : str (Default = 'light')
+        The name of a palette in 'PALETTES'.
+
+    windows : int (Default = 6)
+        The number of windows drawn on the desktop.
+
+    Returns
+    -------
+    np.ndarray
+        The RGB pixels of the screen.
+    '''
+    rng = np.random.default_rng(seed)
+    desktop, window, title, text = PALETTES[palette]
+
+    # Shade the wallpaper from top to bottom
+    shade = np.linspace(0.7, 1.0, height, dtype=np.float32)[:, None, None]
+    image = Image.fromarray((np.array(desktop, dtype=np.float32) * shade * np.ones((1, width, 1), dtype=np.float32)).astype(np.uint8))
+    draw = ImageDraw.Draw(image)
+
+    for _ in range(windows):
+        w, h = int(rng.integers(width // 5, width // 2)), int(rng.integers(height // 5, height // 2))
+        x, y = int(rng.integers(0, width - w)), int(rng.integers(0, height - h))
+        draw.rectangle([x, y, x + w, y + h], fill=window, outline=title)
+        draw.rectangle([x, y, x + w, y + 28], fill=title)
+
+        # Rows of marks the size of words stand in for text
+        for row in range(y + 40, y + h - 16, 20):
+            column = x + 12
+            while column < x + w - 60:
+                length = int(rng.integers(12, 60))
+                draw.rectangle([column, row, column + length, row + 8], fill=text)
+                column += length + int(rng.integers(6, 14))
+
+    return np.asarray(image).copy()
+
+def plant(screen : np.ndarray, templates : dict[str, np.ndarray], seed : int = 0, copies : int = 1, noise : float = 2.0, \
+          reserved : list[list[int]] = ()) -> dict[str, list[tuple[int]]]:
+    '''
+    Paste templates into a screen at random positions that do not overlap, then add noise to
+     the whole screen so that no match is exact.
+
+    Parameters
+    ----------
+    screen : np.ndarray
+        The screen to plant into, which is changed in place.
+
+    templates : dict[str, np.ndarray]
+        The templates to plant keyed by name.
+
+    seed : int (Default = 0)
+        The seed the positions and noise are drawn from.
+
+    copies : int (Default = 1)
+        The number of times each template is planted.
+
+    noise : float (Default = 2.0)
+        The standard deviation of the Gaussian noise added to every pixel.
+
+    reserved : list[list[int]] (Optional)
+        Areas [x, y, width, height] that nothing may be planted over, such as text drawn for OCR.
+
+    Returns
+    -------
+    dict[str, list[tuple[int]]]
+        The top left corner of every planted copy of each template.
+    '''
+    rng = np.random.default_rng(seed)
+    height, width = screen.shape[:2]
+    taken = [tuple(area) for area in reserved]
+    positions = {name : [] for name in templates}
+
+    for name, pixels in templates.items():
+        h, w = pixels.shape[:2]
+        for _ in range(copies):
+            # Try random spots until one does not overlap anything already planted
+            for _ in range(1000):
+                x, y = int(rng.integers(0, width - w)), int(rng.integers(0, height - h))
+                if all(x + w <= ox or ox + ow <= x or y + h <= oy or oy + oh <= y for ox, oy, ow, oh in taken):
+                    break
+            else:
+                raise ValueError(f"There is no room left to plant '{name}'.")
+
+            screen[y:y + h, x:x + w] = pixels
+            taken.append((x, y, w, h))
+            positions[name].append((x, y))
+
+    if noise > 0:
+        noisy = screen.astype(np.float32) + rng.normal(0, noise, screen.shape).astype(np.float32)
+        np.clip(noisy, 0, 255, out=noisy)
+        screen[:] = noisy.astype(np.uint8)
+    return positions
@@ -0,0 +1,290 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the compiler and loader for memory-mapped template asset bundles.
+-----------------'''
+
+#---Imports---#
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import numpy as np
+from .frame_source import _toPixels
+from .template_cache import Template, addBundle, removeBundle
+from .matcher import MAX_PYRAMID_LEVELS, MIN_PYRAMID_SIZE
+
+#---Constants---#
+# The first bytes of every bundle, followed by the offset and length of its index
+MAGIC = b'RDSHBND1'
+
+# The file extensions that are compiled into a bundle
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff')
+
+# Arrays are aligned to this many bytes in the bundle, so they can be used straight from the mapping
+ALIGNMENT = 64
+
+_HEADER = struct.Struct('<8sQQ')
+
+
+def compileBundle(directory : str, output : str) -> dict:
+    '''
+    Pack every image in a directory into one bundle file. For each template the bundle holds its
+     colour and grayscale planes, every pyramid level the matcher can use and the statistics
+     normalized matching needs, so nothing has to be decoded or computed when it is loaded.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to compile, including its subdirectories.
+
+    output : str
+        The bundle file to write.
+
+    Returns
+    -------
+    dict
+        The index written to the bundle, keyed by each template's path relative to the directory.
+    '''
+    index = {}
+    with open(output, 'wb') as file:
+        # Leave room for the header, which is written once the index is known
+        file.write(bytes(ALIGNMENT))
+
+        for path in sorted(_images(directory)):
+            name = os.path.relpath(path, directory).replace(os.sep, '/')
+            template = Template(_toPixels(path), os.path.abspath(path), os.stat(path).st_mtime_ns)
+
+            entry = {
+                'source': template.path,
+                'mtime': template.mtime,
+                'digest': _digest(path),
+                'pixels': _writeArray(file, template.pixels),
+                'levels': [],
+                'phase_scores': {},
+            }
+
+            # Store each pyramid level along with how the template scores on it off the pixel grid
+            for level in range(_levelCount(template)):
+                scaled = template.pyramid(level)
+                entry['levels'].append({
+                    'gray': _writeArray(file, scaled.gray),
+                    'centered': _writeArray(file, scaled.centered),
+                    'mean': scaled.mean,
+                    'norm': scaled.norm,
+                })
+                entry['phase_scores'][str(level)] = template.phaseScore(level)
+            index[name] = entry
+
+        # Write the index last and point the header at it
+        data = json.dumps(index).encode('utf-8')
+        offset = file.tell()
+        file.write(data)
+        file.seek(0)
+        file.write(_HEADER.pack(MAGIC, offset, len(data)))
+
+    return index
+
+
+class AssetBundle:
+    '''
+    A compiled bundle of templates, memory-mapped so that loading it only reads its index. The
+     arrays of each template are used straight from the mapping without being copied or decoded,
+     and the operating system shares the pages between every process using the same bundle.
+
+    Templates are found by their path relative to the compiled directory, with or without the
+     file extension, or by the path of the file they were compiled from. When found by its path,
+     the file is compared with the bundle once per modification time, and a template whose file
+     has changed since the bundle was compiled is not served, so the file is decoded instead.
+    '''
+
+    def __init__(self, path : str):
+        '''
+        Initialize the 'AssetBundle' object.
+
+        Parameters
+        ----------
+        path : str
+            The bundle file to open.
+        '''
+        self.path = path
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, offset, length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a raddish asset bundle.")
+        self.index = json.loads(bytes(self._map[offset:offset + length]).decode('utf-8'))
+
+        # Every name and source path a template can be found by, pointing at its entry in the index
+        self._names = {}
+        self._sources = {}
+        for name, entry in self.index.items():
+            self._names[name] = name
+            self._names.setdefault(os.path.splitext(name)[0], name)
+            self._sources[os.path.normcase(entry['source'])] = name
+
+        self._templates = {}
+        self._verified = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> list[str]:
+        '''
+        Return the names of every template in the bundle.
+        '''
+        return list(self.index)
+
+    def find(self, image : str) -> Template:
+        '''
+        Return the template for a name or source path, or None if the bundle does not hold it.
+        '''
+        path = os.path.abspath(image)
+        name = self._names.get(image)
+        if name == None:
+            name = self._sources.get(os.path.normcase(path))
+            if name == None:
+                return None
+
+        # Only stand in for a file that has not changed since the bundle was compiled, including a
+        #  file that a name also happens to be the path of. The contents are compared, since copying
+        #  or checking out a file changes its modification time
+        try:
+            mtime = os.stat(path).st_mtime_ns if os.path.isfile(path) else None
+        except OSError:
+            mtime = None
+        if mtime != None and self._verified.get((path, name)) != mtime:
+            if _digest(path) != self.index[name]['digest']:
+                return None
+            self._verified[(path, name)] = mtime
+
+        template = self._templates.get(name)
+        if template == None:
+            with self._lock:
+                template = self._templates.get(name)
+                if template == None:
+                    template = self._templates[name] = self._load(name)
+        return template
+
+    def __getitem__(self, name : str) -> Template:
+        template = self.find(name)
+        if template == None:
+            raise KeyError(name)
+        return template
+
+    def __contains__(self, name : str) -> bool:
+        return self.find(name) != None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self):
+        '''
+        Stop serving templates from the bundle. The file stays mapped until the templates
+         already handed out are no longer used.
+        '''
+        removeBundle(self)
+        self._templates.clear()
+        try:
+            self._map.close()
+        except BufferError:
+            # Arrays still reference the mapping, which is released along with them
+            pass
+
+
+    #---Internal Methods---#
+    def _array(self, description : list) -> np.ndarray:
+        '''
+        Return a read-only view of an array stored in the bundle.
+        '''
+        offset, dtype, shape = description
+        return np.frombuffer(self._map, dtype=np.dtype(dtype), count=int(np.prod(shape)), offset=offset).reshape(shape)
+
+    def _load(self, name : str) -> Template:
+        '''
+        Build the template and its pyramid levels from the arrays in the bundle.
+        '''
+        entry = self.index[name]
+        levels = []
+        for level, stored in enumerate(entry['levels']):
+            pixels = self._array(entry['pixels']) if level == 0 else None
+            levels.append(Template.fromArrays(pixels, self._array(stored['gray']), self._array(stored['centered']), \
+                                              stored['mean'], stored['norm'], entry['source'] if level == 0 else None, \
+                                              entry['mtime'] if level == 0 else None))
+
+        template = levels[0]
+        template._levels = levels
+        template._phase_scores = {int(level) : score for level, score in entry['phase_scores'].items()}
+        return template
+
+
+def loadBundle(path : str) -> AssetBundle:
+    '''
+    Open an asset bundle and serve its templates to every search, so that 'locateImage' and the
+     other search functions can be given a template's name instead of a path.
+
+    Parameters
+    ----------
+    path : str
+        The bundle file made by 'compileBundle'.
+
+    Returns
+    -------
+    AssetBundle
+        The opened bundle.
+    '''
+    bundle = AssetBundle(path)
+    addBundle(bundle)
+    return bundle
+
+
+#---Internal Functions---#
+def _images(directory : str) -> list[str]:
+    '''
+    List every image file under a directory.
+    '''
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths += [os.path.join(root, name) for name in files if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS]
+    return paths
+
+def _digest(path : str) -> str:
+    '''
+    Return a hash of a file's contents.
+    '''
+    with open(path, 'rb') as file:
+        return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+
+def _levelCount(template : Template) -> int:
+    '''
+    Return the number of pyramid levels worth storing for a template, including level 0.
+    '''
+    levels = 1
+    smallest = min(template.width, template.height)
+    while levels <= MAX_PYRAMID_LEVELS and smallest // 2 ** levels >= MIN_PYRAMID_SIZE:
+        levels += 1
+    return levels
+
+def _writeArray(file, array : np.ndarray) -> list:
+    '''
+    Write an array at the next aligned offset, returning its offset, dtype and shape.
+    '''
+    padding = -file.tell() % ALIGNMENT
+    file.write(bytes(padding))
+    offset = file.tell()
+    array = np.ascontiguousarray(array)
+    file.write(array.tobytes())
+    return [offset, array.dtype.str, list(array.shape)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compile a directory of templates into a raddish asset bundle.')
+    parser.add_argument('directory', help='The directory of templates to compile.')
+    parser.add_argument('output', help='The bundle file to write.')
+    arguments = parser.parse_args()
+
+    index = compileBundle(arguments.directory, arguments.output)
+    print(f'Compiled {len(index)} templates into {arguments.output} ({os.path.getsize(arguments.output) / 1024 / 1024:.1f} MiB)')
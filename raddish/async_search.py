@@ -0,0 +1,264 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing asyncio versions of the image search functions.
+-----------------'''
+
+#---Imports---#
+import asyncio
+import time
+import weakref
+from pyscreeze import Box
+from .search_rectangle import SearchRectangle
+from .frame_source import Frame, captureFrame
+from .change_detection import changedTiles, AdaptivePoller
+from .image_search import _locateInFrame
+from .utility import _determineRegion, ImageNotFoundException
+from typing import Callable as function
+
+
+async def locateAsync(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None) -> Box:
+    '''
+    Locate an image on the screen, sharing the capture with any other pending searches.
+
+    Parameters
+    ----------
+    image_path : str
+        The path to the image to search for.
+
+    confidence : float (Optional)
+        The confidence level to search for the image, default is 0.9.
+
+    region : list[int] (Optional)
+        A list of four integers that represent a region on the screen.
+          The list should be in this format: [x, y, width, height]
+
+    search_rectangle : SearchRectangle (Optional)
+        A SearchRectangle object that represents a region on the screen.
+
+    Returns
+    -------
+    Box
+        The location of the image on the screen.
+    '''
+    check = lambda frame: _locateInFrame(image_path, frame, confidence)
+    return await _wait(region, search_rectangle, 0, check, f"The image: '{image_path}' was not found on the screen.")
+
+
+async def waitAny(image_paths: list[str], confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, \
+                  timeout = 0) -> tuple:
+    '''
+    Wait for the first of several images to appear on the screen.
+
+    Parameters
+    ----------
+    image_paths : list[str]
+        The paths to the images to wait for.
+
+    confidence : float (Optional)
+        The confidence level to search for the images, default is 0.9.
+
+    region : list[int] (Optional)
+        A list of four integers that represent a region on the screen.
+          The list should be in this format: [x, y, width, height]
+
+    search_rectangle : SearchRectangle (Optional)
+        A SearchRectangle object that represents a region on the screen.
+
+    timeout : int (Optional)
+        The amount of time in seconds to wait for any of the images to appear on the screen.
+
+    Returns
+    -------
+    tuple[str, Box]
+        The path of the image that appeared and its location on the screen.
+    '''
+    def check(frame : Frame) -> tuple:
+        for image_path in image_paths:
+            image_location = _locateInFrame(image_path, frame, confidence)
+            if image_location != None:
+                return (image_path, image_location)
+        return None
+
+    return await _wait(region, search_rectangle, timeout, check, f"None of the images: {image_paths} were found within the timeout period.")
+
+
+async def waitAll(image_paths: list[str], confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, \
+                  timeout = 0) -> dict[str, Box]:
+    '''
+    Wait for several images to be on the screen at the same time.
+
+    Parameters
+    ----------
+    image_paths : list[str]
+        The paths to the images to wait for.
+
+    confidence : float (Optional)
+        The confidence level to search for the images, default is 0.9.
+
+    region : list[int] (Optional)
+        A list of four integers that represent a region on the screen.
+          The list should be in this format: [x, y, width, height]
+
+    search_rectangle : SearchRectangle (Optional)
+        A SearchRectangle object that represents a region on the screen.
+
+    timeout : int (Optional)
+        The amount of time in seconds to wait for all of the images to appear on the screen.
+
+    Returns
+    -------
+    dict[str, Box]
+        The location of each image keyed by its path.
+    '''
+    def check(frame : Frame) -> dict:
+        image_locations = {}
+        for image_path in image_paths:
+            image_location = _locateInFrame(image_path, frame, confidence)
+            if image_location == None:
+                return None
+            image_locations[image_path] = image_location
+        return image_locations
+
+    return await _wait(region, search_rectangle, timeout, check, f"Not all of the images: {image_paths} were found within the timeout period.")
+
+
+async def waitGone(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, timeout = 0):
+    '''
+    Wait for an image to disappear from the screen.
+
+    Parameters
+    ----------
+    image_path : str
+        The path to the image to wait on.
+
+    confidence : float (Optional)
+        The confidence level to search for the image, default is 0.9.
+
+    region : list[int] (Optional)
+        A list of four integers that represent a region on the screen.
+          The list should be in this format: [x, y, width, height]
+
+    search_rectangle : SearchRectangle (Optional)
+        A SearchRectangle object that represents a region on the screen.
+
+    timeout : int (Optional)
+        The amount of time in seconds to wait for the image to disappear from the screen.
+    '''
+    check = lambda frame: True if _locateInFrame(image_path, frame, confidence) == None else None
+    await _wait(region, search_rectangle, timeout, check, f"The image: '{image_path}' was still on the screen after the timeout period.")
+
+
+#---Internal Classes---#
+class _Waiter:
+    '''
+    A condition waiting on the shared capture loop.
+    '''
+
+    def __init__(self, region : list[int], check : function, deadline : float, message : str, future : asyncio.Future):
+        self.region = region
+        self.check = check
+        self.deadline = deadline
+        self.message = message
+        self.future = future
+
+        # Set once the condition has been checked against at least one frame
+        self.checked = False
+
+
+class _CaptureLoop:
+    '''
+    Captures one frame per iteration covering every pending waiter's region and checks
+     every waiter against it, so concurrent waits never capture the screen more than once.
+    '''
+
+    def __init__(self, loop : asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.waiters = []
+        self.task = None
+        self.poller = AdaptivePoller()
+
+    def add(self, waiter : _Waiter):
+        '''
+        Add a waiter, starting the loop if it is not already running.
+        '''
+        self.waiters.append(waiter)
+        if self.task == None or self.task.done():
+            self.task = self.loop.create_task(self._run())
+
+    async def _run(self):
+        '''
+        Capture and check frames until there are no waiters left.
+        '''
+        previous = None
+
+        while True:
+            # Forget waiters whose callers gave up
+            self.waiters = [waiter for waiter in self.waiters if not waiter.future.done()]
+            if len(self.waiters) == 0:
+                return
+
+            # Capture a single frame covering every waiter, failing them all if the capture fails
+            try:
+                frame = await self.loop.run_in_executor(None, captureFrame, _union([waiter.region for waiter in self.waiters]))
+            except Exception as e:
+                for waiter in self.waiters:
+                    if not waiter.future.done():
+                        waiter.future.set_exception(e)
+                return
+            tiles = changedTiles(previous, frame)
+            previous = frame
+
+            # Only check waiters that have not seen this screen yet, in parallel. The checks share the
+            #  frame and any templates they have in common, whose conversions are built under a lock
+            pending = [waiter for waiter in self.waiters if tiles.any() or not waiter.checked]
+            results = await asyncio.gather(*[self.loop.run_in_executor(None, waiter.check, frame.crop(waiter.region)) for waiter in pending], \
+                                           return_exceptions=True)
+
+            # Resolve the waiters whose conditions hold or whose time ran out
+            now = time.time()
+            for waiter, result in zip(pending, results):
+                waiter.checked = True
+                if waiter.future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    waiter.future.set_exception(result)
+                elif result != None:
+                    waiter.future.set_result(result)
+            for waiter in self.waiters:
+                if not waiter.future.done() and waiter.checked and now >= waiter.deadline:
+                    waiter.future.set_exception(ImageNotFoundException(waiter.message))
+
+            # Sleep until the next poll, waking early for the nearest deadline
+            remaining = [waiter.deadline - now for waiter in self.waiters if not waiter.future.done()]
+            if len(remaining) > 0:
+                await asyncio.sleep(max(min(self.poller.next(float(tiles.mean())), min(remaining)), 0))
+
+
+#---Internal Functions---#
+_capture_loops = weakref.WeakKeyDictionary()
+
+async def _wait(region : list[int], search_rectangle : SearchRectangle, timeout : float, check : function, message : str):
+    '''
+    Register a condition on the running event loop's capture loop and wait for it to hold.
+    '''
+    loop = asyncio.get_running_loop()
+
+    # Share one capture loop between every wait on the same event loop
+    capture_loop = _capture_loops.get(loop)
+    if capture_loop == None:
+        capture_loop = _capture_loops[loop] = _CaptureLoop(loop)
+
+    waiter = _Waiter(_determineRegion(region, search_rectangle), check, time.time() + timeout, message, loop.create_future())
+    capture_loop.add(waiter)
+    return await waiter.future
+
+def _union(regions : list[list[int]]) -> list[int]:
+    '''
+    Return the smallest region that covers every given region.
+    '''
+    left = min(region[0] for region in regions)
+    top = min(region[1] for region in regions)
+    right = max(region[0] + region[2] for region in regions)
+    bottom = max(region[1] + region[3] for region in regions)
+    return [left, top, right - left, bottom - top]
@@ -0,0 +1,542 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the shared capture service and the watchers it feeds.
+-----------------'''
+
+#---Imports---#
+import sys
+import threading
+import time
+import numpy as np
+from pyscreeze import Box
+from .search_rectangle import SearchRectangle
+from .frame_source import Frame, FrameSource, getFrameSource, setFrameSource
+from .change_detection import changedTiles, changedRegions, CHANGE_THRESHOLD
+from .image_search import _locateInFrame
+from .text_search import indexText, TextNotFoundException
+from .utility import _determineRegion, ImageNotFoundException
+from typing import Callable as function
+
+#---Constants---#
+# The number of frames captured per second by default
+DEFAULT_RATE = 10.0
+
+# The number of reusable arrays the ring buffer starts with
+DEFAULT_BUFFER_SIZE = 4
+
+
+class Watcher:
+    '''
+    The base class for a condition that a 'CaptureService' checks against every new frame. A
+     watcher is only checked when the part of the screen it watches changed since it last looked.
+
+    Subclasses implement 'check', which is called on the service's watcher thread. A watcher keeps
+     the last frame it was checked against, to compare the next one with.
+
+    Members
+    -------
+    checks : int
+        The number of frames the watcher was checked against.
+
+    error : Exception
+        The last exception raised by the watcher or its callbacks, if any. A watcher that raises
+         keeps being checked, so a failing callback does not stop a watchdog.
+    '''
+
+    def __init__(self, region : list[int] = None, search_rectangle : SearchRectangle = None, threshold : float = CHANGE_THRESHOLD):
+        '''
+        Initialize the 'Watcher' object.
+
+        Parameters
+        ----------
+        region : list[int] (Optional)
+            A list of four integers that represent a region on the screen.
+              The list should be in this format: [x, y, width, height]
+
+        search_rectangle : SearchRectangle (Optional)
+            A SearchRectangle object that represents a region on the screen.
+
+        threshold : float (Default = 4.0)
+            The grayscale difference a pixel must exceed for the region to count as changed.
+        '''
+        self.region = _determineRegion(region, search_rectangle)
+        self.threshold = threshold
+        self.checks = 0
+        self.error = None
+        self.active = True
+        self._previous = None
+
+    def check(self, frame : Frame, tiles : np.ndarray):
+        '''
+        Look at a new frame of the watched region, along with which of its tiles changed.
+        '''
+        raise NotImplementedError
+
+    def cancel(self):
+        '''
+        Stop checking the watcher.
+        '''
+        self.active = False
+
+
+    #---Internal Methods---#
+    def _update(self, frame : Frame):
+        '''
+        Check the watcher against a frame if the watched region changed, keeping any exception.
+        '''
+        frame = frame.crop(self.region)
+        tiles = changedTiles(self._previous, frame, threshold=self.threshold)
+        if not tiles.any():
+            return
+        self._previous = frame
+        self.checks += 1
+        try:
+            self.check(frame, tiles)
+        except Exception as e:
+            self.error = e
+
+
+class _PresenceWatcher(Watcher):
+    '''
+    A watcher that calls 'on_success' with the location of something when it appears or moves,
+     and 'on_fail' with an exception when it goes away.
+    '''
+
+    def __init__(self, region : list[int], search_rectangle : SearchRectangle, on_success : function, on_fail : function):
+        super().__init__(region, search_rectangle)
+        self.on_success = on_success
+        self.on_fail = on_fail
+        self.location = None
+
+    def check(self, frame : Frame, tiles : np.ndarray):
+        location = self.find(frame)
+        if location == self.location:
+            return
+
+        previous, self.location = self.location, location
+        if location != None:
+            if callable(self.on_success):
+                self.on_success(location)
+        elif previous != None and callable(self.on_fail):
+            self.on_fail(self.failure())
+
+    def find(self, frame : Frame) -> Box:
+        '''
+        Return where the watched thing is in a frame, or None if it is not there.
+        '''
+        raise NotImplementedError
+
+    def failure(self) -> Exception:
+        '''
+        Return the exception handed to 'on_fail' when the watched thing goes away.
+        '''
+        raise NotImplementedError
+
+
+class ImageWatcher(_PresenceWatcher):
+    '''
+    Watches for an image, calling 'on_success' with its location whenever it appears or moves
+     and 'on_fail' with an 'ImageNotFoundException' when it goes away.
+
+    Members
+    -------
+    location : Box
+        Where the image currently is, or None.
+    '''
+
+    def __init__(self, image_path : str, on_success : function = None, on_fail : function = None, confidence : float = 0.9, \
+                 region : list[int] = None, search_rectangle : SearchRectangle = None):
+        '''
+        Initialize the 'ImageWatcher' object.
+
+        Parameters
+        ----------
+        image_path : str
+            The path to the image to watch for.
+
+        on_success : function (Optional)
+            Called with the location of the image when it appears or moves.
+
+        on_fail : function (Optional)
+            Called with an 'ImageNotFoundException' when the image goes away.
+
+        confidence : float (Default = 0.9)
+            The confidence level to search for the image.
+
+        region : list[int] (Optional)
+            A list of four integers that represent a region on the screen.
+              The list should be in this format: [x, y, width, height]
+
+        search_rectangle : SearchRectangle (Optional)
+            A SearchRectangle object that represents a region on the screen.
+        '''
+        super().__init__(region, search_rectangle, on_success, on_fail)
+        self.image_path = image_path
+        self.confidence = confidence
+
+    def find(self, frame : Frame) -> Box:
+        return _locateInFrame(self.image_path, frame, self.confidence)
+
+    def failure(self) -> Exception:
+        return ImageNotFoundException(f"The image: '{self.image_path}' is no longer on the screen.")
+
+    def __repr__(self) -> str:
+        return f'ImageWatcher({self.image_path!r})'
+
+
+class TextWatcher(_PresenceWatcher):
+    '''
+    Watches for text, calling 'on_success' with its location whenever it appears or moves
+     and 'on_fail' with a 'TextNotFoundException' when it goes away.
+
+    Members
+    -------
+    location : Box
+        Where the text currently is, or None.
+    '''
+
+    def __init__(self, text : str, on_success : function = None, on_fail : function = None, region : list[int] = None, \
+                 search_rectangle : SearchRectangle = None, match : str = 'exact', fuzziness : float = 0.8, language : str = 'eng', \
+                 preprocess = None):
+        '''
+        Initialize the 'TextWatcher' object.
+
+        Parameters
+        ----------
+        text : str
+            The text to watch for, which may span several words.
+
+        on_success : function (Optional)
+            Called with the location of the text when it appears or moves.
+
+        on_fail : function (Optional)
+            Called with a 'TextNotFoundException' when the text goes away.
+
+        region : list[int] (Optional)
+            A list of four integers that represent a region on the screen.
+
+        search_rectangle : SearchRectangle (Optional)
+            A SearchRectangle object that represents a region on the screen.
+
+        match : str (Default = 'exact')
+            How to compare text with the query, one of 'exact', 'ignorecase', 'fuzzy' or 'regex'.
+
+        fuzziness : float (Default = 0.8)
+            The lowest similarity from 0 to 1 that a 'fuzzy' match may have.
+
+        language : str (Default = 'eng')
+            The language that the Tesseract engine should use to read the text.
+
+        preprocess : str, list or Pipeline (Optional)
+            How to prepare the image before reading it, as in 'readText'.
+        '''
+        super().__init__(region, search_rectangle, on_success, on_fail)
+        self.text = text
+        self.match = match
+        self.fuzziness = fuzziness
+        self.language = language
+        self.preprocess = preprocess
+
+    def find(self, frame : Frame) -> Box:
+        matches = indexText(frame.region, language=self.language, frame=frame, preprocess=self.preprocess).find(self.text, self.match, \
+                                                                                                              self.fuzziness)
+        return matches[0].box() if len(matches) > 0 else None
+
+    def failure(self) -> Exception:
+        return TextNotFoundException(f"The text: '{self.text}' is no longer on the screen.")
+
+    def __repr__(self) -> str:
+        return f'TextWatcher({self.text!r})'
+
+
+class PixelWatcher(Watcher):
+    '''
+    Watches a region for any change, calling 'on_change' with the new frame of the region and the
+     list of regions of the screen that changed.
+    '''
+
+    def __init__(self, on_change : function, region : list[int] = None, search_rectangle : SearchRectangle = None, \
+                 threshold : float = CHANGE_THRESHOLD):
+        '''
+        Initialize the 'PixelWatcher' object.
+
+        Parameters
+        ----------
+        on_change : function
+            Called with the frame and the changed regions, each in the format [x, y, width, height].
+
+        region : list[int] (Optional)
+            A list of four integers that represent a region on the screen.
+
+        search_rectangle : SearchRectangle (Optional)
+            A SearchRectangle object that represents a region on the screen.
+
+        threshold : float (Default = 4.0)
+            The grayscale difference a pixel must exceed to count as changed.
+        '''
+        super().__init__(region, search_rectangle, threshold)
+        self.on_change = on_change
+
+    def check(self, frame : Frame, tiles : np.ndarray):
+        # The first frame is only remembered, there is nothing to compare it with yet
+        if self.checks > 1:
+            self.on_change(frame, changedRegions(tiles, frame))
+
+    def __repr__(self) -> str:
+        return f'PixelWatcher({self.region!r})'
+
+
+class CaptureService(FrameSource):
+    '''
+    Captures the screen on a background thread at a fixed rate and shares each capture with every
+     watcher and every search, so threads such as a watchdog for error popups, a progress monitor
+     and the main script no longer each grab the display.
+
+    Captures are copied into a ring buffer of reusable arrays and handed out as read-only views, so
+     every search of the same capture also shares its grayscale conversion and pyramid. An array is
+     only reused once no frame handed out from it is still referenced; if every array is in use, the
+     ring grows by one instead, so a frame never changes while anything holds it.
+
+    Watchers are checked on a second thread with the latest capture, so a slow check never delays
+     the captures. A check that falls behind skips to the newest frame. Once started, the service is
+     also the active frame source, and a grab returns the latest capture without touching the display.
+
+    Members
+    -------
+    captures : int
+        The number of frames captured from the source.
+
+    skipped : int
+        The number of captures the watcher thread was too busy to look at.
+    '''
+
+    def __init__(self, rate : float = DEFAULT_RATE, source : FrameSource = None, region : list[int] = None, \
+                 buffer_size : int = DEFAULT_BUFFER_SIZE):
+        '''
+        Initialize the 'CaptureService' object.
+
+        Parameters
+        ----------
+        rate : float (Default = 10.0)
+            The number of frames to capture per second.
+
+        source : FrameSource (Optional)
+            The frame source to capture from, defaults to the active frame source when the service starts.
+
+        region : list[int] (Optional)
+            The region of the screen to capture, defaults to the whole screen.
+              The list should be in this format: [x, y, width, height]
+
+        buffer_size : int (Default = 4)
+            The number of arrays the ring buffer starts with.
+        '''
+        self.rate = rate
+        self.source = source
+        self.region = region
+        self.buffer_size = buffer_size
+        self.watchers = []
+        self.captures = 0
+        self.skipped = 0
+
+        self._ring = []
+        self._latest = None
+        self._sequence = 0
+        self._previous_source = None
+        self._stop = threading.Event()
+        self._new_frame = threading.Condition()
+        self._watchers_lock = threading.Lock()
+        self._threads = []
+
+    def start(self) -> 'CaptureService':
+        '''
+        Start capturing, making the service the active frame source.
+        '''
+        if len(self._threads) > 0:
+            return self
+
+        self._previous_source = getFrameSource()
+        if self.source == None:
+            self.source = self._previous_source
+
+        # Capture the first frame up front so a grab never has to wait
+        self._stop.clear()
+        self._capture()
+        self._threads = [threading.Thread(target=self._captureLoop, name='raddish-capture', daemon=True),
+                         threading.Thread(target=self._watchLoop, name='raddish-watchers', daemon=True)]
+        for thread in self._threads:
+            thread.start()
+
+        setFrameSource(self)
+        return self
+
+    def stop(self):
+        '''
+        Stop capturing, putting back the frame source that was active before.
+        '''
+        if len(self._threads) == 0:
+            return
+
+        if getFrameSource() is self:
+            setFrameSource(self._previous_source)
+
+        self._stop.set()
+        with self._new_frame:
+            self._new_frame.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+        self._threads = []
+
+    def close(self):
+        self.stop()
+
+    def __enter__(self) -> 'CaptureService':
+        return self.start()
+
+    def __exit__(self, *exception):
+        self.stop()
+
+    def latest(self) -> Frame:
+        '''
+        Return the most recent capture.
+        '''
+        return self._latest
+
+    def grab(self, region : list[int] = None) -> Frame:
+        frame = self._latest
+        if frame == None:
+            frame = self._capture()
+
+        # Regions outside the captured area have to be captured from the source
+        if region == None:
+            return frame if self.region == None else self.source.grab()
+        if not frame.contains(region):
+            return self.source.grab(region)
+        return frame.crop(region)
+
+    def size(self) -> tuple[int]:
+        return self.source.size()
+
+    def watch(self, watcher : Watcher) -> Watcher:
+        '''
+        Check a watcher against every new capture until it is cancelled.
+
+        Parameters
+        ----------
+        watcher : Watcher
+            The watcher to add.
+
+        Returns
+        -------
+        Watcher
+            The same watcher, so it can be cancelled later.
+        '''
+        watcher.active = True
+        with self._watchers_lock:
+            self.watchers.append(watcher)
+        with self._new_frame:
+            self._new_frame.notify_all()
+        return watcher
+
+    def watchImage(self, image_path : str, on_success : function = None, on_fail : function = None, confidence : float = 0.9, \
+                   region : list[int] = None, search_rectangle : SearchRectangle = None) -> ImageWatcher:
+        '''
+        Watch for an image, calling 'on_success' with its location when it appears or moves and
+         'on_fail' with an exception when it goes away. See 'ImageWatcher'.
+        '''
+        return self.watch(ImageWatcher(image_path, on_success, on_fail, confidence, region, search_rectangle))
+
+    def watchText(self, text : str, on_success : function = None, on_fail : function = None, region : list[int] = None, \
+                  search_rectangle : SearchRectangle = None, match : str = 'exact', fuzziness : float = 0.8, language : str = 'eng', \
+                  preprocess = None) -> TextWatcher:
+        '''
+        Watch for text, calling 'on_success' with its location when it appears or moves and
+         'on_fail' with an exception when it goes away. See 'TextWatcher'.
+        '''
+        return self.watch(TextWatcher(text, on_success, on_fail, region, search_rectangle, match, fuzziness, language, preprocess))
+
+    def watchPixels(self, on_change : function, region : list[int] = None, search_rectangle : SearchRectangle = None, \
+                    threshold : float = CHANGE_THRESHOLD) -> PixelWatcher:
+        '''
+        Watch a region for any change, calling 'on_change' with the new frame of the region and
+         the regions that changed. See 'PixelWatcher'.
+        '''
+        return self.watch(PixelWatcher(on_change, region, search_rectangle, threshold))
+
+
+    #---Internal Methods---#
+    def _capture(self) -> Frame:
+        '''
+        Capture a frame from the source into the ring buffer and make it the latest frame.
+        '''
+        captured = self.source.grab(self.region)
+        pixels = self._slot(captured.pixels.shape)
+        np.copyto(pixels, captured.pixels)
+
+        # Hand out a read-only view, so nothing can change a frame other threads are using
+        view = pixels.view()
+        view.flags.writeable = False
+        frame = Frame(view, captured.left, captured.top, captured.timestamp)
+
+        with self._new_frame:
+            self._latest = frame
+            self._sequence += 1
+            self.captures += 1
+            self._new_frame.notify_all()
+        return frame
+
+    def _slot(self, shape : tuple[int]) -> np.ndarray:
+        '''
+        Return an array of the ring buffer that no frame is using, growing the ring if they all are.
+        '''
+        # Arrays of another size are left over from before the screen was resized
+        self._ring = [pixels for pixels in self._ring if pixels.shape == shape]
+        while len(self._ring) < self.buffer_size:
+            self._ring.append(np.empty(shape, dtype=np.uint8))
+
+        # An array referenced by nothing but the ring and this call is free to overwrite
+        for pixels in self._ring:
+            if sys.getrefcount(pixels) <= 3:
+                return pixels
+
+        pixels = np.empty(shape, dtype=np.uint8)
+        self._ring.append(pixels)
+        return pixels
+
+    def _captureLoop(self):
+        '''
+        Capture frames at the service's rate until it is stopped.
+        '''
+        interval = 1 / self.rate
+        next_capture = time.monotonic() + interval
+        while not self._stop.wait(max(next_capture - time.monotonic(), 0)):
+            try:
+                self._capture()
+            except Exception:
+                # Keep capturing, a display that is briefly unavailable should not end the service
+                pass
+
+            # Skip the ticks that were missed rather than capturing several frames at once
+            next_capture = max(next_capture + interval, time.monotonic())
+
+    def _watchLoop(self):
+        '''
+        Check every watcher against each new capture until the service is stopped.
+        '''
+        seen = 0
+        while True:
+            with self._new_frame:
+                while self._sequence == seen and not self._stop.is_set():
+                    self._new_frame.wait()
+                if self._stop.is_set():
+                    return
+                self.skipped += self._sequence - seen - 1 if seen > 0 else 0
+                seen, frame = self._sequence, self._latest
+
+            with self._watchers_lock:
+                self.watchers = [watcher for watcher in self.watchers if watcher.active]
+                watchers = list(self.watchers)
+            for watcher in watchers:
+                if watcher.active:
+                    watcher._update(frame)
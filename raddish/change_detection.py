@@ -0,0 +1,232 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing functions that find which parts of the screen changed between frames.
+-----------------'''
+
+#---Imports---#
+import numpy as np
+from .frame_source import Frame
+
+#---Constants---#
+# The side length in pixels of the tiles that frames are compared by
+TILE_SIZE = 32
+
+# The grayscale difference a pixel must exceed to count as changed
+CHANGE_THRESHOLD = 4.0
+
+# Above this fraction of changed tiles it is cheaper to search the whole frame
+FULL_SEARCH_FRACTION = 0.5
+
+
+def changedTiles(previous : Frame, current : Frame, tile_size : int = TILE_SIZE, threshold : float = CHANGE_THRESHOLD) -> np.ndarray:
+    '''
+    Compare two frames of the same region tile by tile.
+
+    Parameters
+    ----------
+    previous : Frame
+        The earlier frame.
+
+    current : Frame
+        The later frame, covering the same region as the earlier one.
+
+    tile_size : int (Default = 32)
+        The side length of each tile in pixels.
+
+    threshold : float (Default = 4.0)
+        The grayscale difference a pixel must exceed for its tile to count as changed.
+
+    Returns
+    -------
+    np.ndarray
+        A boolean array with one entry per tile, True where the tile changed.
+    '''
+    # Treat every tile as changed if the frames cannot be compared
+    rows = -(-current.height // tile_size)
+    columns = -(-current.width // tile_size)
+    if previous == None or previous.region != current.region:
+        return np.ones((rows, columns), dtype=bool)
+
+    # Nothing changed if both frames share the same pixels
+    if previous.pixels is current.pixels:
+        return np.zeros((rows, columns), dtype=bool)
+
+    # Pad the difference out to whole tiles and take the largest change in each
+    difference = np.abs(current.gray() - previous.gray())
+    padded = np.zeros((rows * tile_size, columns * tile_size), dtype=difference.dtype)
+    padded[:current.height, :current.width] = difference
+    largest = padded.reshape(rows, tile_size, columns, tile_size).max(axis=(1, 3))
+    return largest > threshold
+
+
+def changedRegions(tiles : np.ndarray, frame : Frame, margin_x : int = 0, margin_y : int = 0, tile_size : int = TILE_SIZE) -> list[list[int]]:
+    '''
+    Merge changed tiles into the regions that need to be searched again.
+
+    Parameters
+    ----------
+    tiles : np.ndarray
+        The changed tiles returned by 'changedTiles'.
+
+    frame : Frame
+        The frame the tiles were taken from.
+
+    margin_x : int (Default = 0)
+        The number of pixels to grow each changed tile by horizontally, normally the template width.
+
+    margin_y : int (Default = 0)
+        The number of pixels to grow each changed tile by vertically, normally the template height.
+
+    tile_size : int (Default = 32)
+        The side length of each tile in pixels.
+
+    Returns
+    -------
+    list[list[int]]
+        The regions to search in screen coordinates, each in the format [x, y, width, height].
+    '''
+    if not tiles.any():
+        return []
+
+    # Search the whole frame if most of it changed
+    if tiles.mean() > FULL_SEARCH_FRACTION:
+        return [frame.region]
+
+    # Grow the changed tiles by the margins, rounded up to whole tiles
+    grow_x = -(-margin_x // tile_size)
+    grow_y = -(-margin_y // tile_size)
+    grown = _dilate(tiles, grow_x, grow_y)
+
+    # Turn each connected group of tiles into a region clipped to the frame
+    regions = []
+    for top, left, bottom, right in _components(grown):
+        x0 = frame.left + left * tile_size
+        y0 = frame.top + top * tile_size
+        x1 = min(frame.left + right * tile_size, frame.left + frame.width)
+        y1 = min(frame.top + bottom * tile_size, frame.top + frame.height)
+        regions.append([x0, y0, x1 - x0, y1 - y0])
+    return regions
+
+def mergeTiles(previous : Frame, current : Frame, tiles : np.ndarray, tile_size : int = TILE_SIZE) -> Frame:
+    '''
+    Bring the changed tiles of an earlier frame up to date, leaving the rest as they were.
+
+    Parameters
+    ----------
+    previous : Frame
+        The earlier frame, or None if there is not one yet.
+
+    current : Frame
+        The later frame, covering the same region as the earlier one.
+
+    tiles : np.ndarray
+        The changed tiles returned by 'changedTiles'.
+
+    tile_size : int (Default = 32)
+        The side length of each tile in pixels.
+
+    Returns
+    -------
+    Frame
+        A frame holding the later frame's pixels in the changed tiles and the earlier frame's
+         pixels everywhere else, so small changes keep adding up against it until they count.
+    '''
+    if previous == None or tiles.all():
+        return current
+    if not tiles.any():
+        return previous
+
+    # Expand the tiles to a pixel mask and take the changed pixels from the later frame
+    mask = np.repeat(np.repeat(tiles, tile_size, axis=0), tile_size, axis=1)[:current.height, :current.width]
+    pixels = np.where(mask[:, :, None], current.pixels, previous.pixels)
+    return Frame(pixels, current.left, current.top, current.timestamp)
+
+
+class AdaptivePoller:
+    '''
+    Chooses how long a wait loop should sleep between captures. The interval backs off
+     while the screen is idle and snaps back to the shortest interval as soon as it changes.
+    '''
+
+    def __init__(self, min_interval : float = 0.05, max_interval : float = 0.5, backoff : float = 1.5):
+        '''
+        Initialize the 'AdaptivePoller' object.
+
+        Parameters
+        ----------
+        min_interval : float (Default = 0.05)
+            The interval in seconds used while the screen is busy.
+
+        max_interval : float (Default = 0.5)
+            The longest interval in seconds used while the screen is idle.
+
+        backoff : float (Default = 1.5)
+            The factor the interval grows by after each capture where nothing changed.
+        '''
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+
+    def next(self, changed_fraction : float) -> float:
+        '''
+        Return the interval to sleep for after a capture.
+
+        Parameters
+        ----------
+        changed_fraction : float
+            The fraction of the searched region that changed since the previous capture.
+
+        Returns
+        -------
+        float
+            The number of seconds to sleep before the next capture.
+        '''
+        if changed_fraction > 0:
+            # Poll quickly while the screen is busy
+            self.interval = self.min_interval
+        else:
+            # Back off while nothing is happening
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return self.interval
+
+
+#---Internal Functions---#
+def _dilate(tiles : np.ndarray, grow_x : int, grow_y : int) -> np.ndarray:
+    '''
+    Grow every True tile by a number of tiles in each direction.
+    '''
+    grown = tiles.copy()
+    for shift in range(1, grow_x + 1):
+        grown[:, shift:] |= tiles[:, :-shift]
+        grown[:, :-shift] |= tiles[:, shift:]
+    tiles = grown.copy()
+    for shift in range(1, grow_y + 1):
+        grown[shift:, :] |= tiles[:-shift, :]
+        grown[:-shift, :] |= tiles[shift:, :]
+    return grown
+
+def _components(tiles : np.ndarray) -> list[tuple[int]]:
+    '''
+    Return the bounding box (top, left, bottom, right) of each connected group of True tiles.
+    '''
+    seen = np.zeros_like(tiles)
+    boxes = []
+    for row, column in zip(*np.nonzero(tiles)):
+        if seen[row, column]:
+            continue
+
+        # Flood fill the group, tracking its bounds
+        seen[row, column] = True
+        stack = [(row, column)]
+        top, left, bottom, right = row, column, row + 1, column + 1
+        while stack:
+            y, x = stack.pop()
+            top, left, bottom, right = min(top, y), min(left, x), max(bottom, y + 1), max(right, x + 1)
+            for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                if 0 <= ny < tiles.shape[0] and 0 <= nx < tiles.shape[1] and tiles[ny, nx] and not seen[ny, nx]:
+                    seen[ny, nx] = True
+                    stack.append((ny, nx))
+        boxes.append((int(top), int(left), int(bottom), int(right)))
+    return boxes
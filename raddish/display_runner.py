@@ -0,0 +1,437 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the runner that spreads a test suite across several virtual X displays.
+-----------------'''
+
+#---Imports---#
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+import unittest
+
+#---Constants---#
+# The size and colour depth of each virtual display
+DEFAULT_SIZE = '1920x1080'
+DEFAULT_DEPTH = 24
+
+# The first display number tried, high enough to stay clear of real displays
+FIRST_DISPLAY = 99
+
+# The number of seconds a virtual display has to come up in
+STARTUP_TIMEOUT = 10
+
+# Where the duration of each test is kept between runs, to balance the next run's shards
+TIMINGS_FILE = '.raddish_timings.json'
+
+# The duration assumed for tests that have not been timed before
+DEFAULT_DURATION = 1.0
+
+# The directory X servers keep their sockets and lock files in
+_X_DIRECTORY = '/tmp'
+
+# The module workers are started from
+_MODULE = 'raddish.display_runner'
+
+
+class VirtualDisplay:
+    '''
+    A local Xvfb server, giving a process its own screen to capture and drive with pyautogui.
+
+    pyautogui connects to the display named by the DISPLAY environment variable when it is first
+     imported, so a display is handed to a worker through its environment before the worker starts.
+    '''
+
+    def __init__(self, number : int = None, size : str = DEFAULT_SIZE, depth : int = DEFAULT_DEPTH):
+        '''
+        Initialize the 'VirtualDisplay' object.
+
+        Parameters
+        ----------
+        number : int (Optional)
+            The display number to use, such as 99 for ':99'. Defaults to the first free one.
+
+        size : str (Default = '1920x1080')
+            The resolution of the display.
+
+        depth : int (Default = 24)
+            The colour depth of the display.
+        '''
+        self.number = number
+        self.size = size
+        self.depth = depth
+        self.process = None
+
+    @property
+    def name(self) -> str:
+        return f':{self.number}'
+
+    def start(self) -> 'VirtualDisplay':
+        '''
+        Start the X server and wait for it to accept connections.
+        '''
+        if self.number == None:
+            self.number = _freeDisplay(FIRST_DISPLAY)
+
+        try:
+            self.process = subprocess.Popen(['Xvfb', self.name, '-screen', '0', f'{self.size}x{self.depth}', '-nolisten', 'tcp', '-noreset'], \
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise RuntimeError("Xvfb was not found, install it to run tests on virtual displays (such as the 'xvfb' package).")
+
+        # The server is ready once its socket exists
+        socket = os.path.join(_X_DIRECTORY, '.X11-unix', f'X{self.number}')
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while not os.path.exists(socket):
+            if self.process.poll() != None:
+                error = self.process.stderr.read().decode(errors='replace').strip()
+                raise RuntimeError(f'Xvfb could not start display {self.name}: {error}')
+            if time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f'Display {self.name} did not start within {STARTUP_TIMEOUT} seconds.')
+            time.sleep(0.05)
+        return self
+
+    def stop(self):
+        '''
+        Stop the X server.
+        '''
+        if self.process != None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process.stderr.close()
+            self.process = None
+
+    def environment(self, **variables) -> dict:
+        '''
+        Return a copy of the current environment that points at this display.
+        '''
+        environment = dict(os.environ, DISPLAY=self.name)
+        environment.update({name : str(value) for name, value in variables.items()})
+        return environment
+
+    def __enter__(self) -> 'VirtualDisplay':
+        return self.start()
+
+    def __exit__(self, *exception):
+        self.stop()
+
+
+def shard(tests : list[str], workers : int, timings : dict = None) -> list[list[str]]:
+    '''
+    Split tests between workers so each gets about the same amount of work. Tests of the same class
+     stay together, so class fixtures are only set up once.
+
+    Parameters
+    ----------
+    tests : list[str]
+        The ids of the tests, such as 'raddish.tests.test_matcher.TestMatcher.test_find_best_with_pyramid'.
+
+    workers : int
+        The number of shards to make.
+
+    timings : dict (Optional)
+        The duration of each test from an earlier run, keyed by id.
+
+    Returns
+    -------
+    list[list[str]]
+        The test ids of each shard, in their original order.
+    '''
+    timings = timings or {}
+    classes = {}
+    for test in tests:
+        classes.setdefault(test.rsplit('.', 1)[0], []).append(test)
+
+    # Hand the longest classes out first, each to the shard with the least work so far
+    cost = lambda members: sum(timings.get(test, DEFAULT_DURATION) for test in members)
+    shards = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for members in sorted(classes.values(), key=cost, reverse=True):
+        lightest = loads.index(min(loads))
+        shards[lightest].extend(members)
+        loads[lightest] += cost(members)
+
+    order = {test : index for index, test in enumerate(tests)}
+    return [sorted(members, key=order.get) for members in shards]
+
+
+def runTests(start : str = '.', pattern : str = 'test*.py', displays : int = None, size : str = DEFAULT_SIZE, \
+             timings_path : str = TIMINGS_FILE) -> dict:
+    '''
+    Run a test suite across several virtual displays at once, one worker process per display.
+
+    Parameters
+    ----------
+    start : str (Default = '.')
+        The directory to discover tests in.
+
+    pattern : str (Default = 'test*.py')
+        The pattern test files are matched against.
+
+    displays : int (Optional)
+        The number of displays and workers, defaults to the number of CPUs.
+
+    size : str (Default = '1920x1080')
+        The resolution of each display.
+
+    timings_path : str (Default = '.raddish_timings.json')
+        Where to keep test durations between runs, or None to not keep them.
+
+    Returns
+    -------
+    dict
+        The outcome of every test and a count of each outcome, as returned by 'aggregate'.
+    '''
+    displays = displays or os.cpu_count() or 1
+    timings = _loadTimings(timings_path)
+
+    servers = []
+    try:
+        for _ in range(displays):
+            servers.append(VirtualDisplay(size=size).start())
+
+        # Discover the tests on a display too, since importing them imports pyautogui
+        listing = subprocess.run([sys.executable, '-m', _MODULE, start, '--list', '--pattern', pattern], env=servers[0].environment(), \
+                                 capture_output=True, text=True)
+        if listing.returncode != 0:
+            raise RuntimeError(f'The tests could not be discovered:\n{listing.stderr}')
+        tests = json.loads(listing.stdout)
+
+        shards = [members for members in shard(tests, displays, timings) if len(members) > 0]
+        started = time.monotonic()
+        with tempfile.TemporaryDirectory() as directory:
+            # Start every worker on its own display, then wait for them all
+            workers = []
+            for index, members in enumerate(shards):
+                output = os.path.join(directory, f'worker{index}.json')
+                tests = os.path.join(directory, f'shard{index}.json')
+                with open(tests, 'w') as file:
+                    json.dump(members, file)
+                arguments = [sys.executable, '-m', _MODULE, start, '--worker', output, '--shard', tests]
+
+                # Send the worker's console output to a file, so a chatty worker never blocks on a full pipe
+                log = open(os.path.join(directory, f'worker{index}.log'), 'w+')
+                process = subprocess.Popen(arguments, env=servers[index].environment(RADDISH_WORKER=index), \
+                                           stdout=log, stderr=subprocess.STDOUT)
+                workers.append((process, log, output, members, servers[index].name))
+
+            reports = []
+            for process, log, output, members, display in workers:
+                process.wait()
+                log.seek(0)
+                reports.append(_readReport(output, members, display, log.read()))
+                log.close()
+
+        summary = aggregate(reports, time.monotonic() - started)
+    finally:
+        for server in servers:
+            server.stop()
+
+    if timings_path != None:
+        timings.update({result['id'] : result['duration'] for result in summary['results']})
+        with open(timings_path, 'w') as file:
+            json.dump(timings, file, indent=2, sort_keys=True)
+    return summary
+
+
+def aggregate(reports : list[dict], wall_time : float = 0.0) -> dict:
+    '''
+    Combine the reports of each worker into one.
+
+    Returns
+    -------
+    dict
+        'results' with the outcome of every test, 'counts' of each outcome, 'workers' with the
+         display, test count and duration of each worker, 'wall_time' and 'passed'.
+    '''
+    results = [result for report in reports for result in report['results']]
+    counts = {}
+    for result in results:
+        counts[result['outcome']] = counts.get(result['outcome'], 0) + 1
+
+    workers = [{'display': report['display'], 'tests': len(report['results']), 'duration': report['duration']} for report in reports]
+    passed = all(result['outcome'] in ('passed', 'skipped', 'expected failure') for result in results)
+    return {'results': results, 'counts': counts, 'workers': workers, 'wall_time': wall_time, 'passed': passed}
+
+
+def formatSummary(summary : dict) -> str:
+    '''
+    Format a summary from 'runTests' as text, listing every test that did not pass.
+    '''
+    lines = []
+    for result in summary['results']:
+        if result['outcome'] not in ('passed', 'skipped', 'expected failure'):
+            lines += [f"{result['outcome'].upper()}: {result['id']} on {result['display']}", result['message'], '']
+
+    for worker in summary['workers']:
+        lines.append(f"{worker['display']:>6} {worker['tests']:>5} tests {worker['duration']:>8.2f}s")
+
+    counts = ', '.join(f'{count} {outcome}' for outcome, count in sorted(summary['counts'].items()))
+    serial = sum(worker['duration'] for worker in summary['workers'])
+    lines.append(f"Ran {len(summary['results'])} tests in {summary['wall_time']:.2f}s ({serial:.2f}s of work): {counts}")
+    return '\n'.join(lines)
+
+
+#---Internal Functions---#
+class _Result(unittest.TestResult):
+    '''
+    Collects the outcome and duration of every test as plain data. A test whose subtests fail is
+     never passed to 'addSuccess' or 'addFailure', so it is recorded from its subtests once it stops.
+    '''
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self._started = {}
+        self._subtests = {}
+
+    def startTest(self, test : unittest.TestCase):
+        super().startTest(test)
+        self._started[test.id()] = time.perf_counter()
+
+    def stopTest(self, test : unittest.TestCase):
+        super().stopTest(test)
+        failures = self._subtests.pop(test.id(), [])
+        if test.id() in self._started and len(failures) > 0:
+            outcome = 'error' if any(outcome == 'error' for outcome, _ in failures) else 'failed'
+            self._record(test, outcome, '\n'.join(message for _, message in failures))
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err != None:
+            outcome, errors = ('failed', self.failures) if issubclass(err[0], test.failureException) else ('error', self.errors)
+            self._subtests.setdefault(test.id(), []).append((outcome, f'{subtest.id()}\n{errors[-1][1]}'))
+
+    def _record(self, test : unittest.TestCase, outcome : str, message : str = ''):
+        started = self._started.pop(test.id(), None)
+        duration = time.perf_counter() - started if started != None else 0.0
+        self.records.append({'id': test.id(), 'outcome': outcome, 'duration': duration, 'message': message, \
+                             'display': os.environ.get('DISPLAY', '')})
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record(test, 'passed')
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(test, 'failed', self.failures[-1][1])
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._record(test, 'error', self.errors[-1][1])
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record(test, 'skipped', reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self._record(test, 'expected failure')
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._record(test, 'unexpected success')
+
+def _runSuite(suite : unittest.TestSuite) -> list[dict]:
+    '''
+    Run a suite, returning the outcome of every test.
+    '''
+    result = _Result()
+    suite.run(result)
+    return result.records
+
+def _testIds(suite) -> list[str]:
+    '''
+    List the ids of every test in a suite, in the order they would run.
+    '''
+    if isinstance(suite, unittest.TestSuite):
+        return [test for member in suite for test in _testIds(member)]
+    return [suite.id()]
+
+def _readReport(output : str, members : list[str], display : str, console : str) -> dict:
+    '''
+    Read a worker's report, treating every test of the shard that has no result in it as an error,
+     such as every test if the worker died before writing one.
+    '''
+    report = {'display': display, 'duration': 0.0, 'results': []}
+    message = f'The worker on {display} stopped before reporting:\n{console[-2000:]}'
+    if os.path.exists(output):
+        with open(output) as file:
+            report = json.load(file)
+        message = f'The worker on {display} reported no result for the test:\n{console[-2000:]}'
+
+    reported = {result['id'] for result in report['results']}
+    report['results'] += [{'id': test, 'outcome': 'error', 'duration': 0.0, 'message': message, 'display': display} \
+                          for test in members if test not in reported]
+    return report
+
+def _freeDisplay(first : int, directory : str = None) -> int:
+    '''
+    Return the first display number from 'first' up that no X server holds a lock on.
+    '''
+    directory = directory or _X_DIRECTORY
+    number = first
+    while os.path.exists(os.path.join(directory, f'.X{number}-lock')) or \
+          os.path.exists(os.path.join(directory, '.X11-unix', f'X{number}')):
+        number += 1
+    return number
+
+def _loadTimings(path : str) -> dict:
+    '''
+    Load the test durations kept by an earlier run, if there are any.
+    '''
+    if path == None or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a unittest suite across several virtual X displays at once.')
+    parser.add_argument('start', nargs='?', default='.', help='The directory to discover tests in.')
+    parser.add_argument('--pattern', default='test*.py', help='The pattern test files are matched against.')
+    parser.add_argument('--displays', type=int, default=None, help='The number of displays and workers, defaults to the number of CPUs.')
+    parser.add_argument('--size', default=DEFAULT_SIZE, help='The resolution of each display.')
+    parser.add_argument('--list', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--worker', metavar='OUTPUT', help=argparse.SUPPRESS)
+    parser.add_argument('--shard', help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.list:
+        # List the tests for the parent, which does not import them itself
+        suite = unittest.defaultTestLoader.discover(arguments.start, pattern=arguments.pattern)
+        print(json.dumps(_testIds(suite)))
+
+    elif arguments.worker != None:
+        # Run a shard on this process's display and report back to the parent
+        started = time.perf_counter()
+        with open(arguments.shard) as file:
+            tests = json.load(file)
+
+        # Test ids are relative to the directory they were discovered in, as for discovery
+        sys.path.insert(0, os.path.abspath(arguments.start))
+        try:
+            records = _runSuite(unittest.defaultTestLoader.loadTestsFromNames(tests))
+        except Exception:
+            records = [{'id': test, 'outcome': 'error', 'duration': 0.0, 'message': traceback.format_exc(), \
+                        'display': os.environ.get('DISPLAY', '')} for test in tests]
+        with open(arguments.worker, 'w') as file:
+            json.dump({'display': os.environ.get('DISPLAY', ''), 'duration': time.perf_counter() - started, 'results': records}, file)
+
+    else:
+        summary = runTests(arguments.start, arguments.pattern, arguments.displays, arguments.size)
+        print(formatSummary(summary))
+        raise SystemExit(0 if summary['passed'] else 1)
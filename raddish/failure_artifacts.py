@@ -0,0 +1,239 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the failure context of image searches and the writer that saves it.
+-----------------'''
+
+#---Imports---#
+import atexit
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from .frame_source import Frame
+from .template_cache import Template
+from .matcher import Match, findBest
+
+#---Constants---#
+# The codecs artifacts can be written with, as (PIL format, file extension, save options).
+#  PNG at its lowest compression level is several times faster to encode than the default and still lossless.
+CODECS = {
+    'png': ('PNG', '.png', {'compress_level': 1}),
+    'jpeg': ('JPEG', '.jpg', {'quality': 90}),
+    'bmp': ('BMP', '.bmp', {}),
+}
+
+# The most failures waiting to be written before the caller waits for the writer to catch up
+MAX_PENDING = 16
+
+# The file every failure is listed in, one JSON object per line
+INDEX_FILE = 'failures.jsonl'
+
+_logger = logging.getLogger(__name__)
+
+
+class SearchFailure:
+    '''
+    What an image search saw when it failed, attached to the 'ImageNotFoundException' it raised
+     as its 'failure' attribute.
+
+    Members
+    -------
+    frame : Frame
+        The last frame the search captured.
+
+    region : list[int]
+        The region that was searched, as [x, y, width, height].
+
+    template : Template
+        The template that was searched for.
+
+    confidence : float
+        The confidence the search needed.
+
+    timestamp : float
+        The time the search failed at.
+    '''
+    __slots__ = ('frame', 'region', 'template', 'confidence', 'timestamp', '_near_miss')
+
+    def __init__(self, frame : Frame, region : list[int], template : Template, confidence : float, near_miss : Match = None):
+        self.frame = frame
+        self.region = list(region)
+        self.template = template
+        self.confidence = confidence
+        self.timestamp = time.time()
+        self._near_miss = near_miss
+
+    def nearMiss(self, frame : Frame = None) -> Match:
+        '''
+        Return the best scoring location of the template in the frame, which scored below the confidence.
+         If the search did not keep it, it is searched for now.
+
+        Parameters
+        ----------
+        frame : Frame (Optional)
+            A copy of the failure's frame to search instead, for when its pixels may have been reused since.
+        '''
+        frame = frame if frame != None else self.frame
+        if self._near_miss == None and frame != None:
+            self._near_miss = findBest(frame, self.template, self.confidence)
+        return self._near_miss
+
+
+class FailureArtifacts:
+    '''
+    An 'on_fail' hook that saves what a failed search saw: the frame it captured, the template, the
+     region searched and the near-miss location with its score.
+
+    The hook only copies the frame on the calling thread. Encoding happens on a background thread.
+     Frames and templates are named by a hash of their content, so a search that keeps failing
+     on the same screen writes its frame only once and adds one line to the index per failure.
+
+    Artifacts are laid out in the directory as:
+        failures.jsonl          One line per failure, naming its frame and template files.
+        frames/<hash>.png       Each distinct frame.
+        templates/<hash>.png    Each distinct template.
+    '''
+
+    def __init__(self, directory : str = 'failures', codec : str = 'png'):
+        '''
+        Initialize the 'FailureArtifacts' object.
+
+        Parameters
+        ----------
+        directory : str (Default = 'failures')
+            The directory the artifacts are written to.
+
+        codec : str (Default = 'png')
+            The codec frames and templates are written with, one of 'png', 'jpeg' or 'bmp'.
+        '''
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec '{codec}', expected one of {list(CODECS)}.")
+
+        self.directory = directory
+        self.codec = codec
+        self.written = 0
+        self.duplicates = 0
+
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(MAX_PENDING)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='raddish-artifacts')
+        _open.add(self)
+
+    def __call__(self, exception : Exception):
+        '''
+        Save the failure attached to an exception. Exceptions without one are ignored.
+        '''
+        failure = getattr(exception, 'failure', None)
+        if failure == None:
+            return
+
+        # Copy the pixels now, in case the array they live in is reused by the next capture.
+        #  The writer searches the copy for the near miss as well as saving it
+        frame = failure.frame
+        if frame != None:
+            frame = Frame(np.array(frame.pixels), frame.left, frame.top, frame.timestamp)
+
+        self._pending.acquire()
+        try:
+            self._executor.submit(self._write, failure, frame, str(exception))
+        except RuntimeError:
+            # The writer has been closed
+            self._pending.release()
+
+    def flush(self):
+        '''
+        Wait for every failure handed to the hook so far to be written.
+        '''
+        for _ in range(MAX_PENDING):
+            self._pending.acquire()
+        for _ in range(MAX_PENDING):
+            self._pending.release()
+
+    def close(self):
+        '''
+        Write out every pending failure and stop the background thread.
+        '''
+        self._executor.shutdown(wait=True)
+        _open.discard(self)
+
+
+    #---Internal Methods---#
+    def _write(self, failure : SearchFailure, frame : Frame, message : str):
+        '''
+        Encode a failure's images if they have not been written before, and add it to the index.
+         Errors are logged, since nothing waits on the writer to raise them.
+        '''
+        try:
+            near_miss = failure.nearMiss(frame)
+            entry = {
+                'time': datetime.datetime.fromtimestamp(failure.timestamp).isoformat(timespec='milliseconds'),
+                'message': message,
+                'region': failure.region,
+                'confidence': failure.confidence,
+                'template': failure.template.name,
+                'template_file': self._save('templates', failure.template.pixels if failure.template.pixels is not None \
+                                            else failure.template.gray.astype(np.uint8)),
+                'frame_file': None,
+                'frame_origin': None,
+                'near_miss': None,
+                'score': None,
+            }
+            if frame != None:
+                entry['frame_file'] = self._save('frames', frame.pixels)
+                entry['frame_origin'] = [frame.left, frame.top]
+            if near_miss != None:
+                entry['near_miss'] = list(near_miss.box())
+                entry['score'] = near_miss.score
+
+            with self._lock:
+                with open(os.path.join(self.directory, INDEX_FILE), 'a', encoding='utf-8') as file:
+                    file.write(json.dumps(entry) + '\n')
+        except Exception:
+            _logger.exception(f"Could not write the artifacts of the failure: {message}")
+        finally:
+            self._pending.release()
+
+    def _save(self, folder : str, pixels : np.ndarray) -> str:
+        '''
+        Write an image under the hash of its content, unless it has already been written.
+         Returns its path relative to the artifact directory.
+        '''
+        pixels = np.ascontiguousarray(pixels)
+        digest = hashlib.blake2b(pixels.tobytes(), digest_size=16)
+        digest.update(str(pixels.shape).encode('ascii'))
+
+        image_format, extension, options = CODECS[self.codec]
+        name = os.path.join(folder, digest.hexdigest() + extension)
+        path = os.path.join(self.directory, name)
+        if name in self._seen or os.path.exists(path):
+            self._seen.add(name)
+            self.duplicates += 1
+            return name
+
+        os.makedirs(os.path.join(self.directory, folder), exist_ok=True)
+        Image.fromarray(pixels).save(path, image_format, **options)
+        self._seen.add(name)
+        self.written += 1
+        return name
+
+
+#---Internal Functions---#
+# The writers that are still open, held weakly so one that is no longer used can be collected
+_open = weakref.WeakSet()
+
+@atexit.register
+def _closeAll():
+    '''
+    Write out the pending failures of every writer that is still open when the interpreter exits.
+    '''
+    for artifacts in list(_open):
+        artifacts.close()
@@ -0,0 +1,457 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the frame sources that image searches capture from.
+-----------------'''
+
+#---Imports---#
+import threading
+import time
+import numpy as np
+from PIL import Image
+from .instrumentation import phase
+
+#---Constants---#
+# The ITU-R 601-2 luma weights that PIL uses when converting to 'L' mode
+_GRAY_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# The number of seconds the screen size is cached for before it is asked for again
+SCREEN_SIZE_TTL = 1.0
+
+# The number of levels each colour channel is quantized to for coarse colour histograms
+COLOUR_LEVELS = 2
+
+
+class Frame:
+    '''
+    A single captured image along with the screen position it was captured from.
+     Every search made against the same 'Frame' reuses the same pixels, so a
+     step that checks several templates only has to capture the screen once.
+
+    The conversions of the pixels are built under a lock, since one frame may be searched
+     from several threads at once, such as by a capture service's watchers and the script.
+    '''
+
+    def __init__(self, pixels : np.ndarray, left : int = 0, top : int = 0, timestamp : float = None):
+        '''
+        Initialize the 'Frame' object.
+
+        Parameters
+        ----------
+        pixels : np.ndarray
+            An RGB array of shape (height, width, 3) holding the captured pixels.
+
+        left : int (Default = 0)
+            The x-coordinate on the screen of the left edge of the frame.
+
+        top : int (Default = 0)
+            The y-coordinate on the screen of the top edge of the frame.
+
+        timestamp : float (Optional)
+            The time the frame was captured at, defaults to the current time.
+        '''
+        self.pixels = pixels
+        self.left = left
+        self.top = top
+        self.timestamp = time.time() if timestamp == None else timestamp
+
+        # Lazily created conversions of the pixels, and the lock they are built under
+        self._lock = threading.RLock()
+        self._image = None
+        self._gray = None
+        self._levels = None
+        self._integrals = {}
+
+    @property
+    def width(self) -> int:
+        return self.pixels.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.pixels.shape[0]
+
+    @property
+    def region(self) -> list[int]:
+        '''
+        The area of the screen covered by the frame in the format [x, y, width, height].
+        '''
+        return [self.left, self.top, self.width, self.height]
+
+    def image(self) -> Image.Image:
+        '''
+        Return the frame as a PIL image, converting it only once.
+        '''
+        if self._image is None:
+            with self._lock:
+                if self._image is None:
+                    self._image = Image.fromarray(self.pixels)
+        return self._image
+
+    def gray(self) -> np.ndarray:
+        '''
+        Return the frame as a float32 grayscale array, converting it only once.
+         Uses the same luminance weights as PIL's 'L' mode.
+        '''
+        if self._gray is None:
+            with self._lock:
+                if self._gray is None:
+                    self._gray = _toGray(self.pixels)
+        return self._gray
+
+    def pyramid(self, level : int) -> np.ndarray:
+        '''
+        Return the grayscale frame downsampled by a factor of 2**level, building
+         each pyramid level only once.
+
+        Parameters
+        ----------
+        level : int
+            The pyramid level, where level 0 is the full resolution grayscale frame.
+
+        Returns
+        -------
+        np.ndarray
+            The downsampled float32 grayscale array.
+        '''
+        levels = self._levels
+        if levels is None or len(levels) <= level:
+            with self._lock:
+                # Build the missing levels on a copy, so other threads only ever see complete levels
+                levels = list(self._levels) if self._levels is not None else [self.gray()]
+                while len(levels) <= level:
+                    levels.append(_downsample(levels[-1]))
+                self._levels = levels
+        return levels[level]
+
+    def integral(self, level : int = 0) -> tuple[np.ndarray]:
+        '''
+        Return summed-area tables of a pyramid level and of its squared pixels, building them only
+         once. The sum over any rectangle of the level can then be read from four table entries.
+
+        Parameters
+        ----------
+        level : int (Default = 0)
+            The pyramid level, where level 0 is the full resolution grayscale frame.
+
+        Returns
+        -------
+        tuple[np.ndarray]
+            The two float64 tables, each of shape (height + 1, width + 1) for the level.
+        '''
+        tables = self._integrals.get(level)
+        if tables is None:
+            with self._lock:
+                tables = self._integrals.get(level)
+                if tables is None:
+                    values = self.pyramid(level).astype(np.float64)
+                    tables = self._integrals[level] = (_summedArea(values), _summedArea(values * values))
+        return tables
+
+    def crop(self, region : list[int]) -> 'Frame':
+        '''
+        Return a view of part of the frame without copying any pixels.
+
+        Parameters
+        ----------
+        region : list[int]
+            A list of four integers that represent a region on the screen.
+              The list should be in this format: [x, y, width, height]
+
+        Returns
+        -------
+        Frame
+            A frame covering the part of the region that lies within this frame.
+        '''
+        # Translate the screen region into array coordinates, clipped to the frame
+        x0 = min(max(region[0] - self.left, 0), self.width)
+        y0 = min(max(region[1] - self.top, 0), self.height)
+        x1 = min(max(region[0] + region[2] - self.left, x0), self.width)
+        y1 = min(max(region[1] + region[3] - self.top, y0), self.height)
+
+        # Return the frame unchanged if the region covers all of it
+        if (x0, y0, x1, y1) == (0, 0, self.width, self.height):
+            return self
+
+        cropped = Frame(self.pixels[y0:y1, x0:x1], self.left + x0, self.top + y0, self.timestamp)
+
+        # Share the grayscale conversion if it has already been made
+        if self._gray is not None:
+            cropped._gray = self._gray[y0:y1, x0:x1]
+
+        return cropped
+
+    def contains(self, region : list[int]) -> bool:
+        '''
+        Check if a region lies entirely within the frame.
+        '''
+        return self.left <= region[0] and self.top <= region[1] and \
+            region[0] + region[2] <= self.left + self.width and region[1] + region[3] <= self.top + self.height
+
+
+class FrameSource:
+    '''
+    The base class for anything that raddish can capture frames from.
+     Subclasses only need to implement 'grab' and 'size'.
+    '''
+
+    def grab(self, region : list[int] = None) -> Frame:
+        '''
+        Capture a frame.
+
+        Parameters
+        ----------
+        region : list[int] (Optional)
+            A list of four integers that represent a region on the screen.
+              The list should be in this format: [x, y, width, height]
+
+        Returns
+        -------
+        Frame
+            The captured frame, covering the whole source if no region is given.
+        '''
+        raise NotImplementedError
+
+    def size(self) -> tuple[int]:
+        '''
+        Return the (width, height) of the area the source captures from.
+        '''
+        raise NotImplementedError
+
+    def close(self):
+        '''
+        Release any resources held by the source.
+        '''
+        pass
+
+
+class ScreenFrameSource(FrameSource):
+    '''
+    Captures frames from the live screen through pyautogui. The screen size is cached
+     for a short time, and refreshed early whenever a full screen capture comes back
+     a different size, such as after the display resolution changes.
+
+    pyautogui is only imported on the first capture, since importing it needs a display and the
+     other frame sources are meant to work without one.
+    '''
+
+    def __init__(self):
+        '''
+        Initialize the 'ScreenFrameSource' object.
+        '''
+        self._size = None
+        self._size_time = 0.0
+
+    def grab(self, region : list[int] = None) -> Frame:
+        import pyautogui
+
+        if region == None:
+            # Capture the whole screen, which also tells us its current size
+            screenshot = pyautogui.screenshot()
+            self._size, self._size_time = screenshot.size, time.monotonic()
+            return Frame(np.asarray(screenshot.convert('RGB')))
+
+        # Take a screenshot of only the requested region
+        screenshot = pyautogui.screenshot(region=tuple(region))
+        return Frame(np.asarray(screenshot.convert('RGB')), region[0], region[1])
+
+    def size(self) -> tuple[int]:
+        if self._size == None or time.monotonic() - self._size_time > SCREEN_SIZE_TTL:
+            import pyautogui
+            self._size, self._size_time = tuple(pyautogui.size()), time.monotonic()
+        return self._size
+
+    def invalidate(self):
+        '''
+        Forget the cached screen size so the next call to 'size' asks the display again.
+        '''
+        self._size = None
+
+
+class ArrayFrameSource(FrameSource):
+    '''
+    Serves frames from an in-memory image, so searches can run without a display.
+    '''
+
+    def __init__(self, pixels):
+        '''
+        Initialize the 'ArrayFrameSource' object.
+
+        Parameters
+        ----------
+        pixels : np.ndarray | PIL.Image.Image
+            The image that stands in for the screen.
+        '''
+        self.frame = Frame(_toPixels(pixels))
+
+    def grab(self, region : list[int] = None) -> Frame:
+        if region == None:
+            return self.frame
+        return self.frame.crop(region)
+
+    def size(self) -> tuple[int]:
+        return (self.frame.width, self.frame.height)
+
+
+class FileFrameSource(ArrayFrameSource):
+    '''
+    Serves frames from an image file, which is decoded once when the source is created.
+    '''
+
+    def __init__(self, path : str):
+        '''
+        Initialize the 'FileFrameSource' object.
+
+        Parameters
+        ----------
+        path : str
+            The path to the image that stands in for the screen.
+        '''
+        self.path = path
+        super().__init__(_toPixels(path))
+
+
+class SequenceFrameSource(FrameSource):
+    '''
+    Serves a recorded sequence of frames, advancing by one on every grab.
+     Useful for replaying a screen that changes over time, such as a dialog appearing.
+    '''
+
+    def __init__(self, frames : list, loop : bool = False):
+        '''
+        Initialize the 'SequenceFrameSource' object.
+
+        Parameters
+        ----------
+        frames : list
+            The images to serve, as arrays, PIL images or paths.
+
+        loop : bool (Default = False)
+            If True, start from the first frame again after the last one, otherwise
+             keep serving the last frame.
+        '''
+        if len(frames) == 0:
+            raise ValueError("A sequence frame source needs at least one frame.")
+
+        self.frames = [Frame(_toPixels(frame)) for frame in frames]
+        self.loop = loop
+        self.index = 0
+
+    def grab(self, region : list[int] = None) -> Frame:
+        frame = self.frames[self.index]
+
+        # Advance to the next frame
+        if self.index + 1 < len(self.frames):
+            self.index += 1
+        elif self.loop:
+            self.index = 0
+
+        # Stamp the frame with the time it was served
+        frame = Frame(frame.pixels, timestamp=time.time())
+        if region == None:
+            return frame
+        return frame.crop(region)
+
+    def size(self) -> tuple[int]:
+        return (self.frames[self.index].width, self.frames[self.index].height)
+
+
+#---Active Source---#
+_active_source = ScreenFrameSource()
+
+def setFrameSource(source : FrameSource) -> FrameSource:
+    '''
+    Set the frame source that every raddish search captures from.
+
+    Parameters
+    ----------
+    source : FrameSource
+        The new frame source, or None to go back to the live screen.
+
+    Returns
+    -------
+    FrameSource
+        The frame source that was previously active.
+    '''
+    global _active_source
+    previous = _active_source
+    _active_source = source if source != None else ScreenFrameSource()
+    return previous
+
+def getFrameSource() -> FrameSource:
+    '''
+    Return the frame source that raddish searches currently capture from.
+    '''
+    return _active_source
+
+def captureFrame(region : list[int] = None) -> Frame:
+    '''
+    Capture a frame from the active frame source.
+
+    Parameters
+    ----------
+    region : list[int] (Optional)
+        A list of four integers that represent a region on the screen.
+          The list should be in this format: [x, y, width, height]
+
+    Returns
+    -------
+    Frame
+        The captured frame.
+    '''
+    with phase('capture'):
+        return _active_source.grab(region)
+
+
+#---Internal Functions---#
+def _toPixels(image) -> np.ndarray:
+    '''
+    Convert a path, PIL image, or array into an RGB uint8 array.
+    '''
+    if isinstance(image, Frame):
+        return image.pixels
+    if isinstance(image, str):
+        with Image.open(image) as opened:
+            return np.asarray(opened.convert('RGB'))
+    if isinstance(image, Image.Image):
+        return np.asarray(image.convert('RGB'))
+
+    pixels = np.asarray(image, dtype=np.uint8)
+
+    # Expand grayscale arrays and drop any alpha channel
+    if pixels.ndim == 2:
+        pixels = np.repeat(pixels[:, :, None], 3, axis=2)
+    elif pixels.shape[2] == 4:
+        pixels = pixels[:, :, :3]
+    return pixels
+
+def _toGray(pixels : np.ndarray) -> np.ndarray:
+    '''
+    Convert an RGB array into a float32 grayscale array.
+    '''
+    return pixels @ _GRAY_WEIGHTS
+
+def _colourBins(pixels : np.ndarray) -> np.ndarray:
+    '''
+    Return the coarse colour bin of every pixel of an RGB array.
+    '''
+    levels = pixels.astype(np.intp) * COLOUR_LEVELS // 256
+    return (levels[:, :, 0] * COLOUR_LEVELS + levels[:, :, 1]) * COLOUR_LEVELS + levels[:, :, 2]
+
+def _summedArea(values : np.ndarray) -> np.ndarray:
+    '''
+    Build a summed-area table with a leading row and column of zeros, so that entry (y, x)
+     holds the sum of every value above and to the left of it.
+    '''
+    table = np.zeros((values.shape[0] + 1, values.shape[1] + 1) + values.shape[2:], dtype=values.dtype)
+    np.cumsum(values, axis=0, out=table[1:, 1:])
+    np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+    return table
+
+def _downsample(gray : np.ndarray) -> np.ndarray:
+    '''
+    Halve the resolution of a grayscale array by averaging each 2x2 block.
+    '''
+    height, width = gray.shape[0] // 2 * 2, gray.shape[1] // 2 * 2
+    even = gray[0:height:2, 0:width:2] + gray[1:height:2, 0:width:2]
+    odd = gray[0:height:2, 1:width:2] + gray[1:height:2, 1:width:2]
+    return (even + odd) * np.float32(0.25)
@@ -0,0 +1,154 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A class for the lightweight 'Rect' object.
+-----------------'''
+
+#---Imports---#
+from pyscreeze import Box
+
+
+class Rect:
+    '''
+    A lightweight rectangle on the screen. Unlike a 'SearchRectangle' it is never validated
+     against the screen or drawn, so it is cheap to create many of them to narrow a search.
+     A 'Rect' can be passed anywhere a region list is accepted.
+    '''
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    def __init__(self, x : int, y : int, width : int, height : int):
+        '''
+        Initialize the 'Rect' object.
+
+        Parameters
+        ----------
+        x : int
+            The x-coordinate of the left edge.
+
+        y : int
+            The y-coordinate of the top edge.
+
+        width : int
+            The width of the rectangle.
+
+        height : int
+            The height of the rectangle.
+        '''
+        self.x = int(x)
+        self.y = int(y)
+        self.width = int(width)
+        self.height = int(height)
+
+    @classmethod
+    def fromRegion(cls, region) -> 'Rect':
+        '''
+        Create a rectangle from a region list, Box or SearchRectangle.
+        '''
+        if hasattr(region, 'width') and hasattr(region, 'x'):
+            return cls(region.x, region.y, region.width, region.height)
+        return cls(*region[:4])
+
+    @property
+    def right(self) -> int:
+        return self.x + self.width
+
+    @property
+    def bottom(self) -> int:
+        return self.y + self.height
+
+    @property
+    def area(self) -> int:
+        return max(self.width, 0) * max(self.height, 0)
+
+    @property
+    def center(self) -> tuple[int]:
+        return (self.x + self.width // 2, self.y + self.height // 2)
+
+    def isEmpty(self) -> bool:
+        '''
+        Check if the rectangle covers no pixels.
+        '''
+        return self.width <= 0 or self.height <= 0
+
+    def isWithin(self, point : list[int]) -> bool:
+        '''
+        Check if a point [x, y] is within the rectangle.
+        '''
+        return self.x <= point[0] < self.right and self.y <= point[1] < self.bottom
+
+    def contains(self, other : 'Rect') -> bool:
+        '''
+        Check if another rectangle lies entirely within this one.
+        '''
+        return self.x <= other.x and self.y <= other.y and other.right <= self.right and other.bottom <= self.bottom
+
+    def intersection(self, other : 'Rect') -> 'Rect':
+        '''
+        Return the area covered by both rectangles, which is empty if they do not overlap.
+        '''
+        x, y = max(self.x, other.x), max(self.y, other.y)
+        return Rect(x, y, max(min(self.right, other.right) - x, 0), max(min(self.bottom, other.bottom) - y, 0))
+
+    def union(self, other : 'Rect') -> 'Rect':
+        '''
+        Return the smallest rectangle covering both rectangles.
+        '''
+        x, y = min(self.x, other.x), min(self.y, other.y)
+        return Rect(x, y, max(self.right, other.right) - x, max(self.bottom, other.bottom) - y)
+
+    def expand(self, margin : int, margin_y : int = None) -> 'Rect':
+        '''
+        Return the rectangle grown by a margin on every side, or shrunk if the margin is negative.
+
+        Parameters
+        ----------
+        margin : int
+            The number of pixels to grow the left and right edges by, and the top and bottom too
+             unless 'margin_y' is given.
+
+        margin_y : int (Optional)
+            The number of pixels to grow the top and bottom edges by.
+        '''
+        margin_y = margin if margin_y == None else margin_y
+        return Rect(self.x - margin, self.y - margin_y, self.width + margin * 2, self.height + margin_y * 2)
+
+    def subdivide(self, rows : int, columns : int) -> list['Rect']:
+        '''
+        Split the rectangle into a grid of cells, listed row by row.
+
+        Parameters
+        ----------
+        rows : int
+            The number of rows in the grid.
+
+        columns : int
+            The number of columns in the grid.
+        '''
+        return [Rect(self.x + self.width * column // columns, self.y + self.height * row // rows,
+                     self.width * (column + 1) // columns - self.width * column // columns,
+                     self.height * (row + 1) // rows - self.height * row // rows)
+                for row in range(rows) for column in range(columns)]
+
+    def toList(self) -> list[int]:
+        return [self.x, self.y, self.width, self.height]
+
+    def toBox(self) -> Box:
+        return Box(self.x, self.y, self.width, self.height)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.width, self.height))
+
+    def __getitem__(self, index : int) -> int:
+        return self.toList()[index]
+
+    def __len__(self) -> int:
+        return 4
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Rect) and self.toList() == other.toList()
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y, self.width, self.height))
+
+    def __repr__(self) -> str:
+        return f'Rect(x={self.x}, y={self.y}, width={self.width}, height={self.height})'
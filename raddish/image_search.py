@@ -6,16 +6,34 @@
 
 
 #---Imports---#
-import pyautogui
-from pyautogui import ImageNotFoundException
-from search_rectangle import SearchRectangle
+from pyscreeze import Box
+from .search_rectangle import SearchRectangle
+from .frame_source import Frame, captureFrame
+from .template_cache import getTemplate
+from .matcher import Match, findBest, iterAll
+from .change_detection import changedTiles, changedRegions, mergeTiles, AdaptivePoller
+from .parallel_search import iterAllParallel
+from .results import MatchStream, TRAVEL_ORDERS
+from .location_hints import getHintStore
+from .instrumentation import instrument, phase, note, count
+from .failure_artifacts import SearchFailure
+import contextvars
 import time
 from typing import Callable as function
-from utility import _determineRegion
+from typing import Iterator
+from .utility import _determineRegion, ImageNotFoundException
 
+#---Constants---#
+# The number of seconds batch clicks are given to change what was clicked before they are reported
+VERIFY_TIMEOUT = 1.0
 
+# The number of seconds between the captures that check whether batch clicks have registered
+VERIFY_INTERVAL = 0.05
+
+
+@instrument(template=True)
 def locateImage(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, \
-                on_success : function = None, on_fail : function = None ) -> tuple[int]:
+                on_success : function = None, on_fail : function = None, frame : Frame = None, hints : bool = True) -> tuple[int]:
     '''
     Locate an image on the screen.
 
@@ -38,7 +56,14 @@ def locateImage(image_path: str, confidence: float = 0.9, region: list[int] = No
         An event to trigger when the image is found.
     
     on_fail : function (Optional)
-        An event to trigger when the image is not found.
+        An event to trigger when the image is not found. It is passed the exception, whose 'failure'
+         attribute holds what the search saw, such as for 'FailureArtifacts' to save.
+
+    frame : Frame (Optional)
+        A frame that has already been captured, to search instead of capturing a new one.
+
+    hints : bool (Optional)
+        If True, first check where the image was last found in this region before searching all of it.
 
     Returns
     -------
@@ -46,18 +71,23 @@ def locateImage(image_path: str, confidence: float = 0.9, region: list[int] = No
         A tuple of two integers that represent the x, y coordinates of the image.
     '''
     # Determine the region to search for the image
-    top, left, width, height = _determineRegion(region, search_rectangle)
+    region = _determineRegion(region, search_rectangle)
+    note(region_area=region[2] * region[3])
 
     # Find the image on the screen
     try:
-        image_location = pyautogui.locateOnScreen(image_path, confidence=confidence, region=(top, left, width, height))
+        if hints:
+            image_location = _locateWithHints(image_path, region, confidence, frame)
+        else:
+            image_location = _locateInFrame(image_path, _frameForRegion(region, frame), confidence)
 
-        # Trigger the on_success event hook if the image is found
-        if image_location != None:
+        # Raise an exception if the image is not found
+        if image_location == None:
+            raise _notFound(f"The image: '{image_path}' was not found on the screen.", region, confidence)
 
-            # Trigger the on_success event hook if it is callable
-            if callable(on_success):
-                on_success(image_location)
+        # Trigger the on_success event hook if it is callable
+        if callable(on_success):
+            on_success(image_location)
 
         # Return the image location   
         return image_location
@@ -69,8 +99,10 @@ def locateImage(image_path: str, confidence: float = 0.9, region: list[int] = No
         raise e
     
 
+@instrument(template=True)
 def locateAllImages(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, \
-                    on_success : function = None, on_fail : function = None) -> list[tuple[int]]:
+                    on_success : function = None, on_fail : function = None, frame : Frame = None, parallel : bool = False, \
+                    workers : int = None, max_results : int = None, stop_when : function = None, order : str = None) -> MatchStream:
     '''
     Locate all instances of an image on the screen.
 
@@ -95,20 +127,47 @@ def locateAllImages(image_path: str, confidence: float = 0.9, region: list[int]
     on_fail : function (Optional)
         An event to trigger when the image is not found.
 
+    frame : Frame (Optional)
+        A frame that has already been captured, to search instead of capturing a new one.
+
+    parallel : bool (Optional)
+        If True, split the region into tiles and match them across a pool of processes.
+
+    workers : int (Optional)
+        The number of processes to use when searching in parallel, defaults to the number of CPUs.
+
+    max_results : int (Optional)
+        Stop the search once this many instances have been found.
+
+    stop_when : function (Optional)
+        Called with each instance as it is found, the search stops after the first instance it returns True for.
+
+    order : str (Optional)
+        The order to return the instances in, one of 'score', 'row', 'column', 'nearest' or 'shortest'. By default
+         instances are returned as soon as they are found.
+
     Returns
     -------
-    list[tuple[int]]
-        A list of tuples of two integers that represent the x, y coordinates of the image.
+    MatchStream
+        The deduplicated locations of the image, which are found as the stream is iterated.
     '''
     # Determine the region to search for the image
-    top, left, width, height = _determineRegion(region, search_rectangle)
+    region = _determineRegion(region, search_rectangle)
+    note(region_area=region[2] * region[3])
 
     # Find the image on the screen
     try:
-        image_locations = pyautogui.locateAllOnScreen(image_path, confidence=confidence, region=(top, left, width, height))
+        frame = _frameForRegion(region, frame)
+        _last_search.set((frame, getTemplate(image_path), None))
+        matches = _iterMatches(image_path, frame, confidence, parallel, workers)
+        image_locations = MatchStream(matches, max_results=max_results, stop_when=stop_when, order=order, frame=frame)
+
+        # Raise an exception if not even one instance of the image is found
+        if image_locations.first() == None:
+            raise _notFound(f"The image: '{image_path}' was not found on the screen.", region, confidence)
 
-        # Trigger the on_success event hook if the image is found
-        if image_locations != None and callable(on_success):
+        # Trigger the on_success event hook if it is callable
+        if callable(on_success):
             on_success(image_locations)
     
         # Return the image locations
@@ -121,6 +180,7 @@ def locateAllImages(image_path: str, confidence: float = 0.9, region: list[int]
         raise e
     
 
+@instrument(template=True)
 def clickImage(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, timeout = 0):
     '''
     Click on an image on the screen. Will wait for the image to appear if a timeout is provided.
@@ -144,24 +204,35 @@ def clickImage(image_path: str, confidence: float = 0.9, region: list[int] = Non
         The amount of time in seconds to wait for the image to appear on the screen.
     '''
     # Determine the region to search for the image
-    top, left, width, height = _determineRegion(region, search_rectangle)
+    region = _determineRegion(region, search_rectangle)
+    note(region_area=region[2] * region[3])
 
     # Find the image on the screen
     try:
         # Find the image on the screen, wait for a timeout if necessary
-        image_location = waitForImage(image_path, confidence=confidence, region=(top, left, width, height), search_rectangle=search_rectangle, timeout=timeout)
+        image_location = waitForImage(image_path, confidence=confidence, region=region, search_rectangle=search_rectangle, timeout=timeout)
 
         # Click on the image
-        pyautogui.click(image_location)
+        import pyautogui
+        with phase('click'):
+            pyautogui.click(image_location)
     
     # Raise an exception if the image is not found
     except ImageNotFoundException as e:
         raise e
 
 
-def clickAllImages(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, timeout = 0):
+@instrument(template=True)
+def clickAllImages(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, timeout = 0, \
+                   max_results : int = None, order : str = None, batch : bool = False, retry : bool = False) -> list[Box]:
     '''
     Click on all instances of an image on the screen. Also uses a timeout to sleep after the click.
+     Clicking starts as soon as the first instance is found, while the rest are still being searched for.
+
+    In batch mode every instance is clicked without pyautogui's pause between clicks, then the
+     screen is captured until each instance has changed, such as a checkbox being ticked, or until
+     VERIFY_TIMEOUT has passed. Only captures taken after the last click count, so a slow repaint or
+     a capture service's older frame is waited out rather than mistaken for a missed click.
 
     Parameters
     ----------
@@ -180,26 +251,92 @@ def clickAllImages(image_path: str, confidence: float = 0.9, region: list[int] =
 
     timeout : int (Optional)
         The amount of time in seconds to wait for the image to appear on the screen.
+
+    max_results : int (Optional)
+        The most instances to click.
+
+    order : str (Optional)
+        The order to click the instances in, one of 'score', 'row', 'column', 'nearest' or 'shortest'.
+         'nearest' and 'shortest' keep the mouse's path short, starting from where the mouse is.
+
+    batch : bool (Optional)
+        If True, click every instance without pausing and verify the clicks together afterwards.
+
+    retry : bool (Optional)
+        In batch mode, click the instances that did not change once more at the normal pace before
+         reporting them. Clicking a toggle twice undoes it, so this is off by default.
+
+    Returns
+    -------
+    list[Box]
+        The locations of the instances that were clicked.
+
+    Raises
+    ------
+    ClickNotRegisteredException
+        In batch mode, if some instances did not change after being clicked.
     '''
     # Determine the region to search for the image
-    top, left, width, height = _determineRegion(region, search_rectangle)
+    region = _determineRegion(region, search_rectangle)
+    note(region_area=region[2] * region[3])
 
     # Find the image on the screen
     try:
 
         # Find all instances of the image on the screen, wait for a timeout if necessary
-        image_locations = waitForAllImages(image_path, confidence=confidence, region=(top, left, width, height), search_rectangle=search_rectangle, timeout=timeout)
+        import pyautogui
+        travel = order in TRAVEL_ORDERS
+        image_locations = waitForAllImages(image_path, confidence=confidence, region=region, search_rectangle=search_rectangle, timeout=timeout, \
+                                           max_results=None if travel else max_results, order=None if travel else order)
+
+        # Plan the path between the instances from wherever the mouse is now
+        if travel:
+            image_locations = MatchStream(image_locations.matches(), max_results=max_results, order=order, start=tuple(pyautogui.position()), \
+                                          frame=image_locations.frame)
 
         # Click on all instances of the image
-        for image_location in image_locations:
-            pyautogui.click(image_location, interval=timeout)
+        if not batch:
+            clicked = []
+            for image_location in image_locations:
+                with phase('click'):
+                    pyautogui.click(image_location, interval=timeout)
+                clicked.append(image_location)
+            return clicked
+
+        # Compare the frame the instances were found in with captures taken after they are clicked
+        clicked = image_locations.all()
+        before = image_locations.frame
+        with phase('click'):
+            for image_location in clicked:
+                clicked_at = time.time()
+                pyautogui.click(image_location, _pause=False)
+        count('clicks', len(clicked))
+
+        with phase('verify'):
+            missed = _awaitChanges(before, region, clicked, clicked_at)
+
+            # Click the instances that did not respond again, one at a time, if asked to
+            if retry and len(missed) > 0:
+                count('retries', len(missed))
+                for image_location in missed:
+                    clicked_at = time.time()
+                    pyautogui.click(image_location)
+                missed = _awaitChanges(before, region, missed, clicked_at)
+
+        if len(missed) > 0:
+            e = ClickNotRegisteredException(f"{len(missed)} of {len(clicked)} instances of the image: '{image_path}' did not change when clicked.")
+            e.locations = missed
+            raise e
+        return clicked
 
     # Raise an exception if the image is not found
     except ImageNotFoundException as e:
         raise e
 
 
-def waitForImage(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, timeout = 0):
+@instrument(template=True)
+def waitForImage(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, timeout = 0, \
+                 hints : bool = True):
     '''
     Wait for an image to appear on the screen.
 
@@ -220,29 +357,46 @@ def waitForImage(image_path: str, confidence: float = 0.9, region: list[int] = N
 
     timeout : int (Optional)
         The amount of time in seconds to wait for the image to appear on the screen.
+
+    hints : bool (Optional)
+        If True, first check where the image was last found in this region before searching all of it.
+
+    Returns
+    -------
+    Box
+        The location of the image on the screen.
     '''
      # Determine the region to search for the image
-    top, left, width, height = _determineRegion(region, search_rectangle)
+    region = _determineRegion(region, search_rectangle)
+    note(region_area=region[2] * region[3])
 
-    # Record the start time
-    start_time = time.time()
+    # Check where the image was last found before polling the whole region
+    if hints:
+        image_location = _locateWithHints(image_path, region, confidence, widen=False)
+        if image_location != None:
+            return image_location
 
-    # Find the image on the screen
-    while True:
-        
-        try:
-            pyautogui.locateOnScreen(image_path, confidence=confidence, region=(top, left, width, height))
-            return
-        except ImageNotFoundException as e:
-            pass
-
-        if time.time() - start_time > timeout:
-            raise ImageNotFoundException(f"The image: '{image_path}' was not found within the timeout period.")
-        
-        # Sleep to space out the searches
-        time.sleep(0.1)
+    # Poll the screen until the image appears
+    def search(frame : Frame) -> list[Match]:
+        match = findBest(frame, getTemplate(image_path), confidence)
+        return [match] if match != None and match.score >= confidence else []
+
+    image_location = _pollFrames(image_path, region, timeout, search).first()
+
+    # Raise an exception if the timeout is reached
+    if image_location == None:
+        raise _notFound(f"The image: '{image_path}' was not found within the timeout period.", region, confidence)
+
+    # Remember where the image was found for the next search
+    template = getTemplate(image_path)
+    if hints and template.path != None:
+        getHintStore().record(template.path, region, image_location)
+
+    return image_location
     
-def waitForAllImages(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, timeout = 0):
+@instrument(template=True)
+def waitForAllImages(image_path: str, confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, timeout = 0, \
+                     max_results : int = None, stop_when : function = None, order : str = None) -> MatchStream:
     '''
     Wait for all instances of an image to appear on the screen.
 
@@ -263,27 +417,214 @@ def waitForAllImages(image_path: str, confidence: float = 0.9, region: list[int]
 
     timeout : int (Optional)
         The amount of time in seconds to wait for the image to appear on the screen.
+
+    max_results : int (Optional)
+        Stop the search once this many instances have been found.
+
+    stop_when : function (Optional)
+        Called with each instance as it is found, the search stops after the first instance it returns True for.
+
+    order : str (Optional)
+        The order to return the instances in, one of 'score', 'row', 'column', 'nearest' or 'shortest'. By default
+         instances are returned as soon as they are found.
+
+    Returns
+    -------
+    MatchStream
+        The deduplicated locations of every instance of the image on the screen.
     '''
     # Determine the region to search for the image
-    top, left, width, height = _determineRegion(region, search_rectangle)
+    region = _determineRegion(region, search_rectangle)
+    note(region_area=region[2] * region[3])
+
+    # Poll the screen until any instance of the image appears
+    image_locations = _pollFrames(image_path, region, timeout, lambda frame: _iterMatches(image_path, frame, confidence), \
+                                  max_results=max_results, stop_when=stop_when, order=order)
+
+    # Raise an exception if the timeout is reached
+    if image_locations.first() == None:
+        raise _notFound(f"The image: '{image_path}' was not found within the timeout period.", region, confidence)
+
+    return image_locations
+
+
+@instrument()
+def locateMany(image_paths: list[str], confidence: float = 0.9, region: list[int] = None, search_rectangle: SearchRectangle = None, \
+               frame : Frame = None) -> dict[str, Box]:
+    '''
+    Locate several images on the screen, capturing the screen only once.
+
+    Parameters
+    ----------
+    image_paths : list[str]
+        The paths to the images to search for.
 
-    # Record the start time
+    confidence : float (Optional)
+        The confidence level to search for the images, default is 0.9.
+
+    region : list[int] (Optional)
+        A list of four integers that represent a region on the screen.
+          The list should be in this format: [x, y, width, height]
+
+    search_rectangle : SearchRectangle (Optional)
+        A SearchRectangle object that represents a region on the screen.
+
+    frame : Frame (Optional)
+        A frame that has already been captured, to search instead of capturing a new one.
+
+    Returns
+    -------
+    dict[str, Box]
+        The location of each image keyed by its path, or None for images that were not found.
+    '''
+    # Determine the region to search for the images
+    region = _determineRegion(region, search_rectangle)
+    note(region_area=region[2] * region[3])
+
+    # Capture a single frame and match every image against it
+    frame = _frameForRegion(region, frame)
+    return {image_path : _locateInFrame(image_path, frame, confidence) for image_path in image_paths}
+
+
+#---Internal Functions---#
+# The frame, template and best match of the last search made in this context, kept for failure artifacts
+_last_search = contextvars.ContextVar('last_search', default=None)
+
+def _notFound(message : str, region : list[int], confidence : float) -> ImageNotFoundException:
+    '''
+    Build the exception for a failed search, with what the last search saw attached as its 'failure'.
+    '''
+    e = ImageNotFoundException(message)
+    last = _last_search.get()
+    if last != None:
+        frame, template, near_miss = last
+        e.failure = SearchFailure(frame, region, template, confidence, near_miss)
+    return e
+
+def _unchanged(before : Frame, after : Frame, locations : list[Box]) -> list[Box]:
+    '''
+    Return the locations whose pixels did not change between two frames.
+    '''
+    return [location for location in locations if not changedTiles(before.crop(location), after.crop(location)).any()]
+
+def _awaitChanges(before : Frame, region : list[int], locations : list[Box], since : float) -> list[Box]:
+    '''
+    Capture the region until every location has changed from the frame before, counting only
+     frames captured after 'since', and return the locations that had not changed by VERIFY_TIMEOUT.
+    '''
+    deadline = time.time() + VERIFY_TIMEOUT
+    while True:
+        frame = captureFrame(region)
+        if frame.timestamp >= since:
+            locations = _unchanged(before, frame, locations)
+        if len(locations) == 0 or time.time() >= deadline:
+            return locations
+        time.sleep(VERIFY_INTERVAL)
+
+def _frameForRegion(region : list[int], frame : Frame = None) -> Frame:
+    '''
+    Return the part of a frame covering the region, capturing a new frame if none is given.
+    '''
+    if frame == None:
+        return captureFrame(region)
+    return frame.crop(region)
+
+def _pollFrames(image_path : str, region : list[int], timeout : float, search : function, **stream_options) -> MatchStream:
+    '''
+    Capture the region until the search finds something or the timeout is reached. After the
+     first capture, only the tiles that changed since they were last searched (grown by the size
+     of the template) are searched again, and the poll interval backs off while the screen is idle.
+    '''
+    template = getTemplate(image_path)
+    poller = AdaptivePoller()
     start_time = time.time()
+    searched = None
 
-    # Find the images on the screen
     while True:
+        count('attempts')
+        frame = captureFrame(region)
+        _last_search.set((frame, template, None))
+
+        # Work out which parts of the frame could hold an instance that was not there before
+        tiles = changedTiles(searched, frame)
+        areas = changedRegions(tiles, frame, template.width, template.height)
+
+        # Compare later captures against what was searched, so a slow fade still adds up to a change
+        searched = mergeTiles(searched, frame, tiles)
+
+        # Search the changed areas, leaving the stream to drop duplicates where the areas overlap
+        matches = (match for area in areas for match in search(frame.crop(area)))
+        image_locations = MatchStream(matches, frame=frame, **stream_options)
+
+        if image_locations.first() != None or time.time() - start_time > timeout:
+            return image_locations
+
+        # Sleep to space out the searches, without sleeping past the timeout
+        remaining = timeout - (time.time() - start_time)
+        with phase('poll'):
+            time.sleep(max(min(poller.next(float(tiles.mean())), remaining), 0))
+
+def _locateWithHints(image_path : str, region : list[int], confidence : float, frame : Frame = None, widen : bool = True) -> Box:
+    '''
+    Search where the image was last found within the region first, widening out to its
+     neighbourhood and then the whole region only on a miss. The region is captured once and
+     every tier is searched in part of that capture. Returns None if it is not found.
+    '''
+    template = getTemplate(image_path)
+    store = getHintStore()
 
-        try:
-            pyautogui.locateAllOnScreen(image_path, confidence=confidence, region=(top, left, width, height))
-            return
-        except ImageNotFoundException as e:
-            pass
-        
-        # Raise an exception if the timeout is reached
-        if time.time() - start_time > timeout:
-            raise ImageNotFoundException(f"The image: '{image_path}' was not found within the timeout period.")
-        
-        # Sleep to space out the searches
-        time.sleep(0.1)
+    # Only templates loaded from a file can be remembered between searches
+    if template.path == None:
+        return _locateInFrame(template, _frameForRegion(region, frame), confidence) if widen else None
 
+    candidates = store.candidates(template.path, region)
+    if not widen:
+        candidates = [(tier, area) for tier, area in candidates if tier != 'region']
 
+    for tier, area in candidates:
+        # Skip tiers that have been clipped smaller than the template
+        if area[2] < template.width or area[3] < template.height:
+            continue
+
+        frame = _frameForRegion(region, frame)
+        image_location = _locateInFrame(template, frame.crop(area), confidence)
+        if image_location != None:
+            note(hint_tier=tier)
+            store.count(tier)
+            store.record(template.path, region, image_location)
+            return image_location
+
+    if widen:
+        store.count(None)
+    return None
+
+def _locateInFrame(image_path : str, frame : Frame, confidence : float) -> Box:
+    '''
+    Find the best instance of an image within a frame, returning None if it is not found.
+    '''
+    template = getTemplate(image_path)
+    match = findBest(frame, template, confidence)
+
+    # Keep the best location as the near miss in case the search fails
+    _last_search.set((frame, template, match))
+    if match != None:
+        note(score=float(match.score))
+    if match == None or match.score < confidence:
+        return None
+    return match.box()
+
+def _iterMatches(image_path : str, frame : Frame, confidence : float, parallel : bool = False, workers : int = None) -> Iterator[Match]:
+    '''
+    Lazily find every instance of an image within a frame.
+    '''
+    if parallel:
+        return iterAllParallel(frame, getTemplate(image_path), confidence, workers)
+    return iterAll(frame, getTemplate(image_path), confidence)
+
+
+#---Exceptions---#
+class ClickNotRegisteredException(Exception):
+    '''
+    An exception to be raised when clicks made in a batch did not change what was clicked. The
+     locations that did not change are kept in its 'locations'.
+    '''
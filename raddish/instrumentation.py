@@ -0,0 +1,392 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the timers and counters that raddish calls report into.
+-----------------'''
+
+#---Imports---#
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Callable as function
+
+#---Constants---#
+# The most durations kept for each function and phase, older ones are dropped from percentiles
+MAX_SAMPLES = 10000
+
+# The number of templates listed in the slowest templates of a summary
+TOP_TEMPLATES = 10
+
+# The environment variable that switches instrumentation on when raddish is imported
+ENVIRONMENT_FLAG = 'RADDISH_INSTRUMENT'
+
+# The noted fields whose values are collected into a histogram for each function
+HISTOGRAM_FIELDS = ('score', 'region_area')
+
+
+class Histogram:
+    '''
+    The count, total and most recent samples of a value such as a duration, enough to report percentiles.
+    '''
+    __slots__ = ('count', 'total', 'maximum', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def add(self, value : float):
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+        self.samples.append(value)
+
+    def percentile(self, percent : float) -> float:
+        '''
+        Return the given percentile of the kept samples, or 0 if there are none.
+        '''
+        if len(self.samples) == 0:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'max': self.maximum,
+        }
+
+
+class Call:
+    '''
+    The record of a single instrumented call, handed to listeners when the call finishes.
+
+    Members
+    -------
+    function : str
+        The name of the function that was called.
+
+    template : str
+        The template that was searched for, if any.
+
+    start : float
+        The time the call started at.
+
+    duration : float
+        The number of seconds the call took.
+
+    phases : dict[str, float]
+        The number of seconds spent in each phase, such as 'capture', 'template', 'match', 'poll' or 'click'.
+
+    fields : dict
+        Anything else noted during the call, such as 'attempts', 'score' and 'region_area', or the
+         number of candidate 'windows' the prefilter checked and how many of them it 'rejected'.
+
+    error : str
+        The name of the exception the call raised, if any.
+
+    result
+        What the call returned, as plain lists, numbers and strings. Boxes become [left, top, width, height].
+    '''
+    __slots__ = ('function', 'template', 'start', 'duration', 'phases', 'fields', 'error', 'result')
+
+    def __init__(self, function : str, template : str = None):
+        self.function = function
+        self.template = template
+        self.start = time.time()
+        self.duration = 0.0
+        self.phases = {}
+        self.fields = {}
+        self.error = None
+        self.result = None
+
+    def toDict(self) -> dict:
+        return {name : getattr(self, name) for name in self.__slots__}
+
+
+def enable():
+    '''
+    Switch instrumentation on.
+    '''
+    global _enabled
+    _enabled = True
+
+def disable():
+    '''
+    Switch instrumentation off. Instrumented calls then cost a single flag check.
+    '''
+    global _enabled
+    _enabled = False
+
+def isEnabled() -> bool:
+    '''
+    Check if instrumentation is switched on.
+    '''
+    return _enabled
+
+def instrument(name : str = None, template : bool = False) -> function:
+    '''
+    Decorate a function so each call to it is timed and recorded while instrumentation is on.
+
+    Parameters
+    ----------
+    name : str (Optional)
+        The name to record calls under, defaults to the function's name.
+
+    template : bool (Default = False)
+        If True, the first argument of the function is recorded as the template being searched for.
+    '''
+    def decorator(wrapped : function) -> function:
+        call_name = name if name != None else wrapped.__qualname__
+
+        @functools.wraps(wrapped)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return wrapped(*args, **kwargs)
+
+            call = Call(call_name, _templateName(args[0] if len(args) > 0 else kwargs.get('image_path')) if template else None)
+            token = _calls.set(_calls.get() + (call,))
+            start = time.perf_counter()
+            try:
+                result = wrapped(*args, **kwargs)
+                call.result = _toRecord(result)
+                return result
+            except BaseException as e:
+                call.error = type(e).__name__
+                raise
+            finally:
+                call.duration = time.perf_counter() - start
+                _calls.reset(token)
+                _finish(call)
+
+        return wrapper
+    return decorator
+
+def phase(name : str):
+    '''
+    Time a block of code as a phase of every instrumented call it runs within.
+
+    Parameters
+    ----------
+    name : str
+        The name of the phase, such as 'capture' or 'match'.
+    '''
+    if not _enabled:
+        return _NO_PHASE
+    return _Phase(name)
+
+def note(**fields):
+    '''
+    Record values against the innermost instrumented call, such as the 'score' of a match or the
+     'region_area' searched.
+    '''
+    if _enabled:
+        calls = _calls.get()
+        if len(calls) > 0:
+            calls[-1].fields.update(fields)
+
+def count(field : str, amount : int = 1):
+    '''
+    Add to a counter of the innermost instrumented call, such as its number of 'attempts'.
+    '''
+    if _enabled:
+        calls = _calls.get()
+        if len(calls) > 0:
+            calls[-1].fields[field] = calls[-1].fields.get(field, 0) + amount
+
+def addListener(listener : function):
+    '''
+    Call a function with every finished instrumented call.
+
+    Parameters
+    ----------
+    listener : function
+        Called with each 'Call' once it finishes, on the thread that made the call.
+    '''
+    _listeners.append(listener)
+
+def removeListener(listener : function):
+    '''
+    Stop calling a function added with 'addListener'.
+    '''
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+def reset():
+    '''
+    Forget every recorded call.
+    '''
+    with _lock:
+        _functions.clear()
+        _phases.clear()
+        _templates.clear()
+        _counters.clear()
+        _fields.clear()
+        _prefilter.clear()
+
+def summary() -> dict:
+    '''
+    Summarise every call recorded since the last reset.
+
+    Returns
+    -------
+    dict
+        The timings of each function and phase, the slowest templates, the counters, the noted match
+         scores and region areas of each function, and the share of candidate windows the prefilter
+         rejected for each template.
+    '''
+    with _lock:
+        functions = {name : histogram.summary() for name, histogram in _functions.items()}
+        phases = {name : histogram.summary() for name, histogram in _phases.items()}
+        templates = sorted(({'template': name, **histogram.summary()} for name, histogram in _templates.items()), \
+                           key=lambda entry: entry['total'], reverse=True)[:TOP_TEMPLATES]
+        counters = dict(_counters)
+        fields = {}
+        for (name, field), histogram in _fields.items():
+            fields.setdefault(name, {})[field] = histogram.summary()
+        prefilter = {name : {'windows': windows, 'rejected': rejected, 'rejection_rate': rejected / windows if windows else 0.0} \
+                     for name, (windows, rejected) in _prefilter.items()}
+    return {'functions': functions, 'phases': phases, 'slowest_templates': templates, 'counters': counters, 'fields': fields, \
+            'prefilter': prefilter}
+
+def report() -> str:
+    '''
+    Summarise every call recorded since the last reset as a text table.
+    '''
+    data = summary()
+    lines = [f"{'function':<28} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'errors':>7}"]
+    for name, entry in sorted(data['functions'].items(), key=lambda item: item[1]['total'], reverse=True):
+        lines.append(f"{name:<28} {entry['count']:>6} {entry['p50'] * 1000:>9.2f} {entry['p95'] * 1000:>9.2f} {entry['max'] * 1000:>9.2f} "
+                     f"{data['counters'].get(f'{name}.errors', 0):>7}")
+
+    lines += ['', f"{'phase':<28} {'calls':>6} {'total ms':>9} {'p50 ms':>9} {'p95 ms':>9}"]
+    for name, entry in sorted(data['phases'].items(), key=lambda item: item[1]['total'], reverse=True):
+        lines.append(f"{name:<28} {entry['count']:>6} {entry['total'] * 1000:>9.1f} {entry['p50'] * 1000:>9.2f} {entry['p95'] * 1000:>9.2f}")
+
+    lines += ['', f"{'slowest templates':<40} {'calls':>6} {'total ms':>9} {'p95 ms':>9}"]
+    for entry in data['slowest_templates']:
+        lines.append(f"{entry['template'][-40:]:<40} {entry['count']:>6} {entry['total'] * 1000:>9.1f} {entry['p95'] * 1000:>9.2f}")
+
+    if len(data['fields']) > 0:
+        lines += ['', f"{'field':<40} {'calls':>6} {'p50':>9} {'p95':>9} {'max':>9}"]
+        for name, entries in sorted(data['fields'].items()):
+            for field, entry in sorted(entries.items()):
+                lines.append(f"{f'{name}.{field}':<40} {entry['count']:>6} {entry['p50']:>9.3g} {entry['p95']:>9.3g} {entry['max']:>9.3g}")
+
+    if len(data['prefilter']) > 0:
+        lines += ['', f"{'prefilter':<40} {'windows':>10} {'rejected':>10} {'rate':>7}"]
+        for name, entry in sorted(data['prefilter'].items(), key=lambda item: item[1]['windows'], reverse=True)[:TOP_TEMPLATES]:
+            lines.append(f"{name[-40:]:<40} {entry['windows']:>10} {entry['rejected']:>10} {entry['rejection_rate']:>7.1%}")
+    return '\n'.join(lines)
+
+def saveSummary(path : str):
+    '''
+    Save the summary of every call recorded since the last reset as JSON.
+    '''
+    with open(path, 'w') as file:
+        json.dump(summary(), file, indent=2)
+
+
+#---Internal Functions---#
+_enabled = os.environ.get(ENVIRONMENT_FLAG, '') not in ('', '0')
+
+# The instrumented calls that are currently running, innermost last
+_calls = contextvars.ContextVar('calls', default=())
+
+_functions = {}
+_phases = {}
+_templates = {}
+_counters = {}
+_fields = {}
+_prefilter = {}
+_listeners = []
+_lock = threading.Lock()
+_NO_PHASE = nullcontext()
+
+class _Phase:
+    '''
+    Times a phase, adding its duration to every instrumented call it runs within.
+    '''
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name : str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exception):
+        duration = time.perf_counter() - self.start
+        for call in _calls.get():
+            call.phases[self.name] = call.phases.get(self.name, 0.0) + duration
+        with _lock:
+            _histogram(_phases, self.name).add(duration)
+
+def _finish(call : Call):
+    '''
+    Add a finished call to the histograms and counters, and hand it to the listeners.
+    '''
+    with _lock:
+        _histogram(_functions, call.function).add(call.duration)
+        if call.template != None:
+            _histogram(_templates, call.template).add(call.duration)
+        _counters[f'{call.function}.calls'] = _counters.get(f'{call.function}.calls', 0) + 1
+        if call.error != None:
+            _counters[f'{call.function}.errors'] = _counters.get(f'{call.function}.errors', 0) + 1
+        for field, value in call.fields.items():
+            if field == 'attempts':
+                _counters[f'{call.function}.attempts'] = _counters.get(f'{call.function}.attempts', 0) + value
+            elif field in HISTOGRAM_FIELDS and value != None:
+                _histogram(_fields, (call.function, field)).add(float(value))
+
+        # Add up the windows the prefilter checked and rejected for the template
+        if call.template != None and 'windows' in call.fields:
+            windows, rejected = _prefilter.get(call.template, (0, 0))
+            _prefilter[call.template] = (windows + call.fields['windows'], rejected + call.fields.get('rejected', 0))
+
+    for listener in list(_listeners):
+        listener(call)
+
+def _histogram(histograms : dict, name : str) -> Histogram:
+    '''
+    Return the histogram with the given name, creating it if needed.
+    '''
+    histogram = histograms.get(name)
+    if histogram == None:
+        histogram = histograms[name] = Histogram()
+    return histogram
+
+def _toRecord(value):
+    '''
+    Convert a return value into plain lists, numbers and strings, without consuming lazy results.
+    '''
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, tuple):
+        return [_toRecord(item) for item in value]
+    if isinstance(value, list):
+        return [_toRecord(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key) : _toRecord(item) for key, item in value.items()}
+    if getattr(value, 'ndim', None) == 0:
+        return value.item()
+    return type(value).__name__
+
+def _templateName(image) -> str:
+    '''
+    Return a name to record a template under.
+    '''
+    if isinstance(image, str):
+        return image
+    name = getattr(image, 'name', None)
+    return name if isinstance(name, str) else type(image).__name__
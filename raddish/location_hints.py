@@ -0,0 +1,216 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the store of where each template was last found.
+-----------------'''
+
+#---Imports---#
+import atexit
+import json
+import os
+import threading
+from pyscreeze import Box
+
+#---Constants---#
+# The tiers a hinted search widens through, from cheapest to most expensive
+TIERS = ('hint', 'neighbourhood', 'region')
+
+# The number of pixels the 'hint' tier allows an element to have shifted by
+HINT_SLACK = 2
+
+# The number of pixels around the last location searched by the 'neighbourhood' tier
+NEIGHBOURHOOD = 64
+
+
+class HintStore:
+    '''
+    Remembers where each template was last found within each searched region, so the next
+     search can check that spot before widening out to the whole region. Hints can be saved
+     to disk to carry them across runs.
+    '''
+
+    def __init__(self, path : str = None, autosave : bool = True):
+        '''
+        Initialize the 'HintStore' object.
+
+        Parameters
+        ----------
+        path : str (Optional)
+            A JSON file to load hints from, and to save them to.
+
+        autosave : bool (Default = True)
+            If True and a path is given, save the hints when the interpreter exits.
+        '''
+        self.path = path
+        self._hints = {}
+        self._lock = threading.Lock()
+
+        # Counters exposed through 'stats'
+        self.hits = {tier : 0 for tier in TIERS}
+        self.misses = 0
+
+        if path != None and os.path.exists(path):
+            self.load(path)
+        if path != None and autosave:
+            atexit.register(self.save)
+
+    def get(self, template_path : str, region : list[int]) -> Box:
+        '''
+        Return where a template was last found within a region, or None if it never was.
+        '''
+        return self._hints.get(_key(template_path, region))
+
+    def record(self, template_path : str, region : list[int], location : Box):
+        '''
+        Remember where a template was found within a region.
+        '''
+        with self._lock:
+            self._hints[_key(template_path, region)] = Box(*(int(value) for value in location))
+
+    def forget(self, template_path : str, region : list[int]):
+        '''
+        Forget where a template was found within a region.
+        '''
+        with self._lock:
+            self._hints.pop(_key(template_path, region), None)
+
+    def candidates(self, template_path : str, region : list[int]) -> list[tuple]:
+        '''
+        Return the regions to search, cheapest first, each paired with the name of its tier.
+
+        Parameters
+        ----------
+        template_path : str
+            The path of the template being searched for.
+
+        region : list[int]
+            The region the caller asked to search in the format [x, y, width, height].
+
+        Returns
+        -------
+        list[tuple[str, list[int]]]
+            The tiers and their regions, clipped to the caller's region and ending with the region itself.
+        '''
+        hint = self.get(template_path, region)
+        if hint == None:
+            return [('region', list(region))]
+
+        return [
+            ('hint', _clip(_grow(hint, HINT_SLACK), region)),
+            ('neighbourhood', _clip(_grow(hint, NEIGHBOURHOOD), region)),
+            ('region', list(region)),
+        ]
+
+    def count(self, tier : str):
+        '''
+        Count a search that was answered by the given tier, or a miss if the tier is None.
+        '''
+        with self._lock:
+            if tier == None:
+                self.misses += 1
+            else:
+                self.hits[tier] += 1
+
+    def stats(self) -> dict:
+        '''
+        Return the number of searches answered by each tier and the overall hint hit rate.
+        '''
+        with self._lock:
+            lookups = sum(self.hits.values()) + self.misses
+            hinted = self.hits['hint'] + self.hits['neighbourhood']
+            return {
+                'lookups': lookups,
+                'hits': dict(self.hits),
+                'misses': self.misses,
+                'hint_rate': hinted / lookups if lookups else 0.0,
+                'hints': len(self._hints),
+            }
+
+    def save(self, path : str = None):
+        '''
+        Save the hints to a JSON file.
+
+        Parameters
+        ----------
+        path : str (Optional)
+            The file to save to, defaults to the path the store was created with.
+        '''
+        path = path if path != None else self.path
+        if path == None:
+            return
+
+        with self._lock:
+            entries = [{'template': key[0], 'region': list(key[1]), 'location': list(location)} for key, location in self._hints.items()]
+        with open(path, 'w') as file:
+            json.dump(entries, file)
+
+    def load(self, path : str):
+        '''
+        Load hints from a JSON file written by 'save', keeping any hints already in the store.
+        '''
+        with open(path) as file:
+            entries = json.load(file)
+        for entry in entries:
+            self.record(entry['template'], entry['region'], entry['location'])
+
+    def clear(self):
+        '''
+        Forget every hint and reset the counters.
+        '''
+        with self._lock:
+            self._hints.clear()
+            self.hits = {tier : 0 for tier in TIERS}
+            self.misses = 0
+
+
+#---Default Store---#
+_default_store = HintStore()
+
+def getHintStore() -> HintStore:
+    '''
+    Return the hint store used by raddish searches.
+    '''
+    return _default_store
+
+def setHintStore(store : HintStore) -> HintStore:
+    '''
+    Set the hint store used by raddish searches, such as one that is persisted to disk.
+
+    Parameters
+    ----------
+    store : HintStore
+        The new hint store, or None to go back to an empty in-memory store.
+
+    Returns
+    -------
+    HintStore
+        The hint store that was previously in use.
+    '''
+    global _default_store
+    previous = _default_store
+    _default_store = store if store != None else HintStore()
+    return previous
+
+
+#---Internal Functions---#
+def _key(template_path : str, region : list[int]) -> tuple:
+    '''
+    Build the key a hint is stored under.
+    '''
+    return (template_path, tuple(int(value) for value in region))
+
+def _grow(box : Box, margin : int) -> list[int]:
+    '''
+    Grow a box by a margin on every side.
+    '''
+    return [box[0] - margin, box[1] - margin, box[2] + margin * 2, box[3] + margin * 2]
+
+def _clip(area : list[int], region : list[int]) -> list[int]:
+    '''
+    Clip an area to lie within a region.
+    '''
+    left = max(area[0], region[0])
+    top = max(area[1], region[1])
+    right = min(area[0] + area[2], region[0] + region[2])
+    bottom = min(area[1] + area[3], region[1] + region[3])
+    return [left, top, max(right - left, 0), max(bottom - top, 0)]
@@ -5,44 +5,73 @@
 -----------------'''
 
 #---Imports---#
-import logging
+import atexit
+import contextvars
 import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+
+#---Constants---#
+# The size in bytes a log file may grow to before it is rotated
+MAX_LOG_BYTES = 10 * 1024 * 1024
+
+# The number of rotated log files that are kept
+LOG_BACKUPS = 5
+
+# The number of records buffered in memory before they are written to the log file
+BUFFERED_RECORDS = 64
+
+# The attributes every log record has, which are not copied into the JSON output as extra fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
 
 class Log:
     '''
     A custom logger that will generate messages during runtime to the terminal, and maintain a logfile.
+     Messages are handed to a background thread over a queue, so writing to the console or a slow
+     disk never holds up the caller. The logfile is written in JSON Lines, one record per line, with
+     any extra fields such as the step name, timings and match coordinates.
+
+    Every 'Log' shares the same handlers, so creating several of them does not write each message
+     more than once. The handlers are set up by the first 'Log' that is created, and a later 'Log'
+     given settings that differ from theirs warns that they are ignored.
     '''
-    def __init__(self):
+    def __init__(self, directory : str = None, console : bool = None, max_bytes : int = None, backups : int = None):
         '''
         Initialize the 'Log' object.
-        '''
-        # Create a current date time string
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
 
+        Parameters
+        ----------
+        directory : str (Optional)
+            The directory the logfile is written to, defaults to the current directory.
+
+        console : bool (Optional)
+            If True, also write messages to the terminal, defaults to True.
+
+        max_bytes : int (Optional)
+            The size a logfile may grow to before it is rotated, defaults to 10 MiB.
+
+        backups : int (Optional)
+            The number of rotated logfiles that are kept, defaults to 5.
+        '''
         # Create a custom logger
         self.logger = logging.getLogger(__name__)
 
         # Set the level of this logger
         self.logger.setLevel(logging.DEBUG)
 
-        # Create handlers
-        c_handler = logging.StreamHandler()
-        f_handler = logging.FileHandler(f'{timestamp}_runtime.log')
-        c_handler.setLevel(logging.DEBUG)
-        f_handler.setLevel(logging.DEBUG)
-
-        # Create formatters and add it to handlers
-        c_format = logging.Formatter('[%(levelname)s] %(message)s')
-        f_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        c_handler.setFormatter(c_format)
-        f_handler.setFormatter(f_format)
+        # Start the shared handlers, only the first time a 'Log' is created
+        self.path = _startListener(self.logger, directory, console, max_bytes, backups)
 
-        # Add handlers to the logger
-        self.logger.addHandler(c_handler)
-        self.logger.addHandler(f_handler)
 
-
-    def write(self, message: str, log_type: str = 'INFO'):
+    def write(self, message: str, log_type: str = 'INFO', **fields):
         '''
         Write a general message to the console.
 
@@ -52,18 +81,182 @@ class Log:
         ----------
         message : str
             The message to write to the console.
-        
+
         log_type : str (Optional)
             The type of message to write to the console, default is LOG
 
+        **fields
+            Extra values to record with the message in the logfile, such as 'duration' or
+              'location'. The name of the current step is added automatically.
+        '''
+        level = logging.getLevelName(log_type.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+
+        self.logger.log(level, message, extra=_extra(fields))
+
+    @contextmanager
+    def step(self, name : str, **fields):
+        '''
+        Mark a block of code as a named step. Every message written inside the block is
+         tagged with the step's name, and a record of how long the step took is written
+         when it finishes.
+
+        Parameters
+        ----------
+        name : str
+            The name of the step.
+
+        **fields
+            Extra values to record with the step's timing.
+        '''
+        token = _step.set(name)
+        start = time.perf_counter()
+        status = 'passed'
+        try:
+            yield self
+        except BaseException:
+            status = 'failed'
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.write(f"Step '{name}' {status} in {duration:.3f}s", 'INFO' if status == 'passed' else 'ERROR', \
+                       duration=duration, status=status, **fields)
+            _step.reset(token)
+
+    def flush(self):
+        '''
+        Write every queued message out, waiting for the background thread to catch up.
         '''
-        if log_type.upper() == 'DEBUG':
-            self.logger.debug(message)
-        elif log_type.upper() == 'INFO':
-            self.logger.info(message)
-        elif log_type.upper() == 'WARNING':
-            self.logger.warning(message)
-        elif log_type.upper() == 'ERROR':
-            self.logger.error(message)
-        else:
-            self.logger.info(message)
\ No newline at end of file
+        _restartListener()
+
+
+#---Internal Functions---#
+# The name of the step that is currently running, if any
+_step = contextvars.ContextVar('step', default=None)
+
+_listener = None
+_queue_handler = None
+_handlers = []
+_path = None
+_settings = None
+_lock = threading.Lock()
+
+def _startListener(logger : logging.Logger, directory : str, console : bool, max_bytes : int, backups : int) -> str:
+    '''
+    Attach a single queue handler to the logger and start the thread that writes out its records.
+     Does nothing if this has already been done, returning the path of the existing logfile and
+     warning about any of the given settings that differ from the ones in use.
+    '''
+    global _listener, _queue_handler, _handlers, _path, _settings
+    given = {'directory': os.path.abspath(directory) if directory != None else None, 'console': console, \
+             'max_bytes': max_bytes, 'backups': backups}
+    with _lock:
+        if _listener != None:
+            ignored = [name for name, value in given.items() if value != None and value != _settings[name]]
+            if len(ignored) > 0:
+                warnings.warn(f"The log is already set up, so its {', '.join(ignored)} cannot be changed. Logging to '{_path}'.", \
+                              RuntimeWarning, stacklevel=3)
+            return _path
+
+        # Fill in the settings that were not given
+        defaults = {'directory': os.path.abspath('.'), 'console': True, 'max_bytes': MAX_LOG_BYTES, 'backups': LOG_BACKUPS}
+        _settings = {name : value if value != None else defaults[name] for name, value in given.items()}
+        directory, console, max_bytes, backups = _settings.values()
+
+        # Create a current date time string
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        _path = os.path.join(directory, f'{timestamp}_runtime.jsonl')
+
+        # Write JSON Lines to a rotating file, buffered in memory until enough records or an error arrive
+        f_handler = logging.handlers.RotatingFileHandler(_path, maxBytes=max_bytes, backupCount=backups, delay=True, encoding='utf-8')
+        f_handler.setFormatter(_JsonFormatter())
+        _handlers = [logging.handlers.MemoryHandler(BUFFERED_RECORDS, flushLevel=logging.ERROR, target=f_handler)]
+
+        if console:
+            c_handler = logging.StreamHandler()
+            c_handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+            _handlers.append(c_handler)
+
+        # Hand records to the handlers on a background thread
+        records = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(records)
+        logger.addHandler(_queue_handler)
+        _listener = logging.handlers.QueueListener(records, *_handlers, respect_handler_level=True)
+        _listener.start()
+        return _path
+
+def _restartListener():
+    '''
+    Wait for every queued record to be handled and written to disk, then carry on listening.
+    '''
+    with _lock:
+        if _listener == None:
+            return
+        _listener.stop()
+        for handler in _handlers:
+            handler.flush()
+            if isinstance(handler, logging.handlers.MemoryHandler):
+                handler.target.flush()
+        _listener.start()
+
+@atexit.register
+def _stopListener():
+    '''
+    Write out every queued record and close the logfile when the interpreter exits.
+    '''
+    global _listener
+    with _lock:
+        if _listener == None:
+            return
+        logging.getLogger(__name__).removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+
+        # Closing a memory handler flushes it and then lets go of its file handler
+        for handler in _handlers:
+            target = getattr(handler, 'target', None)
+            handler.close()
+            if target != None:
+                target.close()
+
+def _extra(fields : dict) -> dict:
+    '''
+    Build the extra attributes of a record from its fields and the current step.
+    '''
+    extra = {'step': _step.get()}
+    for name, value in fields.items():
+        # Avoid clashing with the attributes every record already has
+        extra[name if name not in _RECORD_ATTRIBUTES else f'{name}_'] = value
+    return extra
+
+def _toJson(value):
+    '''
+    Convert values that JSON does not support, such as NumPy numbers and arrays, into ones it does.
+     NumPy's 'tolist' handles both, while 'item' fails on arrays of more than one value.
+    '''
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class _JsonFormatter(logging.Formatter):
+    '''
+    Formats each record as one line of JSON, including any extra fields it was written with.
+    '''
+
+    def format(self, record : logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES and value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=_toJson)
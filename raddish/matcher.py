@@ -0,0 +1,554 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the normalized cross-correlation matching engine.
+-----------------'''
+
+#---Imports---#
+from collections import namedtuple
+from typing import Iterator
+import numpy as np
+from pyscreeze import Box
+from .frame_source import Frame, _summedArea, _colourBins, COLOUR_LEVELS
+from .template_cache import Template
+from .instrumentation import phase, count
+
+#---Constants---#
+# The smallest side a template may be shrunk to on a pyramid level
+MIN_PYRAMID_SIZE = 8
+
+# The most pyramid levels a search will go down
+MAX_PYRAMID_LEVELS = 3
+
+# Haystacks with fewer pixels than this are searched at full resolution only
+MIN_PYRAMID_AREA = 256 * 256
+
+# How far below the requested confidence a coarse peak may score and still be refined
+COARSE_SLACK = 0.25
+
+# Templates are not searched on pyramid levels where they score below this when off the pixel grid
+MIN_PHASE_SCORE = 0.35
+
+# How far below a template's phase score a coarse peak may score and still be refined
+PHASE_SLACK = 0.1
+
+# The number of best coarse peaks that are always refined, whatever they score
+MIN_CANDIDATES = 4
+
+# A refined score this high is taken to be the template itself, so no weaker peak is refined after it
+EXACT_SCORE = 0.995
+
+# Windows whose variance is below this (per pixel) are treated as flat
+FLAT_VARIANCE = 1e-4
+
+# The grids of blocks a template is split into to bound the score of each window, tried in turn
+PREFILTER_GRIDS = (2, 3)
+
+# How far below the threshold a window's bound may fall and still be correlated, to allow for rounding
+PREFILTER_MARGIN = 1e-3
+
+# The side length of the tiles of a frame that full resolution summed-area tables are built over,
+#  so a search never holds tables for the whole of a large frame at once
+TABLE_TILE = 512
+
+# The smallest share of a template's pixels whose coarse colours a window must also have to pass the colour prefilter
+MIN_COLOUR_OVERLAP = 0.5
+
+
+class Match(namedtuple('Match', ['left', 'top', 'width', 'height', 'score'])):
+    '''
+    A location found by the matcher along with the normalized correlation it scored.
+    '''
+    __slots__ = ()
+
+    def box(self) -> Box:
+        '''
+        Return the location as a pyscreeze Box that other pyautogui functions accept.
+        '''
+        return Box(self.left, self.top, self.width, self.height)
+
+
+def matchTemplate(gray : np.ndarray, template : Template, tables : tuple[np.ndarray] = None) -> np.ndarray:
+    '''
+    Compute the normalized cross-correlation of a template at every position in an image.
+     This is the same score as OpenCV's TM_CCOEFF_NORMED.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        The float32 grayscale image to search.
+
+    template : Template
+        The template to search for.
+
+    tables : tuple[np.ndarray] (Optional)
+        The summed-area tables of the image and of its squares, as from 'Frame.integral'.
+         They are built from the image if not given.
+
+    Returns
+    -------
+    np.ndarray
+        An array of shape (height - template.height + 1, width - template.width + 1) holding
+         scores between -1 and 1, where each entry is the score of the window with its top
+         left corner at that position.
+    '''
+    height, width = template.height, template.width
+
+    # Return an empty score map if the template does not fit in the image
+    if gray.shape[0] < height or gray.shape[1] < width:
+        return np.empty((0, 0), dtype=np.float32)
+
+    # Sum and sum of squares of every window, used for each window's variance
+    sums, squares = _windowSums(gray, height, width, tables)
+    count = height * width
+    variance = np.maximum(squares - sums * sums / count, 0)
+    flat = variance < FLAT_VARIANCE * count
+
+    # A flat template has no correlation, so compare brightness against flat windows instead
+    if template.norm < np.sqrt(FLAT_VARIANCE * count):
+        scores = 1 - np.abs(sums / count - template.mean) / 255
+        return np.where(flat, scores, 0).astype(np.float32)
+
+    # The window mean drops out of the numerator because the template is zero-mean
+    numerator = _correlate(gray, template.centered)
+    denominator = np.sqrt(variance) * template.norm
+    scores = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=~flat)
+    return np.clip(scores, -1, 1).astype(np.float32)
+
+
+def findBest(frame : Frame, template : Template, confidence : float = 0.9, pyramid : bool = True, prefilter : bool = True, \
+             colour : bool = False) -> Match:
+    '''
+    Find the best scoring location of a template in a frame.
+
+    Parameters
+    ----------
+    frame : Frame
+        The frame to search.
+
+    template : Template
+        The template to search for.
+
+    confidence : float (Default = 0.9)
+        The confidence the caller is looking for, used to pick which coarse peaks to refine.
+
+    pyramid : bool (Default = True)
+        If True, search a downsampled copy of the frame first and only refine the
+         candidate peaks at full resolution.
+
+    prefilter : bool (Default = True)
+        If True, rule out windows that cannot reach the confidence from their summed-area tables
+         before correlating them.
+
+    colour : bool (Default = False)
+        If True, also rule out windows that share too few coarse colours with the template,
+         since the correlation itself only compares brightness.
+
+    Returns
+    -------
+    Match
+        The best location in screen coordinates, which may score below the confidence. The prefilter
+         only skips locations that could not score higher than the one returned, or that fail the
+         colour check. None is returned only if the template is larger than the frame.
+    '''
+    matches = _iterSearch(frame, template, confidence, pyramid, limit=1, keep_best=True, prefilter=prefilter, colour=colour)
+    return max(matches, key=lambda match: match.score, default=None)
+
+
+def findAll(frame : Frame, template : Template, confidence : float = 0.9, pyramid : bool = True, limit : int = 1000, \
+            prefilter : bool = True, colour : bool = False) -> list[Match]:
+    '''
+    Find every location of a template in a frame that reaches the confidence.
+
+    Parameters
+    ----------
+    frame : Frame
+        The frame to search.
+
+    template : Template
+        The template to search for.
+
+    confidence : float (Default = 0.9)
+        The lowest score a location may have to be returned.
+
+    pyramid : bool (Default = True)
+        If True, search a downsampled copy of the frame first and only refine the
+         candidate peaks at full resolution.
+
+    limit : int (Default = 1000)
+        The most locations to return.
+
+    prefilter : bool (Default = True)
+        If True, rule out windows that cannot reach the confidence from their summed-area tables
+         before correlating them.
+
+    colour : bool (Default = False)
+        If True, also rule out windows that share too few coarse colours with the template,
+         since the correlation itself only compares brightness.
+
+    Returns
+    -------
+    list[Match]
+        The local score peaks in screen coordinates, best first.
+    '''
+    matches = sorted(_iterSearch(frame, template, confidence, pyramid, limit, keep_best=False, prefilter=prefilter, colour=colour), \
+                     key=lambda match: match.score, reverse=True)
+    return matches[:limit]
+
+
+def iterAll(frame : Frame, template : Template, confidence : float = 0.9, pyramid : bool = True, limit : int = 1000, \
+            prefilter : bool = True, colour : bool = False) -> Iterator[Match]:
+    '''
+    Lazily find every location of a template in a frame that reaches the confidence. Each
+     candidate is only refined when the next location is asked for, so callers that stop
+     early skip the rest of the search.
+
+    Parameters
+    ----------
+    frame : Frame
+        The frame to search.
+
+    template : Template
+        The template to search for.
+
+    confidence : float (Default = 0.9)
+        The lowest score a location may have to be returned.
+
+    pyramid : bool (Default = True)
+        If True, search a downsampled copy of the frame first and only refine the
+         candidate peaks at full resolution.
+
+    limit : int (Default = 1000)
+        The most candidates to consider.
+
+    prefilter : bool (Default = True)
+        If True, rule out windows that cannot reach the confidence from their summed-area tables
+         before correlating them.
+
+    colour : bool (Default = False)
+        If True, also rule out windows that share too few coarse colours with the template,
+         since the correlation itself only compares brightness.
+
+    Yields
+    ------
+    Match
+        The local score peaks in screen coordinates, roughly best first.
+    '''
+    return _iterSearch(frame, template, confidence, pyramid, limit, keep_best=False, prefilter=prefilter, colour=colour)
+
+
+#---Internal Functions---#
+def _iterSearch(frame : Frame, template : Template, confidence : float, pyramid : bool, limit : int, keep_best : bool, \
+                prefilter : bool = True, colour : bool = False) -> Iterator[Match]:
+    '''
+    Run a coarse-to-fine search, yielding each refined match in the order of its coarse score.
+     If 'keep_best' is set, the best candidates are yielded even when they score below the confidence.
+    '''
+    level = _pyramidLevel(frame, template) if pyramid else 0
+
+    # Search the whole frame directly if it is too small to benefit from the pyramid
+    if level == 0:
+        yield from _iterFull(frame, template, -np.inf if keep_best else confidence, limit, colour)
+        return
+
+    # Find candidate peaks on the coarse level. When looking for the best location every peak above
+    #  the threshold is kept, since a screen of look-alike widgets can have more peaks scoring close
+    #  to the real one than any fixed number
+    threshold = max(min(confidence - COARSE_SLACK, template.phaseScore(level) - PHASE_SLACK), 0)
+    with phase('match'):
+        coarse = matchTemplate(frame.pyramid(level), template.pyramid(level), frame.integral(level))
+    candidates = _peaks(coarse, threshold, None if keep_best else max(limit * 4, MIN_CANDIDATES))
+
+    # Always refine the strongest peaks so the best location is never missed
+    if keep_best and len(candidates) < MIN_CANDIDATES:
+        candidates = _peaks(coarse, -np.inf, MIN_CANDIDATES)
+
+    scale = 2 ** level
+    radius = scale + 1
+    window_area = (template.height + 2 * radius) * (template.width + 2 * radius)
+    flat = template.norm < np.sqrt(FLAT_VARIANCE * template.height * template.width)
+    bounded = prefilter and not flat
+    gray = frame.gray()
+    found = set()
+
+    # Refine the strongest few peaks, then the rest unless the best of them is already an exact match.
+    #  Once refining the rest would cover more than the frame, which is about what building summed-area
+    #  tables around them costs, only those whose windows could still beat the best are refined. Flat
+    #  templates match flat windows on brightness alone, so they cannot be bounded
+    if keep_best:
+        head, rest = candidates[:MIN_CANDIDATES], candidates[MIN_CANDIDATES:]
+        if bounded and colour:
+            with phase('prefilter'):
+                head = _plausible(frame, template, head, scale, radius, -np.inf, colour) or head[:1]
+
+        best = -np.inf
+        for match in _refine(frame, gray, template, head, scale, radius, confidence, keep_best, colour, found):
+            best = max(best, match.score)
+            yield match
+
+        if len(rest) == 0 or best >= EXACT_SCORE:
+            return
+        if bounded and (colour or len(rest) * window_area > frame.width * frame.height):
+            with phase('prefilter'):
+                rest = _plausible(frame, template, rest, scale, radius, max(best, confidence), colour)
+        elif len(rest) * window_area > frame.width * frame.height:
+            # Correlating every window once is cheaper than refining this many unfiltered candidates
+            yield from _iterFull(frame, template, -np.inf, 1, colour)
+            return
+        yield from _refine(frame, gray, template, rest, scale, radius, confidence, keep_best, colour, found)
+        return
+
+    # Drop the candidates with nothing nearby that could reach the confidence before correlating
+    #  them, once refining them all would cover more than the frame
+    if bounded and len(candidates) > 0 and (colour or len(candidates) * window_area > frame.width * frame.height):
+        with phase('prefilter'):
+            candidates = _plausible(frame, template, candidates, scale, radius, confidence, colour)
+
+    # Refine each candidate in a small window at full resolution
+    yield from _refine(frame, gray, template, candidates, scale, radius, confidence, keep_best, colour, found)
+
+def _refine(frame : Frame, gray : np.ndarray, template : Template, candidates : list[tuple[int]], scale : int, radius : int, \
+            confidence : float, keep_best : bool, colour : bool, found : set) -> Iterator[Match]:
+    '''
+    Refine coarse candidates in a small window at full resolution, skipping the locations in 'found'
+     that an earlier candidate already refined to.
+    '''
+    for y, x in candidates:
+        x0 = max(x * scale - radius, 0)
+        y0 = max(y * scale - radius, 0)
+        x1 = min(x * scale + radius + template.width, gray.shape[1])
+        y1 = min(y * scale + radius + template.height, gray.shape[0])
+
+        with phase('match'):
+            scores = matchTemplate(gray[y0:y1, x0:x1], template)
+        if scores.size == 0:
+            continue
+
+        # Rule out the positions whose colours do not pass, if asked to
+        if colour:
+            scores = _colourFilter(scores, frame.pixels[y0:y1, x0:x1], template)
+        dy, dx = np.unravel_index(np.argmax(scores), scores.shape)
+
+        # Skip locations that an earlier candidate already refined to
+        if (x0 + dx, y0 + dy) in found:
+            continue
+        found.add((x0 + dx, y0 + dy))
+
+        if keep_best or scores[dy, dx] >= confidence:
+            yield _toMatch(frame, template, x0 + dx, y0 + dy, scores[dy, dx])
+
+def _iterFull(frame : Frame, template : Template, threshold : float, limit : int, colour : bool = False) -> Iterator[Match]:
+    '''
+    Search every position of the frame at full resolution, yielding the peaks that reach the threshold.
+     The summed-area tables are only held while the window sums are read from them, rather than
+     being kept on the frame, since at full resolution they are several times the size of the frame.
+    '''
+    with phase('match'):
+        scores = matchTemplate(frame.gray(), template)
+    if scores.size == 0:
+        return
+
+    # Rule out the peaks whose colours do not pass, if asked to
+    if colour:
+        scores = _colourFilter(scores, frame.pixels, template)
+    for y, x in _peaks(scores, threshold, limit):
+        yield _toMatch(frame, template, x, y, scores[y, x])
+
+def _pyramidLevel(frame : Frame, template : Template) -> int:
+    '''
+    Choose how many times the frame and template can be halved before searching.
+    '''
+    if frame.width * frame.height < MIN_PYRAMID_AREA:
+        return 0
+
+    level = 0
+    smallest = min(template.width, template.height)
+    while level < MAX_PYRAMID_LEVELS and smallest // 2 ** (level + 1) >= MIN_PYRAMID_SIZE:
+        level += 1
+
+    # Go back up while the template could be missed because of where the pixel grid falls on it
+    while level > 0 and template.phaseScore(level) < MIN_PHASE_SCORE:
+        level -= 1
+    return level
+
+def _toMatch(frame : Frame, template : Template, x : int, y : int, score : float) -> Match:
+    '''
+    Build a match in screen coordinates from a position within the frame.
+    '''
+    return Match(int(x) + frame.left, int(y) + frame.top, template.width, template.height, float(score))
+
+def _fastLength(length : int) -> int:
+    '''
+    Return the smallest length at least as long that only has the factors 2, 3 and 5,
+     which the FFT handles quickly.
+    '''
+    while True:
+        remainder = length
+        for factor in (2, 3, 5):
+            while remainder % factor == 0:
+                remainder //= factor
+        if remainder == 1:
+            return length
+        length += 1
+
+def _correlate(gray : np.ndarray, kernel : np.ndarray) -> np.ndarray:
+    '''
+    Cross-correlate an image with a kernel through the FFT, keeping only the
+     positions where the kernel lies entirely inside the image.
+    '''
+    height, width = gray.shape
+    shape = (_fastLength(height), _fastLength(width))
+
+    spectrum = np.fft.rfft2(gray, s=shape) * np.conj(np.fft.rfft2(kernel, s=shape))
+    correlation = np.fft.irfft2(spectrum, s=shape)
+    return correlation[:height - kernel.shape[0] + 1, :width - kernel.shape[1] + 1]
+
+def _windowSums(gray : np.ndarray, height : int, width : int, tables : tuple[np.ndarray] = None) -> tuple[np.ndarray]:
+    '''
+    Return the sum and the sum of squares of every window of the given size, from the summed-area
+     tables if given. Otherwise the tables are built here, and released before the caller goes on.
+    '''
+    if tables == None:
+        values = gray.astype(np.float64)
+        tables = (_summedArea(values), _summedArea(values * values))
+
+    shape = (gray.shape[0] - height + 1, gray.shape[1] - width + 1)
+    return _boxSum(tables[0], 0, 0, height, width, shape), _boxSum(tables[1], 0, 0, height, width, shape)
+
+def _colourTable(pixels : np.ndarray) -> np.ndarray:
+    '''
+    Build a summed-area table of how many pixels of an RGB array fall into each coarse colour bin,
+     of shape (height + 1, width + 1, COLOUR_LEVELS ** 3).
+    '''
+    bins = _colourBins(pixels)
+    counts = np.zeros(bins.shape + (COLOUR_LEVELS ** 3,), dtype=np.int32)
+    np.put_along_axis(counts, bins[:, :, None], 1, axis=2)
+    return _summedArea(counts)
+
+def _boxSum(table : np.ndarray, top : int, left : int, height : int, width : int, shape : tuple[int] = None, \
+            y : np.ndarray = None, x : np.ndarray = None) -> np.ndarray:
+    '''
+    Sum a box of the given size and offset within each window from four entries of a summed-area
+     table. The windows are either every position of a score map of the given shape, or the
+     positions (y, x).
+    '''
+    if y is None:
+        rows, columns = shape
+        bottom, right = top + height, left + width
+        return table[bottom:bottom + rows, right:right + columns] - table[top:top + rows, right:right + columns] - \
+            table[bottom:bottom + rows, left:left + columns] + table[top:top + rows, left:left + columns]
+
+    top, left = y + top, x + left
+    bottom, right = top + height, left + width
+    return table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
+
+def _correlationBound(tables : tuple[np.ndarray], template : Template, grid : int, y : np.ndarray, x : np.ndarray) -> np.ndarray:
+    '''
+    Return an upper bound on the correlation numerator of the windows at the positions (y, x).
+     Within each block of the template's grid, the part of the correlation that varies is at most
+     the block's spread times how much the window varies over the same block, by the Cauchy-Schwarz
+     inequality, and the rest only depends on the block's mean and the window's sum over the block.
+    '''
+    bound = 0
+    for top, left, height, width, spread, mean in template.blocks(grid):
+        sums = _boxSum(tables[0], top, left, height, width, y=y, x=x)
+        squares = _boxSum(tables[1], top, left, height, width, y=y, x=x)
+        bound = bound + spread * np.sqrt(np.maximum(squares - sums * sums / (height * width), 0)) + mean * sums
+    return bound
+
+def _colourOverlap(colour_table : np.ndarray, template : Template, y : np.ndarray, x : np.ndarray) -> np.ndarray:
+    '''
+    Return how many pixels of each window could be paired with a template pixel of the same coarse colour.
+    '''
+    counts = _boxSum(colour_table, 0, 0, template.height, template.width, y=y, x=x)
+    return np.minimum(counts, template.colourHistogram()).sum(axis=-1)
+
+def _colourFilter(scores : np.ndarray, pixels : np.ndarray, template : Template) -> np.ndarray:
+    '''
+    Score -1 for the positions of the score map of an RGB array where the window shares too few
+     coarse colours with the template. Only positions that score above 0 are checked, since the
+     others cannot match anyway. The colour tables are built one tile of the map at a time.
+    '''
+    scores = scores.copy()
+    for top in range(0, scores.shape[0], TABLE_TILE):
+        for left in range(0, scores.shape[1], TABLE_TILE):
+            tile = scores[top:top + TABLE_TILE, left:left + TABLE_TILE]
+            y, x = np.nonzero(tile > 0)
+            if len(y) == 0:
+                continue
+
+            colour_table = _colourTable(pixels[top:top + tile.shape[0] + template.height - 1, \
+                                               left:left + tile.shape[1] + template.width - 1])
+            failed = _colourOverlap(colour_table, template, y, x) < MIN_COLOUR_OVERLAP * template.height * template.width
+            tile[y[failed], x[failed]] = -1
+    return scores
+
+def _prefilter(tables : tuple[np.ndarray], template : Template, threshold : float, y : np.ndarray, x : np.ndarray, \
+               colour_table : np.ndarray = None) -> np.ndarray:
+    '''
+    Return which of the windows at the positions (y, x) could reach the threshold. Flat windows
+     always score 0, and every other window is ruled out only if its bound on one of the grids
+     falls below the threshold, so no window that could match is lost.
+    '''
+    area = template.height * template.width
+    sums = _boxSum(tables[0], 0, 0, template.height, template.width, y=y, x=x)
+    squares = _boxSum(tables[1], 0, 0, template.height, template.width, y=y, x=x)
+    deviation = np.sqrt(np.maximum(squares - sums * sums / area, 0))
+    limit = (threshold - PREFILTER_MARGIN) * template.norm
+
+    # Bound the windows that are still left on each grid in turn
+    kept = deviation >= np.sqrt(FLAT_VARIANCE * area)
+    for grid in PREFILTER_GRIDS:
+        index = np.flatnonzero(kept)
+        kept.flat[index] = _correlationBound(tables, template, grid, y.flat[index], x.flat[index]) >= limit * deviation.flat[index]
+
+    if colour_table is not None:
+        index = np.flatnonzero(kept)
+        kept.flat[index] = _colourOverlap(colour_table, template, y.flat[index], x.flat[index]) >= MIN_COLOUR_OVERLAP * area
+
+    # Record how many windows were ruled out, for the rejection rate of each template
+    count('windows', kept.size)
+    count('rejected', kept.size - int(np.count_nonzero(kept)))
+    return kept
+
+def _plausible(frame : Frame, template : Template, candidates : list[tuple[int]], scale : int, radius : int, confidence : float, \
+               colour : bool = False) -> list[tuple[int]]:
+    '''
+    Return the coarse candidates that have a window within their refinement radius at full
+     resolution that could reach the confidence. The summed-area tables are built over just the
+     windows of the candidates in each tile of the frame, rather than over the whole frame.
+    '''
+    peaks = np.array(candidates)
+    offsets = np.arange(-radius, radius + 1)
+    y = np.clip(peaks[:, 0, None, None] * scale + offsets[:, None], 0, frame.height - template.height)
+    x = np.clip(peaks[:, 1, None, None] * scale + offsets, 0, frame.width - template.width)
+    y, x = np.broadcast_arrays(y, x)
+
+    plausible = np.zeros(len(candidates), dtype=bool)
+    _, tiles = np.unique(peaks * scale // TABLE_TILE, axis=0, return_inverse=True)
+    for tile in range(tiles.max() + 1):
+        members = np.flatnonzero(tiles.ravel() == tile)
+        top, left = int(y[members].min()), int(x[members].min())
+        bottom, right = int(y[members].max()) + template.height, int(x[members].max()) + template.width
+
+        values = frame.gray()[top:bottom, left:right].astype(np.float64)
+        tables = (_summedArea(values), _summedArea(values * values))
+        colour_table = _colourTable(frame.pixels[top:bottom, left:right]) if colour else None
+        kept = _prefilter(tables, template, confidence, y=y[members] - top, x=x[members] - left, colour_table=colour_table)
+        plausible[members] = kept.any(axis=(1, 2))
+    return [candidate for candidate, keep in zip(candidates, plausible) if keep]
+
+def _peaks(scores : np.ndarray, threshold : float, limit : int) -> list[tuple[int]]:
+    '''
+    Return the (y, x) positions of the local maxima that reach the threshold, best first.
+    '''
+    # Compare each score to its eight neighbours
+    padded = np.pad(scores, 1, mode='constant', constant_values=-np.inf)
+    neighbourhood = padded[:-2, :-2]
+    for dy in range(3):
+        for dx in range(3):
+            neighbourhood = np.maximum(neighbourhood, padded[dy:dy + scores.shape[0], dx:dx + scores.shape[1]])
+
+    ys, xs = np.nonzero((scores >= neighbourhood) & (scores >= threshold))
+    order = np.argsort(-scores[ys, xs], kind='stable')[:limit]
+    return list(zip(ys[order].tolist(), xs[order].tolist()))
@@ -0,0 +1,429 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the pool of Tesseract workers that text is read with.
+-----------------'''
+
+#---Imports---#
+import atexit
+import ctypes
+import ctypes.util
+import os
+import queue
+import subprocess
+import threading
+from collections import namedtuple
+import numpy as np
+import pytesseract
+from PIL import Image
+from pyscreeze import Box
+from .instrumentation import phase
+
+#---Constants---#
+# The page segmentation mode Tesseract uses by default, fully automatic
+DEFAULT_PSM = 3
+
+# The resolution reported to Tesseract, the same one its command line assumes for screenshots
+SOURCE_PPI = 70
+
+# The names the Tesseract C library is looked up under
+_LIBRARY_NAMES = ('tesseract', 'libtesseract-5', 'libtesseract-4')
+
+# The iterator level of a single word in the C API
+_RIL_WORD = 3
+
+# Put into the idle queues of a closed pool, to wake the threads still waiting on them
+_CLOSED = object()
+
+
+class Word(namedtuple('Word', ['text', 'left', 'top', 'width', 'height', 'confidence'])):
+    '''
+    A single word read by Tesseract, along with where it was found in the image and how
+     confident Tesseract is in it from 0 to 100.
+    '''
+    __slots__ = ()
+
+    def box(self) -> Box:
+        '''
+        Return the location of the word as a pyscreeze Box.
+        '''
+        return Box(self.left, self.top, self.width, self.height)
+
+
+class OCREngine:
+    '''
+    A pool of warm Tesseract workers. Starting Tesseract and loading its language data takes
+     far longer than reading a small label, so workers are kept alive between calls and images
+     are handed to them in memory. Each worker is used by one thread at a time.
+    '''
+
+    def __init__(self, workers : int = None):
+        '''
+        Initialize the 'OCREngine' object. Workers are started the first time they are needed.
+
+        Parameters
+        ----------
+        workers : int (Optional)
+            The most workers to keep for each language, defaults to the number of CPUs.
+        '''
+        self.workers = workers if workers != None else os.cpu_count() or 1
+        self._idle = {}
+        self._started = {}
+        self._all = []
+        self._lock = threading.Lock()
+
+    def read(self, image, language : str = 'eng', psm : int = DEFAULT_PSM) -> str:
+        '''
+        Read the text in an image.
+
+        Parameters
+        ----------
+        image : PIL.Image or np.ndarray
+            The image to read, converted to grayscale if needed.
+
+        language : str (Default = 'eng')
+            The language that the Tesseract engine should use to read the text.
+
+        psm : int (Default = 3)
+            The Tesseract page segmentation mode.
+
+        Returns
+        -------
+        str
+            The text that was read.
+        '''
+        gray = _toGrayBytes(image)
+        worker = self._acquire(language)
+        try:
+            with phase('ocr'):
+                return worker.read(gray, psm)
+        finally:
+            self._release(language, worker)
+
+    def readWords(self, image, language : str = 'eng', psm : int = DEFAULT_PSM) -> list[Word]:
+        '''
+        Read every word in an image along with its location.
+
+        Parameters
+        ----------
+        image : PIL.Image or np.ndarray
+            The image to read, converted to grayscale if needed.
+
+        language : str (Default = 'eng')
+            The language that the Tesseract engine should use to read the text.
+
+        psm : int (Default = 3)
+            The Tesseract page segmentation mode.
+
+        Returns
+        -------
+        list[Word]
+            The words in reading order, located in the image's pixel coordinates.
+        '''
+        gray = _toGrayBytes(image)
+        worker = self._acquire(language)
+        try:
+            with phase('ocr'):
+                return worker.readWords(gray, psm)
+        finally:
+            self._release(language, worker)
+
+    def close(self):
+        '''
+        Stop every worker in the pool. Threads still waiting for a worker raise a RuntimeError.
+        '''
+        with self._lock:
+            workers, self._all = self._all, []
+            idle, self._idle = self._idle, {}
+            self._started.clear()
+        for waiting in idle.values():
+            waiting.put(_CLOSED)
+        for worker in workers:
+            worker.close()
+
+
+    #---Internal Methods---#
+    def _acquire(self, language : str) -> '_Worker':
+        '''
+        Take an idle worker for a language, starting a new one if the pool has room
+         or waiting for one to be released otherwise.
+        '''
+        with self._lock:
+            idle = self._idle.setdefault(language, queue.LifoQueue())
+            try:
+                return idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            start = self._started.get(language, 0) < self.workers
+            if start:
+                self._started[language] = self._started.get(language, 0) + 1
+
+        if not start:
+            worker = idle.get()
+            if worker is _CLOSED:
+                # Pass the wake up on to the next thread waiting on the same queue
+                idle.put(_CLOSED)
+                raise RuntimeError('The OCR engine was closed while waiting for a worker.')
+            return worker
+
+        try:
+            worker = _startWorker(language)
+        except BaseException:
+            with self._lock:
+                self._started[language] -= 1
+            raise
+
+        with self._lock:
+            self._all.append(worker)
+        return worker
+
+    def _release(self, language : str, worker : '_Worker'):
+        '''
+        Return a worker to the pool once a read is finished with it.
+        '''
+        with self._lock:
+            if worker in self._all:
+                self._idle[language].put(worker)
+                return
+        worker.close()
+
+
+#---Default Engine---#
+_default_engine = OCREngine()
+atexit.register(lambda: _default_engine.close())
+
+def getOCREngine() -> OCREngine:
+    '''
+    Return the OCR engine used by raddish to read text.
+    '''
+    return _default_engine
+
+def setOCREngine(engine : OCREngine) -> OCREngine:
+    '''
+    Set the OCR engine used by raddish to read text, such as one with a different number of workers.
+
+    Parameters
+    ----------
+    engine : OCREngine
+        The new engine, or None to go back to a default engine.
+
+    Returns
+    -------
+    OCREngine
+        The engine that was previously in use. It is not closed.
+    '''
+    global _default_engine
+    previous = _default_engine
+    _default_engine = engine if engine != None else OCREngine()
+    return previous
+
+
+#---Workers---#
+class _Worker:
+    '''
+    A Tesseract instance set up for one language.
+    '''
+
+    def read(self, gray : np.ndarray, psm : int) -> str:
+        raise NotImplementedError
+
+    def readWords(self, gray : np.ndarray, psm : int) -> list[Word]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class _LibraryWorker(_Worker):
+    '''
+    A worker that keeps an initialized Tesseract API handle from the C library, so the language
+     data is only loaded once and each read is a function call rather than a new process.
+    '''
+
+    def __init__(self, library : ctypes.CDLL, language : str):
+        self.library = library
+        self.handle = library.TessBaseAPICreate()
+        if library.TessBaseAPIInit3(self.handle, None, language.encode()) != 0:
+            library.TessBaseAPIDelete(self.handle)
+            raise pytesseract.TesseractError(1, f"Tesseract could not load the language '{language}'.")
+
+    def read(self, gray : np.ndarray, psm : int) -> str:
+        self._recognize(gray, psm)
+        try:
+            return _takeText(self.library, self.library.TessBaseAPIGetUTF8Text(self.handle))
+        finally:
+            self.library.TessBaseAPIClear(self.handle)
+
+    def readWords(self, gray : np.ndarray, psm : int) -> list[Word]:
+        self._recognize(gray, psm)
+        words = []
+        iterator = self.library.TessBaseAPIGetIterator(self.handle)
+        try:
+            # An empty page has no iterator at all
+            if not iterator:
+                return words
+
+            page = self.library.TessResultIteratorGetPageIterator(iterator)
+            left, top, right, bottom = (ctypes.c_int() for _ in range(4))
+            while True:
+                text = _takeText(self.library, self.library.TessResultIteratorGetUTF8Text(iterator, _RIL_WORD))
+                if text.strip() != '' and self.library.TessPageIteratorBoundingBox(page, _RIL_WORD, ctypes.byref(left), ctypes.byref(top), \
+                                                                                   ctypes.byref(right), ctypes.byref(bottom)):
+                    confidence = self.library.TessResultIteratorConfidence(iterator, _RIL_WORD)
+                    words.append(Word(text, left.value, top.value, right.value - left.value, bottom.value - top.value, confidence))
+                if not self.library.TessResultIteratorNext(iterator, _RIL_WORD):
+                    return words
+        finally:
+            if iterator:
+                self.library.TessResultIteratorDelete(iterator)
+            self.library.TessBaseAPIClear(self.handle)
+
+    def close(self):
+        if self.handle:
+            self.library.TessBaseAPIEnd(self.handle)
+            self.library.TessBaseAPIDelete(self.handle)
+            self.handle = None
+
+    def _recognize(self, gray : np.ndarray, psm : int):
+        '''
+        Hand the image to Tesseract straight from memory and recognize it.
+        '''
+        self.library.TessBaseAPISetPageSegMode(self.handle, psm)
+        self.library.TessBaseAPISetImage(self.handle, gray.ctypes.data, gray.shape[1], gray.shape[0], 1, gray.strides[0])
+        self.library.TessBaseAPISetSourceResolution(self.handle, SOURCE_PPI)
+        if self.library.TessBaseAPIRecognize(self.handle, None) != 0:
+            self.library.TessBaseAPIClear(self.handle)
+            raise pytesseract.TesseractError(1, 'Tesseract failed to recognize the image.')
+
+
+class _CommandWorker(_Worker):
+    '''
+    A worker that runs the Tesseract command line for each read, used when the C library
+     cannot be loaded. Images are piped through stdin and stdout, so no temporary files are
+     written, but each read still pays for starting the process.
+    '''
+
+    def __init__(self, language : str):
+        self.language = language
+
+    def read(self, gray : np.ndarray, psm : int) -> str:
+        return self._run(gray, psm).decode('utf-8')
+
+    def readWords(self, gray : np.ndarray, psm : int) -> list[Word]:
+        words = []
+        rows = self._run(gray, psm, 'tsv').decode('utf-8').splitlines()
+        for row in rows[1:]:
+            # Columns: level, page, block, paragraph, line, word, left, top, width, height, conf, text
+            columns = row.split('\t')
+            if len(columns) == 12 and columns[0] == '5' and columns[11].strip() != '':
+                words.append(Word(columns[11], int(columns[6]), int(columns[7]), int(columns[8]), int(columns[9]), float(columns[10])))
+        return words
+
+    def _run(self, gray : np.ndarray, psm : int, *configs : str) -> bytes:
+        '''
+        Pipe an image through the Tesseract command line and return what it prints.
+        '''
+        # PGM needs no compression, so it is the cheapest format for Tesseract to read from stdin
+        header = f'P5\n{gray.shape[1]} {gray.shape[0]}\n255\n'.encode()
+        command = [pytesseract.pytesseract.tesseract_cmd, 'stdin', 'stdout', '-l', self.language, '--psm', str(psm), *configs]
+        result = subprocess.run(command, input=header + gray.tobytes(), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            raise pytesseract.TesseractError(result.returncode, result.stderr.decode('utf-8', 'replace').strip())
+        return result.stdout
+
+
+#---Internal Functions---#
+_library = None
+_library_loaded = False
+_library_lock = threading.Lock()
+
+def _startWorker(language : str) -> _Worker:
+    '''
+    Start a worker for a language, preferring the C library over the command line.
+    '''
+    library = _loadLibrary()
+    if library != None:
+        return _LibraryWorker(library, language)
+    return _CommandWorker(language)
+
+def _loadLibrary() -> ctypes.CDLL:
+    '''
+    Load the Tesseract C library and declare the functions used from it, or return None if it is not installed.
+    '''
+    global _library, _library_loaded
+    if _library_loaded:
+        return _library
+
+    # Only mark the library as loaded once it is, so a thread that races the first one waits for it
+    with _library_lock:
+        if not _library_loaded:
+            _library = _findLibrary()
+            _library_loaded = True
+    return _library
+
+def _findLibrary() -> ctypes.CDLL:
+    '''
+    Find and load the Tesseract C library, or return None if it is not installed.
+    '''
+    for name in _LIBRARY_NAMES:
+        path = ctypes.util.find_library(name)
+        if path == None:
+            continue
+        try:
+            library = ctypes.CDLL(path)
+        except OSError:
+            continue
+
+        pointer, integer = ctypes.c_void_p, ctypes.c_int
+        signatures = {
+            'TessBaseAPICreate': ([], pointer),
+            'TessBaseAPIInit3': ([pointer, ctypes.c_char_p, ctypes.c_char_p], integer),
+            'TessBaseAPISetPageSegMode': ([pointer, integer], None),
+            'TessBaseAPISetImage': ([pointer, pointer, integer, integer, integer, integer], None),
+            'TessBaseAPISetSourceResolution': ([pointer, integer], None),
+            'TessBaseAPIRecognize': ([pointer, pointer], integer),
+            'TessBaseAPIGetUTF8Text': ([pointer], pointer),
+            'TessBaseAPIGetIterator': ([pointer], pointer),
+            'TessBaseAPIClear': ([pointer], None),
+            'TessBaseAPIEnd': ([pointer], None),
+            'TessBaseAPIDelete': ([pointer], None),
+            'TessResultIteratorGetPageIterator': ([pointer], pointer),
+            'TessResultIteratorGetUTF8Text': ([pointer, integer], pointer),
+            'TessResultIteratorConfidence': ([pointer, integer], ctypes.c_float),
+            'TessResultIteratorNext': ([pointer, integer], integer),
+            'TessResultIteratorDelete': ([pointer], None),
+            'TessPageIteratorBoundingBox': ([pointer, integer] + [ctypes.POINTER(integer)] * 4, integer),
+            'TessDeleteText': ([pointer], None),
+        }
+        try:
+            for function_name, (arguments, result) in signatures.items():
+                function = getattr(library, function_name)
+                function.argtypes = arguments
+                function.restype = result
+        except AttributeError:
+            continue
+        return library
+
+    return None
+
+def _takeText(library : ctypes.CDLL, pointer : int) -> str:
+    '''
+    Copy a string returned by the C library and free the original.
+    '''
+    if not pointer:
+        return ''
+    try:
+        return ctypes.string_at(pointer).decode('utf-8')
+    finally:
+        library.TessDeleteText(pointer)
+
+def _toGrayBytes(image) -> np.ndarray:
+    '''
+    Convert a PIL image or array into a contiguous 8-bit grayscale array.
+    '''
+    if isinstance(image, Image.Image):
+        image = np.asarray(image if image.mode == 'L' else image.convert('L'))
+    elif image.ndim == 3:
+        image = np.asarray(Image.fromarray(image[:, :, :3]).convert('L'))
+    return np.ascontiguousarray(image, dtype=np.uint8)
@@ -0,0 +1,338 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the stages and profiles used to prepare images for OCR.
+-----------------'''
+
+#---Imports---#
+import inspect
+import threading
+import numpy as np
+from PIL import Image
+
+#---Constants---#
+# The ITU-R 601-2 luma weights that PIL uses when converting to 'L' mode
+_GRAY_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def toGray(image, out : np.ndarray = None) -> np.ndarray:
+    '''
+    Convert an image to an 8-bit grayscale array.
+
+    Parameters
+    ----------
+    image : PIL.Image or np.ndarray
+        The image to convert, either RGB(A) or already grayscale.
+
+    out : np.ndarray (Optional)
+        A buffer to write the result into, used if it has the right shape.
+
+    Returns
+    -------
+    np.ndarray
+        The grayscale image.
+    '''
+    if isinstance(image, Image.Image):
+        image = np.asarray(image if image.mode in ('L', 'RGB') else image.convert('RGB'))
+    if image.ndim == 2:
+        return image if image.dtype == np.uint8 else image.astype(np.uint8)
+
+    out = _buffer(out, image.shape[:2])
+    np.copyto(out, image[:, :, :3] @ _GRAY_WEIGHTS + 0.5, casting='unsafe')
+    return out
+
+def upscale(gray : np.ndarray, factor : int = 2, out : np.ndarray = None) -> np.ndarray:
+    '''
+    Enlarge a grayscale image by a whole number factor, repeating each pixel. Tesseract reads
+     text best when capitals are around 30 pixels tall, which small screen fonts are not.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        The grayscale image.
+
+    factor : int (Default = 2)
+        The number of times larger to make the image in each direction.
+
+    out : np.ndarray (Optional)
+        A buffer to write the result into, used if it has the right shape.
+    '''
+    if factor <= 1:
+        return gray
+
+    height, width = gray.shape
+    out = _buffer(out, (height * factor, width * factor))
+    out.reshape(height, factor, width, factor)[:] = gray[:, None, :, None]
+    return out
+
+def otsuThreshold(gray : np.ndarray, out : np.ndarray = None) -> np.ndarray:
+    '''
+    Binarise a grayscale image to black and white, choosing the threshold with Otsu's method
+     so that it separates text from an even background without any tuning.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        The grayscale image.
+
+    out : np.ndarray (Optional)
+        A buffer to write the result into, used if it has the right shape.
+    '''
+    # Pick the threshold that maximises the variance between the two classes of pixels
+    histogram = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    weight = np.cumsum(histogram)
+    total = np.cumsum(histogram * np.arange(256))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = (total[-1] * weight - total * weight[-1]) ** 2 / (weight * (weight[-1] - weight))
+    threshold = int(np.argmax(np.nan_to_num(variance, nan=0.0, posinf=0.0)))
+
+    out = _buffer(out, gray.shape)
+    np.multiply(gray > threshold, 255, out=out, casting='unsafe')
+    return out
+
+def adaptiveThreshold(gray : np.ndarray, block : int = 31, offset : int = 10, out : np.ndarray = None) -> np.ndarray:
+    '''
+    Binarise a grayscale image by comparing each pixel with the mean of the block around it,
+     which copes with gradients and uneven backgrounds that a single threshold cannot. Text
+     is expected to be darker than its background, so dark themes should be inverted first.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        The grayscale image.
+
+    block : int (Default = 31)
+        The width and height in pixels of the block each pixel is compared against.
+
+    offset : int (Default = 10)
+        How much darker than the block's mean a pixel has to be to count as text.
+
+    out : np.ndarray (Optional)
+        A buffer to write the result into, used if it has the right shape.
+    '''
+    height, width = gray.shape
+    radius = block // 2
+
+    # Sum every block at once from a summed-area table, clipping blocks at the edges
+    table = np.zeros((height + 1, width + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(gray, axis=0, dtype=np.float64), axis=1, out=table[1:, 1:])
+    y0 = np.clip(np.arange(height) - radius, 0, height)
+    y1 = np.clip(np.arange(height) + radius + 1, 0, height)
+    x0 = np.clip(np.arange(width) - radius, 0, width)
+    x1 = np.clip(np.arange(width) + radius + 1, 0, width)
+    sums = table[np.ix_(y1, x1)] - table[np.ix_(y0, x1)] - table[np.ix_(y1, x0)] + table[np.ix_(y0, x0)]
+    means = sums / ((y1 - y0)[:, None] * (x1 - x0)[None, :])
+
+    out = _buffer(out, gray.shape)
+    np.multiply(gray > means - offset, 255, out=out, casting='unsafe')
+    return out
+
+def invert(gray : np.ndarray, mode : str = 'auto', out : np.ndarray = None) -> np.ndarray:
+    '''
+    Invert a grayscale image so that text is dark on a light background, as Tesseract expects.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        The grayscale image.
+
+    mode : str (Default = 'auto')
+        'auto' to only invert images whose background is dark, such as dark themes, or
+          'always' to invert every image.
+
+    out : np.ndarray (Optional)
+        A buffer to write the result into, used if it has the right shape.
+    '''
+    if mode == 'auto' and _borderShade(gray) >= 128:
+        return gray
+
+    out = _buffer(out, gray.shape)
+    np.subtract(255, gray, out=out)
+    return out
+
+def pad(gray : np.ndarray, border : int = 10, out : np.ndarray = None) -> np.ndarray:
+    '''
+    Surround a grayscale image with a border in its background shade. Tesseract often misses
+     text that touches the edge of an image.
+
+    Parameters
+    ----------
+    gray : np.ndarray
+        The grayscale image.
+
+    border : int (Default = 10)
+        The width of the border in pixels.
+
+    out : np.ndarray (Optional)
+        A buffer to write the result into, used if it has the right shape.
+    '''
+    if border <= 0:
+        return gray
+
+    height, width = gray.shape
+    out = _buffer(out, (height + border * 2, width + border * 2))
+    out.fill(_borderShade(gray))
+    out[border:border + height, border:border + width] = gray
+    return out
+
+
+# The stages a pipeline can be built from, by name
+STAGES = {
+    'gray': toGray,
+    'upscale': upscale,
+    'otsu': otsuThreshold,
+    'adaptive': adaptiveThreshold,
+    'invert': invert,
+    'pad': pad,
+}
+
+
+class Pipeline:
+    '''
+    A sequence of preprocessing stages applied to an image before it is read. Each stage writes
+     into a buffer that is kept between calls, so preparing images of the same size over and
+     over does not allocate. Buffers are kept per thread.
+    '''
+
+    def __init__(self, stages : list, psm : int = None):
+        '''
+        Initialize the 'Pipeline' object.
+
+        Parameters
+        ----------
+        stages : list
+            The stages in the order they are applied. Each is either the name of a stage in
+              'STAGES', or a tuple of the name and a dict of its keyword arguments, such as
+              ('upscale', {'factor': 3}).
+
+        psm : int (Optional)
+            The Tesseract page segmentation mode that suits images prepared by this pipeline.
+        '''
+        self.stages = [(stage, {}) if isinstance(stage, str) else (stage[0], dict(stage[1])) for stage in stages]
+        self.psm = psm
+        for name, _ in self.stages:
+            if name not in STAGES:
+                raise ValueError(f"Unknown preprocessing stage '{name}', expected one of {tuple(STAGES)}.")
+
+        self._buffers = threading.local()
+
+    def __call__(self, image, copy : bool = False) -> np.ndarray:
+        '''
+        Prepare an image for OCR.
+
+        Parameters
+        ----------
+        image : PIL.Image or np.ndarray
+            The image to prepare.
+
+        copy : bool (Default = False)
+            If True, return a copy rather than the pipeline's own buffer. The buffer is overwritten
+              by the next call, so a copy is needed to keep more than one result at a time.
+
+        Returns
+        -------
+        np.ndarray
+            The prepared 8-bit grayscale image.
+        '''
+        buffers = getattr(self._buffers, 'buffers', None)
+        if buffers == None:
+            buffers = self._buffers.buffers = [None] * len(self.stages)
+
+        # Every image starts out as grayscale
+        result = toGray(image) if len(self.stages) == 0 or self.stages[0][0] != 'gray' else image
+        for index, (name, options) in enumerate(self.stages):
+            output = STAGES[name](result, out=buffers[index], **options)
+            if output is not result:
+                buffers[index] = output
+            result = output
+
+        if copy or result is image:
+            return result.copy()
+        return result
+
+    def unmap(self, left : float, top : float, width : float, height : float) -> tuple[int]:
+        '''
+        Map a box found in a prepared image back to the pixels of the original image, undoing
+         any upscaling and padding.
+
+        Returns
+        -------
+        tuple[int]
+            The box in the original image as (left, top, width, height).
+        '''
+        for name, options in reversed(self.stages):
+            if name == 'pad':
+                border = options.get('border', _defaultOption(pad, 'border'))
+                left, top = left - border, top - border
+            elif name == 'upscale':
+                factor = max(options.get('factor', _defaultOption(upscale, 'factor')), 1)
+                left, top, width, height = left / factor, top / factor, width / factor, height / factor
+        return (round(left), round(top), round(width), round(height))
+
+    def __repr__(self) -> str:
+        return f'Pipeline({self.stages}, psm={self.psm})'
+
+
+# The named pipelines that can be chosen per call
+PROFILES = {
+    # Grayscale only, which is how text was always read
+    'gray': Pipeline(['gray']),
+
+    # General screen text on an even background
+    'screen': Pipeline(['gray', ('upscale', {'factor': 2}), 'otsu', 'invert', 'pad']),
+
+    # A single line of small text, such as a button or field label
+    'label': Pipeline(['gray', ('upscale', {'factor': 3}), 'otsu', 'invert', 'pad'], psm=7),
+
+    # Text over gradients, images or uneven backgrounds
+    'adaptive': Pipeline(['gray', ('upscale', {'factor': 2}), 'invert', 'adaptive', 'pad']),
+}
+
+def getPipeline(preprocess) -> Pipeline:
+    '''
+    Resolve the preprocessing asked for by a caller into a pipeline.
+
+    Parameters
+    ----------
+    preprocess : str, list or Pipeline
+        The name of a profile in 'PROFILES', a list of stages, or a pipeline. None means 'gray'.
+
+    Returns
+    -------
+    Pipeline
+        The pipeline to prepare images with.
+    '''
+    if preprocess == None:
+        return PROFILES['gray']
+    if isinstance(preprocess, Pipeline):
+        return preprocess
+    if isinstance(preprocess, str):
+        if preprocess not in PROFILES:
+            raise ValueError(f"Unknown preprocessing profile '{preprocess}', expected one of {tuple(PROFILES)}.")
+        return PROFILES[preprocess]
+    return Pipeline(preprocess)
+
+
+#---Internal Functions---#
+def _buffer(out : np.ndarray, shape : tuple[int]) -> np.ndarray:
+    '''
+    Return the given buffer if it has the right shape, or a new one otherwise.
+    '''
+    if out is None or out.shape != tuple(shape):
+        return np.empty(shape, dtype=np.uint8)
+    return out
+
+def _defaultOption(stage, option : str):
+    '''
+    Return the default value of one of a stage's options.
+    '''
+    return inspect.signature(stage).parameters[option].default
+
+def _borderShade(gray : np.ndarray) -> int:
+    '''
+    Estimate the background shade of an image from the pixels along its border.
+    '''
+    if gray.size == 0:
+        return 255
+    border = np.concatenate([gray[0], gray[-1], gray[:, 0], gray[:, -1]])
+    return int(np.median(border))
@@ -0,0 +1,191 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A class for the 'Overlay' object that draws rectangles on the screen.
+-----------------'''
+
+#---Imports---#
+import atexit
+import itertools
+import queue
+import tkinter as tk
+from multiprocessing import Process, Queue
+
+#---Constants---#
+# How often in milliseconds the overlay process checks for new commands
+POLL_INTERVAL = 15
+
+# How transparent the filled part of each rectangle is
+FILL_ALPHA = 0.1
+
+# How transparent the label of each rectangle is
+LABEL_ALPHA = 0.9
+
+
+class Overlay:
+    '''
+    A single long-lived process that draws rectangles on the screen. Commands are sent to it
+     over a queue, so drawing never blocks the caller and does not pay for starting a process
+     or a Tk window each time.
+    '''
+
+    def __init__(self):
+        '''
+        Initialize the 'Overlay' object. The overlay process is started on the first draw.
+
+        Members
+        -------
+        process : Process
+            The process that owns the Tk windows.
+
+        commands : Queue
+            The queue that draw and clear commands are sent over.
+        '''
+        self.process = None
+        self.commands = None
+        self._keys = itertools.count()
+
+    def start(self):
+        '''
+        Start the overlay process if it is not already running.
+        '''
+        if self.process != None and self.process.is_alive():
+            return
+
+        self.commands = Queue()
+        self.process = Process(target=_serve, args=(self.commands,), daemon=True)
+        self.process.start()
+
+    def draw(self, region : list[int], color : str = 'red', label : str = None, timeout : int = 2500) -> int:
+        '''
+        Draw a rectangle on the screen.
+
+        Parameters
+        ----------
+        region : list[int]
+            A list of four integers that represent a region on the screen.
+              The list should be in this format: [x, y, width, height]
+
+        color : str (Default = 'red')
+            The Tk color of the rectangle.
+
+        label : str (Optional)
+            Text to show in the top left corner of the rectangle.
+
+        timeout : int (Default = 2500)
+            The amount of time the rectangle will be displayed in milliseconds, or None to
+              keep it until it is cleared.
+
+        Returns
+        -------
+        int
+            A key that can be passed to 'clear' to remove the rectangle early.
+        '''
+        self.start()
+        key = next(self._keys)
+        self.commands.put(('draw', key, [int(value) for value in region[:4]], color, label, timeout))
+        return key
+
+    def clear(self, key : int = None):
+        '''
+        Remove a rectangle from the screen, or every rectangle if no key is given.
+        '''
+        if self.commands != None:
+            self.commands.put(('clear', key))
+
+    def stop(self):
+        '''
+        Close every rectangle and stop the overlay process.
+        '''
+        if self.process != None and self.process.is_alive():
+            self.commands.put(('stop',))
+            self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.process = None
+
+
+#---Shared Overlay---#
+_overlay = None
+
+def getOverlay() -> Overlay:
+    '''
+    Return the overlay shared by every SearchRectangle, creating it on first use.
+    '''
+    global _overlay
+    if _overlay == None:
+        _overlay = Overlay()
+        atexit.register(_overlay.stop)
+    return _overlay
+
+
+#---Internal Functions---#
+def _serve(commands : Queue):
+    '''
+    Run the Tk event loop in the overlay process, handling commands as they arrive.
+    '''
+    root = tk.Tk()
+    root.withdraw()
+    windows = {}
+
+    def close(key):
+        for window in windows.pop(key, []):
+            window.destroy()
+
+    def poll():
+        # Handle every command that has arrived since the last poll
+        while True:
+            try:
+                command = commands.get_nowait()
+            except queue.Empty:
+                break
+
+            if command[0] == 'draw':
+                _, key, region, color, label, timeout = command
+                windows[key] = _drawWindows(root, region, color, label)
+                if timeout != None:
+                    root.after(timeout, close, key)
+            elif command[0] == 'clear':
+                for key in ([command[1]] if command[1] != None else list(windows)):
+                    close(key)
+            elif command[0] == 'stop':
+                root.destroy()
+                return
+
+        root.after(POLL_INTERVAL, poll)
+
+    root.after(POLL_INTERVAL, poll)
+    root.mainloop()
+
+def _drawWindows(root : tk.Tk, region : list[int], color : str, label : str) -> list[tk.Toplevel]:
+    '''
+    Create a borderless, semi-transparent window covering a region, along with a
+     mostly opaque window for its label so the text stays readable.
+    '''
+    x, y, width, height = region
+    window = _borderlessWindow(root, FILL_ALPHA)
+    window.geometry(f'{width}x{height}+{x}+{y}')
+    window.configure(bg=color)
+
+    # Outline the rectangle with a border in the same color
+    canvas = tk.Canvas(window, width=width, height=height, bd=0, highlightthickness=2, highlightbackground=color)
+    canvas.pack()
+
+    if label == None:
+        return [window]
+
+    # Show the label just inside the top left corner of the rectangle
+    label_window = _borderlessWindow(root, LABEL_ALPHA)
+    label_window.geometry(f'+{x + 2}+{y + 2}')
+    tk.Label(label_window, text=label, bg=color, fg='white').pack()
+    return [window, label_window]
+
+def _borderlessWindow(root : tk.Tk, alpha : float) -> tk.Toplevel:
+    '''
+    Create a window with no decorations that stays above every other window.
+    '''
+    window = tk.Toplevel(root)
+    window.overrideredirect(True)
+    window.attributes('-topmost', True)
+    window.attributes('-alpha', alpha)
+    return window
@@ -0,0 +1,224 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing a tiled image search that runs across a process pool.
+-----------------'''
+
+#---Imports---#
+import atexit
+import hashlib
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Iterator
+import numpy as np
+from .frame_source import Frame
+from .template_cache import Template
+from .matcher import Match, findAll, _pyramidLevel
+
+#---Constants---#
+# The number of tiles handed to each worker, so uneven tiles still balance out
+TILES_PER_WORKER = 2
+
+# Frames smaller than this many pixels are not worth splitting up
+MIN_PARALLEL_AREA = 1920 * 1080
+
+# The most templates each worker process keeps prepared between tiles
+WORKER_TEMPLATES = 32
+
+
+def findAllParallel(frame : Frame, template : Template, confidence : float = 0.9, workers : int = None, limit : int = 1000) -> list[Match]:
+    '''
+    Find every location of a template in a frame, matching overlapping tiles of the frame
+     across a pool of processes. The frame is placed in shared memory so it is not pickled.
+
+    Parameters
+    ----------
+    frame : Frame
+        The frame to search.
+
+    template : Template
+        The template to search for.
+
+    confidence : float (Default = 0.9)
+        The lowest score a location may have to be returned.
+
+    workers : int (Optional)
+        The number of processes to use, defaults to the number of CPUs.
+
+    limit : int (Default = 1000)
+        The most locations to return.
+
+    Returns
+    -------
+    list[Match]
+        The locations in screen coordinates with duplicates along tile seams removed, best first.
+    '''
+    return _dedupe(list(iterAllParallel(frame, template, confidence, workers, limit)))[:limit]
+
+
+def iterAllParallel(frame : Frame, template : Template, confidence : float = 0.9, workers : int = None, limit : int = 1000) -> Iterator[Match]:
+    '''
+    Lazily find every location of a template in a frame across a pool of processes, yielding
+     each tile's matches as soon as that tile finishes. Matches along tile seams may be yielded
+     twice, so callers are expected to deduplicate them. Closing the generator early cancels
+     the tiles that have not started yet.
+
+    Parameters
+    ----------
+    frame : Frame
+        The frame to search.
+
+    template : Template
+        The template to search for.
+
+    confidence : float (Default = 0.9)
+        The lowest score a location may have to be returned.
+
+    workers : int (Optional)
+        The number of processes to use, defaults to the number of CPUs.
+
+    limit : int (Default = 1000)
+        The most locations to return from each tile.
+
+    Yields
+    ------
+    Match
+        The locations in screen coordinates.
+    '''
+    workers = workers if workers != None else os.cpu_count() or 1
+    tiles = _tiles(frame, template, workers * TILES_PER_WORKER)
+
+    # Searching in this process is faster than starting work on the pool for small frames
+    if workers <= 1 or len(tiles) <= 1 or frame.width * frame.height < MIN_PARALLEL_AREA:
+        yield from findAll(frame, template, confidence, limit=limit)
+        return
+
+    # Copy the frame into shared memory once for every worker to read
+    memory = shared_memory.SharedMemory(create=True, size=frame.pixels.nbytes)
+    futures = []
+    try:
+        pixels = np.ndarray(frame.pixels.shape, dtype=np.uint8, buffer=memory.buf)
+        pixels[:] = frame.pixels
+        del pixels
+
+        # Work out the phase scores the tiles need here, and hand the workers the template's prepared
+        #  arrays, so that no worker converts it or works its phase scores out again
+        _pyramidLevel(frame, template)
+        state = _templateState(template)
+
+        # Match every tile on the pool, handing results back as tiles finish
+        pool = _getPool(workers)
+        futures = [pool.submit(_matchTile, memory.name, frame.pixels.shape, tile, (frame.left, frame.top), state, confidence, limit) \
+                   for tile in tiles]
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        # Stop any tiles that are still queued and wait for running ones before freeing the frame
+        for future in futures:
+            future.cancel()
+        for future in futures:
+            if not future.cancelled():
+                future.exception()
+        memory.close()
+        memory.unlink()
+
+
+#---Internal Functions---#
+_pool = None
+_pool_workers = 0
+
+def _getPool(workers : int) -> ProcessPoolExecutor:
+    '''
+    Return the shared process pool, creating it on first use since process startup is slow.
+    '''
+    global _pool, _pool_workers
+    if _pool == None or _pool_workers != workers:
+        if _pool != None:
+            _pool.shutdown()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+@atexit.register
+def _shutdownPool():
+    '''
+    Shut the process pool down when the interpreter exits.
+    '''
+    if _pool != None:
+        _pool.shutdown(cancel_futures=True)
+
+def _tiles(frame : Frame, template : Template, count : int) -> list[list[int]]:
+    '''
+    Split a frame into roughly 'count' tiles in array coordinates [x, y, width, height]. Tiles
+     overlap by the template size so that every window lies entirely inside at least one tile.
+    '''
+    # Choose a grid with roughly square tiles, each at least twice the template size
+    columns = max(min(round(math.sqrt(count * frame.width / frame.height)), frame.width // (template.width * 2)), 1)
+    rows = max(min(math.ceil(count / columns), frame.height // (template.height * 2)), 1)
+
+    tiles = []
+    for row in range(rows):
+        for column in range(columns):
+            x0 = frame.width * column // columns
+            y0 = frame.height * row // rows
+            x1 = min(frame.width * (column + 1) // columns + template.width - 1, frame.width)
+            y1 = min(frame.height * (row + 1) // rows + template.height - 1, frame.height)
+            tiles.append([x0, y0, x1 - x0, y1 - y0])
+    return tiles
+
+def _templateState(template : Template) -> tuple:
+    '''
+    Return what a worker needs to rebuild a template without converting it again: a key for its
+     content, its arrays and statistics, and the phase scores worked out so far.
+    '''
+    key = hashlib.blake2b(template.gray.tobytes(), digest_size=16)
+    key.update(str(template.gray.shape).encode('ascii'))
+    return (key.hexdigest(), template.pixels, template.gray, template.centered, template.mean, template.norm, \
+            dict(template._phase_scores))
+
+# The templates prepared in this worker process, least recently used first
+_worker_templates = {}
+
+def _workerTemplate(state : tuple) -> Template:
+    '''
+    Return the template for a state from '_templateState', building it only the first time this
+     process sees it, so its pyramid levels and blocks are shared by every tile the process matches.
+    '''
+    key, pixels, gray, centered, mean, norm, phase_scores = state
+    template = _worker_templates.pop(key, None)
+    if template == None:
+        template = Template.fromArrays(pixels, gray, centered, mean, norm)
+        while len(_worker_templates) >= WORKER_TEMPLATES:
+            del _worker_templates[next(iter(_worker_templates))]
+    template._phase_scores.update(phase_scores)
+    _worker_templates[key] = template
+    return template
+
+def _matchTile(memory_name : str, shape : tuple[int], tile : list[int], origin : tuple[int], template_state : tuple, \
+               confidence : float, limit : int) -> list[Match]:
+    '''
+    Match a template against one tile of a frame held in shared memory. Runs in a worker process.
+    '''
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        pixels = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+        x, y, width, height = tile
+        frame = Frame(pixels[y:y + height, x:x + width], origin[0] + x, origin[1] + y)
+        matches = findAll(frame, _workerTemplate(template_state), confidence, limit=limit)
+        del frame, pixels
+        return matches
+    finally:
+        memory.close()
+
+def _dedupe(matches : list[Match]) -> list[Match]:
+    '''
+    Remove matches that were found more than once, such as in two tiles that share a seam,
+     keeping the best scoring match among those less than half a template apart.
+    '''
+    kept = []
+    for match in sorted(matches, key=lambda match: match.score, reverse=True):
+        if all(abs(match.left - other.left) * 2 >= match.width or abs(match.top - other.top) * 2 >= match.height for other in kept):
+            kept.append(match)
+    return kept
@@ -0,0 +1,421 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the recorder and replay source for captured frames and raddish calls.
+-----------------'''
+
+#---Imports---#
+import json
+import mmap
+import struct
+import threading
+import time
+import zlib
+import numpy as np
+from . import instrumentation
+from .frame_source import Frame, FrameSource, getFrameSource, setFrameSource
+
+#---Constants---#
+# The first bytes of every recording, followed by the screen width and height
+MAGIC = b'RDSHREC1'
+
+# A full frame is stored after this many deltas, so seeking never decodes more than this many frames
+KEYFRAME_INTERVAL = 30
+
+# The zlib level payloads are compressed at, low enough that recording does not slow down a run
+COMPRESSION_LEVEL = 1
+
+# The kinds of record a recording holds
+FRAME_RECORD = 1
+CALL_RECORD = 2
+
+# The layout of the file header, and of the header in front of every record:
+#  kind, keyframe, timestamp, frame left, top, width, height, changed x, y, width, height, payload length
+_FILE_HEADER = struct.Struct('<8sii')
+_RECORD_HEADER = struct.Struct('<BBxxdiiiiiiiiI')
+
+
+class Recorder(FrameSource):
+    '''
+    Records every frame captured by raddish, along with each instrumented call and its result, to a
+     single file that 'Recording' and 'ReplayFrameSource' can read back without a display.
+
+    The recorder sits in front of the active frame source while it runs. A frame that is the same
+     size and position as the one before it is stored as a delta: only the rectangle of pixels that
+     changed is kept. Payloads are compressed with zlib, and a full frame is stored every
+     'KEYFRAME_INTERVAL' frames.
+
+    Records are written as they happen, so a run that crashes still leaves a readable recording
+     up to its last capture.
+    '''
+
+    def __init__(self, path : str, source : FrameSource = None):
+        '''
+        Initialize the 'Recorder' object.
+
+        Parameters
+        ----------
+        path : str
+            The file to record to, which is overwritten.
+
+        source : FrameSource (Optional)
+            The frame source to record from, defaults to the active frame source when recording starts.
+        '''
+        self.path = path
+        self.source = source
+        self.frames = 0
+        self.calls = 0
+
+        self._file = None
+        self._previous = None
+        self._since_key = 0
+        self._previous_source = None
+        self._was_enabled = False
+        self._lock = threading.Lock()
+
+    def start(self) -> 'Recorder':
+        '''
+        Start recording, making the recorder the active frame source and switching instrumentation on.
+        '''
+        if self._file != None:
+            return self
+
+        self._previous_source = getFrameSource()
+        if self.source == None:
+            self.source = self._previous_source
+
+        width, height = self.source.size()
+        self._file = open(self.path, 'wb')
+        self._file.write(_FILE_HEADER.pack(MAGIC, width, height))
+
+        # Record every instrumented call as well as the frames
+        self._was_enabled = instrumentation.isEnabled()
+        instrumentation.enable()
+        instrumentation.addListener(self._recordCall)
+        setFrameSource(self)
+        return self
+
+    def stop(self):
+        '''
+        Stop recording, putting back the frame source and instrumentation as they were.
+        '''
+        if self._file == None:
+            return
+
+        setFrameSource(self._previous_source)
+        instrumentation.removeListener(self._recordCall)
+        if not self._was_enabled:
+            instrumentation.disable()
+
+        with self._lock:
+            self._file.close()
+            self._file = None
+            self._previous = None
+
+    def grab(self, region : list[int] = None) -> Frame:
+        frame = self.source.grab(region)
+        self._recordFrame(frame)
+        return frame
+
+    def size(self) -> tuple[int]:
+        return self.source.size()
+
+    def close(self):
+        self.stop()
+
+    def __enter__(self) -> 'Recorder':
+        return self.start()
+
+    def __exit__(self, *exception):
+        self.stop()
+
+
+    #---Internal Methods---#
+    def _recordFrame(self, frame : Frame):
+        '''
+        Write a frame, as a delta from the one before it where possible.
+        '''
+        pixels = np.ascontiguousarray(frame.pixels)
+        height, width = pixels.shape[:2]
+
+        with self._lock:
+            # Recording may have stopped since the frame was captured
+            if self._file == None:
+                return
+
+            previous = self._previous
+            keyframe = previous == None or self._since_key >= KEYFRAME_INTERVAL or \
+                       previous[0] != (frame.left, frame.top, width, height)
+
+            if keyframe:
+                changed = (0, 0, width, height)
+                payload = pixels
+                self._since_key = 0
+            else:
+                # Keep only the rectangle of pixels that changed
+                different = np.any(pixels != previous[1], axis=2)
+                rows = np.flatnonzero(different.any(axis=1))
+                if len(rows) == 0:
+                    changed = (0, 0, 0, 0)
+                    payload = pixels[:0, :0]
+                else:
+                    columns = np.flatnonzero(different.any(axis=0))
+                    changed = (int(columns[0]), int(rows[0]), int(columns[-1] - columns[0] + 1), int(rows[-1] - rows[0] + 1))
+                    payload = pixels[changed[1]:changed[1] + changed[3], changed[0]:changed[0] + changed[2]]
+                self._since_key += 1
+
+            self._write(FRAME_RECORD, keyframe, frame.timestamp, (frame.left, frame.top, width, height), changed, \
+                        zlib.compress(np.ascontiguousarray(payload).tobytes(), COMPRESSION_LEVEL))
+            self._previous = ((frame.left, frame.top, width, height), pixels.copy())
+            self.frames += 1
+
+    def _recordCall(self, call : instrumentation.Call):
+        '''
+        Write a finished instrumented call.
+        '''
+        payload = json.dumps(call.toDict(), default=str).encode('utf-8')
+        with self._lock:
+            if self._file == None:
+                return
+            self._write(CALL_RECORD, False, time.time(), (0, 0, 0, 0), (0, 0, 0, 0), payload)
+            self.calls += 1
+
+    def _write(self, kind : int, keyframe : bool, timestamp : float, region : tuple[int], changed : tuple[int], payload : bytes):
+        '''
+        Write one record and flush it, so it survives the process crashing.
+        '''
+        self._file.write(_RECORD_HEADER.pack(kind, keyframe, timestamp, *region, *changed, len(payload)))
+        self._file.write(payload)
+        self._file.flush()
+
+
+class Recording:
+    '''
+    A recording made by 'Recorder', memory-mapped so that only the frames that are asked for are
+     read and decoded.
+
+    Members
+    -------
+    size : tuple[int]
+        The (width, height) of the screen that was recorded.
+
+    calls : list[dict]
+        Every recorded call in the order it finished, with its 'function', 'template', 'start',
+         'duration', 'phases', 'fields', 'error' and 'result'.
+
+    timestamps : list[float]
+        The time each frame was captured at.
+
+    regions : list[tuple[int]]
+        The area of the screen each frame covers, as (x, y, width, height).
+    '''
+
+    def __init__(self, path : str):
+        '''
+        Initialize the 'Recording' object.
+
+        Parameters
+        ----------
+        path : str
+            The recording to open.
+        '''
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, width, height = _FILE_HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a raddish recording.")
+        self.size = (width, height)
+
+        # Index every record by reading its header, leaving frame payloads where they are
+        self.calls = []
+        self.timestamps = []
+        self.regions = []
+        self._frames = []
+        offset = _FILE_HEADER.size
+        while offset + _RECORD_HEADER.size <= len(self._map):
+            kind, keyframe, timestamp, *fields, length = _RECORD_HEADER.unpack_from(self._map, offset)
+            start = offset + _RECORD_HEADER.size
+            if start + length > len(self._map):
+                # The run stopped part way through writing this record
+                break
+
+            if kind == FRAME_RECORD:
+                self._frames.append((bool(keyframe), timestamp, tuple(fields[:4]), tuple(fields[4:]), start, length))
+                self.timestamps.append(timestamp)
+                self.regions.append(tuple(fields[:4]))
+            elif kind == CALL_RECORD:
+                self.calls.append(json.loads(bytes(self._map[start:start + length]).decode('utf-8')))
+            offset = start + length
+
+        # The most recently decoded frame, so reading frames in order only applies one delta each
+        self._decoded = None
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def frame(self, index : int) -> Frame:
+        '''
+        Decode a recorded frame.
+
+        Parameters
+        ----------
+        index : int
+            The position of the frame in the recording.
+
+        Returns
+        -------
+        Frame
+            The frame as it was captured, with its original position and timestamp.
+        '''
+        if index < 0:
+            index += len(self._frames)
+        if not 0 <= index < len(self._frames):
+            raise IndexError(f'The recording has {len(self._frames)} frames, there is no frame {index}.')
+
+        # Start from the frame decoded last if it is on the way, otherwise from the nearest keyframe
+        if self._decoded != None and self._decoded[0] <= index and \
+           not any(self._frames[i][0] for i in range(self._decoded[0] + 1, index + 1)):
+            position, pixels = self._decoded
+        else:
+            position = index
+            while not self._frames[position][0]:
+                position -= 1
+            pixels = self._payload(position)
+
+        for position in range(position + 1, index + 1):
+            pixels = self._applyDelta(pixels, position)
+
+        self._decoded = (index, pixels)
+        _, timestamp, (left, top, _, _), _, _, _ = self._frames[index]
+
+        # Hand out a read-only view, so a caller cannot change the frames later ones are built on
+        view = pixels.view()
+        view.flags.writeable = False
+        return Frame(view, left, top, timestamp)
+
+    def framesDuring(self, call : dict) -> list[int]:
+        '''
+        Return the indices of the frames captured while a recorded call was running.
+        '''
+        end = call['start'] + call['duration']
+        return [index for index, timestamp in enumerate(self.timestamps) if call['start'] <= timestamp <= end]
+
+    def close(self):
+        '''
+        Unmap and close the recording.
+        '''
+        self._decoded = None
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'Recording':
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+
+    #---Internal Methods---#
+    def _payload(self, index : int) -> np.ndarray:
+        '''
+        Decompress the stored pixels of a frame record.
+        '''
+        _, _, _, (x, y, width, height), start, length = self._frames[index]
+        data = zlib.decompress(self._map[start:start + length])
+        return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3).copy()
+
+    def _applyDelta(self, pixels : np.ndarray, index : int) -> np.ndarray:
+        '''
+        Build a frame from the frame before it and its changed rectangle.
+        '''
+        _, _, _, (x, y, width, height), _, _ = self._frames[index]
+        if width == 0 or height == 0:
+            return pixels
+
+        # Copy so that frames already handed out keep their pixels
+        pixels = pixels.copy()
+        pixels[y:y + height, x:x + width] = self._payload(index)
+        return pixels
+
+
+class ReplayFrameSource(FrameSource):
+    '''
+    Serves the frames of a recording in the order they were captured, one per grab. Nothing waits
+     for the time that passed between captures, so a replay runs as fast as the searches do.
+
+    A grab for a region serves the next recorded frame cropped to that region. If that frame does
+     not cover the region, the most recent frame that does is served instead, so searches whose
+     regions changed since the recording can still be replayed. The last frame served for each
+     recorded area is kept, so falling back does not decode earlier frames again.
+    '''
+
+    def __init__(self, recording, loop : bool = False):
+        '''
+        Initialize the 'ReplayFrameSource' object.
+
+        Parameters
+        ----------
+        recording : Recording | str
+            The recording to replay, or the path to one.
+
+        loop : bool (Default = False)
+            If True, start from the first frame again after the last one, otherwise
+             keep serving the last frame.
+        '''
+        self.recording = recording if isinstance(recording, Recording) else Recording(recording)
+        if len(self.recording) == 0:
+            raise ValueError("The recording does not hold any frames to replay.")
+
+        self.loop = loop
+        self.index = 0
+
+        # The latest frame replayed for each recorded area, as (grab number, position, Frame or None
+        #  if it has not been decoded)
+        self._latest = {}
+        self._grabs = 0
+
+    def grab(self, region : list[int] = None) -> Frame:
+        index = self.index
+        area = self.recording.regions[index]
+        self._grabs += 1
+
+        # Advance to the next frame
+        if self.index + 1 < len(self.recording):
+            self.index += 1
+        elif self.loop:
+            self.index = 0
+
+        if region == None or _covers(area, region):
+            frame = self.recording.frame(index)
+            self._latest[area] = (self._grabs, index, frame)
+            return frame if region == None else frame.crop(region)
+
+        # Fall back to the most recent frame that covers the region, decoding it only if it was skipped
+        self._latest[area] = (self._grabs, index, None)
+        covering = [(latest, area) for area, latest in self._latest.items() if _covers(area, region)]
+        if len(covering) == 0:
+            raise ValueError(f'No recorded frame up to frame {index} covers the region {region}.')
+
+        (grab, position, frame), area = max(covering, key=lambda pair: pair[0][0])
+        if frame == None:
+            frame = self.recording.frame(position)
+            self._latest[area] = (grab, position, frame)
+        return frame.crop(region)
+
+    def size(self) -> tuple[int]:
+        return self.recording.size
+
+    def close(self):
+        self.recording.close()
+
+
+#---Internal Functions---#
+def _covers(area : tuple[int], region : list[int]) -> bool:
+    '''
+    Check if a region lies entirely within a recorded area, both as (x, y, width, height).
+    '''
+    return area[0] <= region[0] and area[1] <= region[1] and \
+        region[0] + region[2] <= area[0] + area[2] and region[1] + region[3] <= area[1] + area[3]
@@ -0,0 +1,263 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the streaming result type returned by multi-match searches.
+-----------------'''
+
+#---Imports---#
+from typing import Callable as function
+from typing import Iterable, Iterator
+import numpy as np
+from pyscreeze import Box
+from .frame_source import Frame
+from .matcher import Match
+
+#---Constants---#
+# Matches overlapping a kept match by more than this intersection over union are dropped
+OVERLAP_THRESHOLD = 0.3
+
+# The orders that results can be sorted into
+ORDERS = (None, 'score', 'row', 'column', 'nearest', 'shortest')
+
+# The orders that shorten the distance travelled between results, rather than sorting them
+TRAVEL_ORDERS = ('nearest', 'shortest')
+
+# The most passes of 2-opt improvement made to a 'shortest' path
+MAX_TWO_OPT_PASSES = 50
+
+
+class MatchStream:
+    '''
+    The lazily computed results of a search for every instance of an image. Matches are
+     deduplicated with non-maximum suppression as they arrive, and the scan stops as soon
+     as enough results have been produced. Iterating a stream yields pyscreeze Boxes, so each
+     result can be passed straight to other pyautogui functions such as 'click'.
+    '''
+
+    def __init__(self, matches : Iterable[Match], max_results : int = None, stop_when : function = None, order : str = None, \
+                 overlap : float = OVERLAP_THRESHOLD, start : tuple[float] = None, frame : Frame = None):
+        '''
+        Initialize the 'MatchStream' object.
+
+        Parameters
+        ----------
+        matches : Iterable[Match]
+            The raw matches, normally a generator that scans as it is consumed.
+
+        max_results : int (Optional)
+            Stop scanning once this many results have been produced.
+
+        stop_when : function (Optional)
+            Called with each result as a Box, the scan stops after the first result it returns True for.
+
+        order : str (Optional)
+            The order to yield results in, one of 'score', 'row' (top to bottom, then left to right),
+             'column' (left to right, then top to bottom), 'nearest' (each result followed by the
+             closest one not yet yielded) or 'shortest' (the 'nearest' path shortened further with
+             2-opt). Ordered streams have to finish the scan before producing their first result.
+             By default results are yielded as they are found.
+
+        overlap : float (Default = 0.3)
+            The intersection over union above which a match counts as a duplicate of a kept one.
+
+        start : tuple[float] (Optional)
+            The (x, y) point that 'nearest' and 'shortest' paths start from, such as the mouse
+             position. Without one, they start from the first result in row order.
+
+        frame : Frame (Optional)
+            The frame the matches were found in, kept as the stream's 'frame'.
+        '''
+        if order not in ORDERS:
+            raise ValueError(f"Unknown order '{order}', expected one of {ORDERS}.")
+
+        self.max_results = max_results
+        self.stop_when = stop_when
+        self.order = order
+        self.overlap = overlap
+        self.start = start
+        self.frame = frame
+
+        self._source = iter(matches)
+        self._kept = []
+        self._finished = False
+
+        # Ordered streams need every result up front
+        if order != None:
+            self._source = iter(sorted(self._source, key=lambda match: match.score, reverse=True))
+            self._kept = _sortMatches(list(self._scan()), order, start)
+            if max_results != None:
+                self._kept = self._kept[:max_results]
+            if callable(stop_when):
+                for index, match in enumerate(self._kept):
+                    if stop_when(match.box()):
+                        self._kept = self._kept[:index + 1]
+                        break
+            self._finished = True
+
+    def matches(self) -> Iterator[Match]:
+        '''
+        Iterate over the results as Matches, which carry their score.
+        '''
+        index = 0
+        while True:
+            # Serve results that have already been produced first
+            if index < len(self._kept):
+                yield self._kept[index]
+                index += 1
+                continue
+
+            if self._finished:
+                return
+
+            # Produce the next result from the scan
+            try:
+                self._pull()
+            except StopIteration:
+                self._finished = True
+
+    def first(self) -> Box:
+        '''
+        Return the first result, scanning only as far as needed, or None if there are none.
+        '''
+        for match in self.matches():
+            return match.box()
+        return None
+
+    def all(self) -> list[Box]:
+        '''
+        Finish the scan and return every result.
+        '''
+        return list(self)
+
+    def close(self):
+        '''
+        Stop the scan without producing any more results.
+        '''
+        self._finished = True
+        if hasattr(self._source, 'close'):
+            self._source.close()
+
+    def __iter__(self) -> Iterator[Box]:
+        for match in self.matches():
+            yield match.box()
+
+    def __bool__(self) -> bool:
+        return self.first() != None
+
+
+    #---Internal Methods---#
+    def _scan(self) -> Iterator[Match]:
+        '''
+        Yield the raw matches that survive non-maximum suppression.
+        '''
+        for match in self._source:
+            if all(_overlap(match, kept) <= self.overlap for kept in self._kept):
+                self._kept.append(match)
+                yield match
+
+    def _pull(self):
+        '''
+        Add the next surviving match to the results, raising StopIteration once the scan is over.
+        '''
+        if self.max_results != None and len(self._kept) >= self.max_results:
+            raise StopIteration
+
+        # Scan until a match survives suppression
+        for match in self._source:
+            if all(_overlap(match, kept) <= self.overlap for kept in self._kept):
+                self._kept.append(match)
+
+                # Stop scanning once the caller's condition holds
+                if callable(self.stop_when) and self.stop_when(match.box()):
+                    self.close()
+                return
+
+        raise StopIteration
+
+
+#---Internal Functions---#
+def _overlap(first : Match, second : Match) -> float:
+    '''
+    Return the intersection over union of two matches.
+    '''
+    width = min(first.left + first.width, second.left + second.width) - max(first.left, second.left)
+    height = min(first.top + first.height, second.top + second.height) - max(first.top, second.top)
+    if width <= 0 or height <= 0:
+        return 0.0
+
+    intersection = width * height
+    return intersection / (first.width * first.height + second.width * second.height - intersection)
+
+def _sortMatches(matches : list[Match], order : str, start : tuple[float] = None) -> list[Match]:
+    '''
+    Sort matches into the given order, starting travel orders from the start point if one is given.
+    '''
+    if order == 'score':
+        return sorted(matches, key=lambda match: match.score, reverse=True)
+    if order in TRAVEL_ORDERS:
+        path = _sortMatches(matches, 'row')
+        points = np.array([_centre(match) for match in path], dtype=np.float64).reshape(-1, 2)
+        if start == None:
+            return [path[index] for index in _travelPath(points, order)]
+
+        # Plan the path from the start point as if it were the first point, then leave it out
+        points = np.vstack([np.array(start, dtype=np.float64).reshape(1, 2), points])
+        return [path[index - 1] for index in _travelPath(points, order)[1:]]
+
+    # Group matches into rows (or columns) that are less than half a match apart
+    along, across = ('top', 'left') if order == 'row' else ('left', 'top')
+    lines = []
+    for match in sorted(matches, key=lambda match: getattr(match, along)):
+        size = match.height if order == 'row' else match.width
+        if len(lines) > 0 and getattr(match, along) - getattr(lines[-1][0], along) < size / 2:
+            lines[-1].append(match)
+        else:
+            lines.append([match])
+
+    return [match for line in lines for match in sorted(line, key=lambda match: getattr(match, across))]
+
+def _centre(match : Match) -> tuple[float]:
+    '''
+    Return the centre of a match, where it would be clicked.
+    '''
+    return (match.left + match.width / 2, match.top + match.height / 2)
+
+def _travelPath(points : np.ndarray, order : str) -> list[int]:
+    '''
+    Return an order to visit the points in that keeps the distance travelled short, starting
+     from the first point. 'nearest' always moves to the closest point not yet visited, and
+     'shortest' then reverses stretches of that path while doing so makes it shorter (2-opt).
+    '''
+    if len(points) < 3:
+        return list(range(len(points)))
+    distances = np.hypot(*(points[:, None] - points[None, :]).transpose(2, 0, 1))
+
+    # Greedy nearest neighbour
+    path = [0]
+    unvisited = np.ones(len(points), dtype=bool)
+    unvisited[0] = False
+    for _ in range(len(points) - 1):
+        following = int(np.argmin(np.where(unvisited, distances[path[-1]], np.inf)))
+        unvisited[following] = False
+        path.append(following)
+
+    if order == 'nearest':
+        return path
+
+    # 2-opt on an open path that keeps its start, where reversing path[i:j + 1] swaps the edges
+    #  on either side of it, and the last point has no edge after it
+    path = np.array(path)
+    for _ in range(MAX_TWO_OPT_PASSES):
+        improved = False
+        for i in range(1, len(path) - 1):
+            before = distances[path[i - 1], path[i]]
+            for j in range(i + 1, len(path)):
+                after = distances[path[j], path[j + 1]] if j + 1 < len(path) else 0.0
+                swapped = distances[path[i - 1], path[j]] + (distances[path[i], path[j + 1]] if j + 1 < len(path) else 0.0)
+                if swapped < before + after - 1e-9:
+                    path[i:j + 1] = path[i:j + 1][::-1].copy()
+                    before = distances[path[i - 1], path[i]]
+                    improved = True
+        if not improved:
+            break
+    return path.tolist()
@@ -1,8 +1,8 @@
-from search_rectangle import SearchRectangle
+from raddish.search_rectangle import SearchRectangle
 import time
 import pyautogui
-from image_search import *
-from text_reader import *
+from raddish.image_search import *
+from raddish.text_reader import *
 
 
 def main():
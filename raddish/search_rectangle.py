@@ -5,14 +5,18 @@
 -----------------'''
 
 #---Imports---#
-import tkinter as tk
-from multiprocessing import Process, Event
-import pyautogui
-from pyautogui import ImageNotFoundException
+from .frame_source import Frame, captureFrame, getFrameSource
+from .template_cache import getTemplate
+from .matcher import findBest
+from .geometry import Rect
+from .overlay import getOverlay
+from .instrumentation import instrument
 
 class SearchRectangle:
 
-    def __init__(self, region : list[int] = None, topLeftImage : str = None, bottomRightImage : str = None, draw : bool = False, timeout : int = 2500):
+    @instrument('SearchRectangle')
+    def __init__(self, region : list[int] = None, topLeftImage : str = None, bottomRightImage : str = None, draw : bool = False, timeout : int = 2500, \
+                 frame : Frame = None):
         '''
         Initialize the 'SearchRectangle' object.
 
@@ -21,6 +25,16 @@ class SearchRectangle:
         region : list[int]
             A list of four integers that represent a region on the screen.
               The list should be in this format: [x, y, width, height]
+
+        topLeftImage : str
+            An image whose top left corner marks the top left corner of the rectangle.
+
+        bottomRightImage : str
+            An image whose bottom right corner marks the bottom right corner of the rectangle.
+
+        frame : Frame (Optional)
+            A frame that has already been captured, to find the anchor images in instead of
+              capturing a new one. Both anchors are always found in the same capture.
         
         Members
         -------
@@ -36,15 +50,12 @@ class SearchRectangle:
         height : int
             The height of the region.
         
-        process : Process
-            Holds the drawing process of the SR.
+        draw_key : int
+            The overlay key of the SR's drawing, used to clear it early.
         
         draw : bool
-            A flag to determine if the SR should be drawn on the screen.
-
-        draw_complete : Event
-            An event to determine if the SR has finished drawing, used so
-                the program can wait for the SR to finish drawing before continuing.
+            A flag to determine if the SR should be drawn on the screen. Drawing does
+              not block, the SR is shown by the shared overlay process in the background.
 
         timeout : int (Default = 2500)
             The amount of time the SR will be drawn on the screen in milliseconds.
@@ -64,11 +75,11 @@ class SearchRectangle:
         
         # Check if the images are provided
         elif topLeftImage != None and bottomRightImage != None:
-            # Find the top left and bottom right coordinates of the search rectangle
-            try:
-                topLeft = pyautogui.locateOnScreen(topLeftImage, confidence=0.9)
-                bottomRight = pyautogui.locateOnScreen(bottomRightImage, confidence=0.9)
-            except ImageNotFoundException:
+            # Find the top left and bottom right coordinates of the search rectangle in a single capture
+            frame = frame if frame != None else captureFrame()
+            topLeft = findBest(frame, getTemplate(topLeftImage), 0.9)
+            bottomRight = findBest(frame, getTemplate(bottomRightImage), 0.9)
+            if topLeft == None or bottomRight == None or topLeft.score < 0.9 or bottomRight.score < 0.9:
                 raise InvalidSR("The images provided could not be found on the screen.")
             
             # Assign the values of the search rectangle
@@ -80,40 +91,56 @@ class SearchRectangle:
         else:
             raise InvalidSR("No region or images were provided to create the search rectangle.")
 
-        # Start a new process to draw the search rectangle
-        self.process = None
-        self.draw_complete = Event()
-
         # Draw the search rectangle if the flag is set
+        self.draw_key = None
         if draw:
             self.drawSR(timeout=timeout)
-            self._waitForDraw() 
     
-    def drawSR(self, timeout : int = 2500):
+    def drawSR(self, timeout : int = 2500, color : str = 'red', label : str = None) -> int:
         '''
-        Draw a representation of the search rectangle on the screen by
-         creating a semi-transparent red window that will disappear after a
-         given amount of time. Uses multiprocessing to run multiple drawings in the
-         background.
+        Draw a representation of the search rectangle on the screen as a
+         semi-transparent window that will disappear after a given amount of time.
+         Drawings are handed to one long-lived overlay process, so this returns
+         immediately and many SRs can be shown at once.
 
         Parameters
         ----------
         timeout : int (Default = 2500)
-            The amount of time the SR will be displayed on the screen in milliseconds.
+            The amount of time the SR will be displayed on the screen in milliseconds,
+              or None to keep it until 'clearSR' is called.
+
+        color : str (Default = 'red')
+            The Tk color of the SR.
+
+        label : str (Optional)
+            Text to show in the top left corner of the SR.
         
         Returns
         -------
-        None
+        int
+            The overlay key of the drawing.
         '''
 
-        # Terminate the process if its already running
-        if self.process != None:
-            self.process.terminate()
-            self.process.join()
+        # Replace the previous drawing of this SR
+        self.clearSR()
+        self.draw_key = getOverlay().draw(self.rect.toList(), color, label, timeout)
+        return self.draw_key
+
+    def clearSR(self):
+        '''
+        Remove the drawing of the search rectangle from the screen, if there is one.
+        '''
+        if self.draw_key != None:
+            getOverlay().clear(self.draw_key)
+            self.draw_key = None
 
-        # Begin a new process to draw the SR
-        self.process = Process(target=self._drawSR, args=(timeout,))
-        self.process.start()
+    @property
+    def rect(self) -> Rect:
+        '''
+        The area of the search rectangle as a 'Rect', for cheap geometry such as
+         intersections, unions, margins and subdividing into grids.
+        '''
+        return Rect(self.x, self.y, self.width, self.height)
 
     def isWithin(self, point : list[int]) -> bool:
         '''
@@ -139,35 +166,6 @@ class SearchRectangle:
 
 
     #---Internal Methods---#
-    def _drawSR(self, timeout : int):
-        '''
-        Internal method to actually draw the search rectangle on the screen.
-        '''
-        # Desginate a timer to show the SR.
-        window = tk.Tk()
-        window.overrideredirect(True)
-        window.attributes('-topmost', True)
-        window.geometry(f'{self.width}x{self.height}+{self.x}+{self.y}')
-        window.attributes('-alpha', 0.1)
-        window.configure(bg='red')
-
-        # Create a Canvas widget with a red border
-        canvas = tk.Canvas(window, width=self.width, height=self.height, bd=0, highlightthickness=2, highlightbackground="red")
-        canvas.pack()
-
-        window.after(timeout, window.destroy)
-
-        window.mainloop()
-
-        self.draw_complete.set()
-
-
-    def _waitForDraw(self):
-        '''
-        Wait for the search rectangle to finish drawing.
-        '''
-        self.draw_complete.wait()
-        
     def _validateSR(self, region : list[int]):
         '''
         Checks if the search rectangle is valid on the screen.
@@ -176,9 +174,12 @@ class SearchRectangle:
         # Check if the SR is off the screen
         if region[0] < 0 or region[1] < 0:
             raise InvalidSR("The region is off the screen.")
-        elif region[2] == 0 or region[3] == 0:
+        elif region[2] <= 0 or region[3] <= 0:
             raise InvalidSR("The region has a negative/zero width or height.")
-        elif region[0] + region[2] > pyautogui.size()[0] or region[1] + region[3] > pyautogui.size()[1]:
+
+        # Compare against the cached size of whatever the active frame source captures
+        screen_width, screen_height = getFrameSource().size()
+        if region[0] + region[2] > screen_width or region[1] + region[3] > screen_height:
             raise InvalidSR("The region exceeds the screen.")
 
 
@@ -0,0 +1,384 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing declarative steps and the plan that runs them with speculative searches.
+-----------------'''
+
+#---Imports---#
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pyscreeze import Box
+from .search_rectangle import SearchRectangle
+from .frame_source import Frame, captureFrame
+from .change_detection import changedTiles, AdaptivePoller, TILE_SIZE
+from .image_search import _locateInFrame
+from .text_reader import readText
+from .instrumentation import instrument, phase, count
+from .utility import _determineRegion, ImageNotFoundException
+
+#---Constants---#
+# The number of seconds to let the screen settle after a click or typing before the next step looks at it
+DEFAULT_SETTLE = 0.2
+
+
+class Step:
+    '''
+    The base class for a step of a 'Plan'. A step searches a frame for what it needs, then acts
+     on what it found. Searching has no side effects, so the plan can run it ahead of time on
+     a background thread while the previous step is still acting.
+
+    Subclasses implement 'search' and, if the step does something, 'act'.
+    '''
+    # If True, the step changes the screen, so the plan waits for it to settle and speculates on the next step meanwhile
+    acts = False
+
+    def __init__(self, region : list[int] = None, search_rectangle : SearchRectangle = None, timeout : float = 0):
+        '''
+        Initialize the 'Step' object.
+
+        Parameters
+        ----------
+        region : list[int] (Optional)
+            A list of four integers that represent a region on the screen.
+              The list should be in this format: [x, y, width, height]
+
+        search_rectangle : SearchRectangle (Optional)
+            A SearchRectangle object that represents a region on the screen.
+
+        timeout : float (Default = 0)
+            The number of seconds to keep searching for before the step fails.
+        '''
+        self.region = region
+        self.search_rectangle = search_rectangle
+        self.timeout = timeout
+
+    def area(self) -> list[int]:
+        '''
+        Return the region of the screen the step searches.
+        '''
+        return _determineRegion(self.region, self.search_rectangle)
+
+    def search(self, frame : Frame):
+        '''
+        Search a frame for what the step needs, returning None if it is not there.
+        '''
+        return True
+
+    def valid(self, result, frame : Frame) -> list[int]:
+        '''
+        Return the region of the screen a search result depends on. A speculative result is thrown
+         away if this region changed between the frame it was found in and the screen the step runs on.
+        '''
+        return frame.region
+
+    def act(self, result):
+        '''
+        Act on what the search found, returning the value the step produces.
+        '''
+        return result
+
+    def failure(self) -> Exception:
+        '''
+        Return the exception raised when the search does not find anything within the timeout.
+        '''
+        return ImageNotFoundException(f'{self!r} did not find anything within the timeout period.')
+
+
+class Find(Step):
+    '''
+    Find an image, producing its location.
+    '''
+
+    def __init__(self, image_path : str, confidence : float = 0.9, region : list[int] = None, search_rectangle : SearchRectangle = None, \
+                 timeout : float = 0):
+        '''
+        Initialize the 'Find' object.
+
+        Parameters
+        ----------
+        image_path : str
+            The path to the image to search for.
+
+        confidence : float (Default = 0.9)
+            The confidence level to search for the image.
+
+        region : list[int] (Optional)
+            A list of four integers that represent a region on the screen.
+
+        search_rectangle : SearchRectangle (Optional)
+            A SearchRectangle object that represents a region on the screen.
+
+        timeout : float (Default = 0)
+            The number of seconds to wait for the image to appear.
+        '''
+        super().__init__(region, search_rectangle, timeout)
+        self.image_path = image_path
+        self.confidence = confidence
+
+    def search(self, frame : Frame) -> Box:
+        return _locateInFrame(self.image_path, frame, self.confidence)
+
+    def valid(self, result : Box, frame : Frame) -> list[int]:
+        # A found image only depends on the pixels under it, nothing else on the screen
+        if result == None:
+            return frame.region
+        return [result.left, result.top, result.width, result.height]
+
+    def failure(self) -> Exception:
+        return ImageNotFoundException(f"The image: '{self.image_path}' was not found within the timeout period.")
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.image_path!r})'
+
+
+class Wait(Find):
+    '''
+    Wait for an image to appear, producing its location. The same as 'Find' with a timeout.
+    '''
+
+    def __init__(self, image_path : str, timeout : float = 10, confidence : float = 0.9, region : list[int] = None, \
+                 search_rectangle : SearchRectangle = None):
+        super().__init__(image_path, confidence, region, search_rectangle, timeout)
+
+
+class Click(Find):
+    '''
+    Find an image and click on it, producing the location that was clicked.
+    '''
+    acts = True
+
+    def act(self, result : Box) -> Box:
+        import pyautogui
+        with phase('click'):
+            pyautogui.click(result)
+        return result
+
+
+class Type(Step):
+    '''
+    Type text with the keyboard.
+    '''
+    acts = True
+
+    def __init__(self, text : str, interval : float = 0.0):
+        '''
+        Initialize the 'Type' object.
+
+        Parameters
+        ----------
+        text : str
+            The text to type.
+
+        interval : float (Default = 0.0)
+            The number of seconds to wait between each key.
+        '''
+        super().__init__()
+        self.text = text
+        self.interval = interval
+
+    def area(self) -> list[int]:
+        # Typing does not look at the screen
+        return None
+
+    def act(self, result) -> str:
+        import pyautogui
+        pyautogui.write(self.text, interval=self.interval)
+        return self.text
+
+    def __repr__(self) -> str:
+        return f'Type({self.text!r})'
+
+
+class ReadText(Step):
+    '''
+    Read the text in a region, producing the text.
+    '''
+
+    def __init__(self, region : list[int] = None, search_rectangle : SearchRectangle = None, language : str = 'eng', \
+                 preprocess = None):
+        '''
+        Initialize the 'ReadText' object.
+
+        Parameters
+        ----------
+        region : list[int] (Optional)
+            A list of four integers that represent a region on the screen.
+
+        search_rectangle : SearchRectangle (Optional)
+            A SearchRectangle object that represents a region on the screen.
+
+        language : str (Default = 'eng')
+            The language that the Tesseract engine should use to read the text.
+
+        preprocess : str, list or Pipeline (Optional)
+            How to prepare the image before reading it, as for 'readText'.
+        '''
+        super().__init__(region, search_rectangle)
+        self.language = language
+        self.preprocess = preprocess
+
+    def search(self, frame : Frame) -> str:
+        return readText(frame.region, self.language, frame=frame, preprocess=self.preprocess)
+
+    def __repr__(self) -> str:
+        return f'ReadText({self.region!r})'
+
+
+class Plan:
+    '''
+    Runs a list of steps in order, overlapping the work of one step with the next.
+
+    While a step that acts, such as a click, waits for the screen to settle, the plan already
+     captures the next step's region and searches it on a background thread, repeating until the
+     screen stops changing. When the next step starts, the plan captures the screen once more and
+     keeps the speculative result only if the part of the screen it depends on did not change.
+     Otherwise the search is run again on the new capture, so a speculative result is never
+     used for a screen it was not found on.
+
+    Members
+    -------
+    speculated : int
+        The number of steps searched ahead of time.
+
+    hits : int
+        The number of speculative results that were used.
+    '''
+
+    def __init__(self, steps : list[Step], settle : float = DEFAULT_SETTLE, speculate : bool = True):
+        '''
+        Initialize the 'Plan' object.
+
+        Parameters
+        ----------
+        steps : list[Step]
+            The steps to run, in order.
+
+        settle : float (Default = 0.2)
+            The number of seconds to wait after a step that acts before the next step looks at the screen.
+
+        speculate : bool (Default = True)
+            If False, run every step one after another without searching ahead.
+        '''
+        self.steps = list(steps)
+        self.settle = settle
+        self.speculate = speculate
+        self.speculated = 0
+        self.hits = 0
+
+    @instrument('Plan.run')
+    def run(self) -> list:
+        '''
+        Run every step.
+
+        Returns
+        -------
+        list
+            The value each step produced, such as the location clicked or the text read.
+        '''
+        values = []
+        speculation = None
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='raddish-plan') as executor:
+            try:
+                for index, step in enumerate(self.steps):
+                    result = self._resolve(step, speculation)
+                    speculation = None
+                    values.append(step.act(result))
+
+                    if not step.acts:
+                        continue
+
+                    # Search for the next step while this one settles
+                    following = self.steps[index + 1] if index + 1 < len(self.steps) else None
+                    settle_until = time.monotonic() + self.settle
+                    if self.speculate and following != None and following.area() != None:
+                        stop = threading.Event()
+                        speculation = (following, stop, executor.submit(self._searchUntilStable, following, stop, settle_until))
+                        self.speculated += 1
+                        count('speculated')
+
+                    with phase('settle'):
+                        time.sleep(max(settle_until - time.monotonic(), 0))
+            finally:
+                if speculation != None:
+                    speculation[1].set()
+
+        return values
+
+
+    #---Internal Methods---#
+    def _resolve(self, step : Step, speculation : tuple):
+        '''
+        Return a step's search result, from its speculation if the screen it depends on has not
+         changed since, otherwise by searching the screen until the step's timeout.
+        '''
+        region = step.area()
+        if region == None:
+            return step.search(None)
+
+        frame = captureFrame(region)
+        previous = None
+        if speculation != None:
+            _, stop, future = speculation
+            stop.set()
+            speculative_frame, result = future.result()
+
+            # Keep the result if nothing it depends on changed since it was found
+            if result != None and _unchanged(speculative_frame, frame, step.valid(result, speculative_frame)):
+                self.hits += 1
+                count('speculation_hits')
+                return result
+
+            # A search that found nothing does not need repeating on a screen that is the same
+            if result == None:
+                previous = speculative_frame
+
+        # Search the screen as it is now, polling until the timeout
+        poller = AdaptivePoller()
+        deadline = time.monotonic() + step.timeout
+        while True:
+            tiles = changedTiles(previous, frame)
+            if tiles.any():
+                result = step.search(frame)
+                if result != None:
+                    return result
+            if time.monotonic() >= deadline:
+                raise step.failure()
+
+            with phase('poll'):
+                time.sleep(max(min(poller.next(float(tiles.mean())), deadline - time.monotonic()), 0))
+            previous, frame = frame, captureFrame(region)
+
+    def _searchUntilStable(self, step : Step, stop : threading.Event, settle_until : float) -> tuple:
+        '''
+        Search a step's region on the background thread, searching again each time the screen
+         changes, until the screen is still or the step starts. Returns the last frame and its result.
+        '''
+        region = step.area()
+        poller = AdaptivePoller()
+        latest = None
+        while not stop.is_set():
+            frame = captureFrame(region)
+            tiles = changedTiles(latest[0] if latest != None else None, frame)
+
+            # Once the settle time is up and the screen stopped changing, the result can be used
+            if not tiles.any():
+                if time.monotonic() >= settle_until:
+                    break
+            else:
+                latest = (frame, step.search(frame))
+
+            stop.wait(poller.next(float(tiles.mean())))
+        return latest if latest != None else (None, None)
+
+
+#---Internal Functions---#
+def _unchanged(previous : Frame, current : Frame, region : list[int]) -> bool:
+    '''
+    Check if the part of two frames within a region is the same.
+    '''
+    if previous == None or previous.region != current.region:
+        return False
+    if not current.contains(region):
+        return False
+    return not changedTiles(previous.crop(region), current.crop(region), TILE_SIZE).any()
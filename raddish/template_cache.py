@@ -0,0 +1,438 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing the decoded template cache used by image searches.
+-----------------'''
+
+#---Imports---#
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from PIL import Image
+from .frame_source import _toPixels, _toGray, _downsample, _colourBins, COLOUR_LEVELS
+from .instrumentation import phase
+
+
+class Template:
+    '''
+    A decoded template image, converted to grayscale with the statistics
+     needed for normalized matching computed up front. Cached templates are shared by every
+     thread that searches for them, so the rest is built lazily under a lock.
+    '''
+
+    def __init__(self, pixels : np.ndarray, path : str = None, mtime : int = None, gray : np.ndarray = None):
+        '''
+        Initialize the 'Template' object.
+
+        Parameters
+        ----------
+        pixels : np.ndarray
+            An RGB array of shape (height, width, 3) holding the template, or None
+             for templates that only exist in grayscale such as pyramid levels.
+
+        path : str (Optional)
+            The path the template was loaded from.
+
+        mtime : int (Optional)
+            The modification time of the file when it was loaded, in nanoseconds.
+
+        gray : np.ndarray (Optional)
+            A precomputed grayscale version of the template.
+
+        Members
+        -------
+        gray : np.ndarray
+            The template as a float32 grayscale array.
+
+        mean : float
+            The mean of the grayscale pixels.
+
+        norm : float
+            The L2 norm of the grayscale pixels once the mean has been removed.
+        '''
+        self.pixels = pixels
+        self.path = path
+        self.mtime = mtime
+
+        # Precompute the grayscale conversion and its statistics
+        self.gray = _toGray(pixels) if gray is None else gray
+        self.mean = float(self.gray.mean())
+        self.centered = self.gray - np.float32(self.mean)
+        self.norm = float(np.sqrt(np.square(self.centered, dtype=np.float64).sum()))
+
+        # Lazily created PIL image, pyramid levels and their phase scores, blocks and colour histogram
+        self._lock = threading.RLock()
+        self._image = None
+        self._levels = [self]
+        self._phase_scores = {0: 1.0}
+        self._blocks = {}
+        self._colours = None
+
+    @classmethod
+    def fromArrays(cls, pixels : np.ndarray, gray : np.ndarray, centered : np.ndarray, mean : float, norm : float, \
+                   path : str = None, mtime : int = None) -> 'Template':
+        '''
+        Build a template from arrays and statistics computed ahead of time, such as those in an
+         asset bundle, without converting or copying anything.
+
+        Returns
+        -------
+        Template
+            A template that uses the given arrays as they are.
+        '''
+        template = cls.__new__(cls)
+        template.pixels = pixels
+        template.path = path
+        template.mtime = mtime
+        template.gray = gray
+        template.mean = mean
+        template.centered = centered
+        template.norm = norm
+        template._lock = threading.RLock()
+        template._image = None
+        template._levels = [template]
+        template._phase_scores = {0: 1.0}
+        template._blocks = {}
+        template._colours = None
+        return template
+
+    @property
+    def width(self) -> int:
+        return self.gray.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.gray.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        '''
+        The number of bytes held by the template's arrays.
+        '''
+        pixel_bytes = self.pixels.nbytes if self.pixels is not None else 0
+        return pixel_bytes + self.gray.nbytes + self.centered.nbytes
+
+    @property
+    def name(self) -> str:
+        return self.path if self.path != None else f'<{self.width}x{self.height} template>'
+
+    def image(self) -> Image.Image:
+        '''
+        Return the template as a PIL image, converting it only once.
+        '''
+        if self._image is None:
+            with self._lock:
+                if self._image is None:
+                    self._image = Image.fromarray(self.pixels)
+        return self._image
+
+    def pyramid(self, level : int) -> 'Template':
+        '''
+        Return the template downsampled by a factor of 2**level, building each
+         pyramid level only once.
+
+        Parameters
+        ----------
+        level : int
+            The pyramid level, where level 0 is the template itself.
+
+        Returns
+        -------
+        Template
+            A grayscale only template for the level.
+        '''
+        levels = self._levels
+        if len(levels) <= level:
+            with self._lock:
+                # Build the missing levels on a copy, so other threads only ever see complete levels
+                levels = list(self._levels)
+                while len(levels) <= level:
+                    levels.append(Template(None, gray=_downsample(levels[-1].gray)))
+                self._levels = levels
+        return levels[level]
+
+    def phaseScore(self, level : int) -> float:
+        '''
+        Return the worst score a pyramid level of the template gets against the same level of
+         a screen where the template is not aligned to the 2**level pixel grid. Fine details such
+         as thin text blur differently depending on where the grid falls, so a template with a
+         low phase score can be missed on that level even though it is on the screen.
+
+        Parameters
+        ----------
+        level : int
+            The pyramid level, where level 0 always scores 1.
+
+        Returns
+        -------
+        float
+            The lowest normalized correlation over every offset within a coarse pixel.
+        '''
+        if level in self._phase_scores:
+            return self._phase_scores[level]
+
+        with self._lock:
+            if level in self._phase_scores:
+                return self._phase_scores[level]
+
+            scale = 2 ** level
+            aligned = self.pyramid(level).gray
+            height, width = aligned.shape
+            worst = 1.0
+            for background in (0.0, 255.0):
+                for dy in range(scale):
+                    for dx in range(scale):
+                        # Place the template part way into a coarse pixel on a background it does not share
+                        canvas = np.full(((height + 3) * scale, (width + 3) * scale), background, dtype=np.float32)
+                        canvas[scale + dy:scale + dy + self.height, scale + dx:scale + dx + self.width] = self.gray
+                        for _ in range(level):
+                            canvas = _downsample(canvas)
+
+                        # The search refines the best coarse peak near the template, so keep the best neighbour
+                        best = max(_correlation(aligned, canvas[y:y + height, x:x + width]) for y in range(3) for x in range(3))
+                        worst = min(worst, best)
+            self._phase_scores[level] = worst
+            return worst
+
+    def blocks(self, grid : int) -> list[tuple]:
+        '''
+        Split the template into a grid of blocks. The mean of the centered pixels in each block and
+         how far they spread from it bound the score of any window from the sums of its own blocks.
+
+        Parameters
+        ----------
+        grid : int
+            The number of blocks along each side, fewer if the template is smaller than that.
+
+        Returns
+        -------
+        list[tuple]
+            The top, left, height, width, spread and mean of each block, where the spread is the
+             L2 norm of the block's centered pixels once the block's mean has been removed.
+        '''
+        blocks = self._blocks.get(grid)
+        if blocks is None:
+            rows = np.linspace(0, self.height, min(grid, self.height) + 1).astype(int)
+            columns = np.linspace(0, self.width, min(grid, self.width) + 1).astype(int)
+            blocks = []
+            for top, bottom in zip(rows[:-1], rows[1:]):
+                for left, right in zip(columns[:-1], columns[1:]):
+                    block = self.centered[top:bottom, left:right].astype(np.float64)
+                    mean = float(block.mean())
+                    spread = float(np.sqrt(np.square(block - mean).sum()))
+                    blocks.append((int(top), int(left), int(bottom - top), int(right - left), spread, mean))
+
+            # Blocks are cheap, so a thread that builds them at the same time as another only repeats the work
+            blocks = self._blocks.setdefault(grid, blocks)
+        return blocks
+
+    def colourHistogram(self) -> np.ndarray:
+        '''
+        Return how many of the template's pixels fall into each coarse colour bin.
+
+        Returns
+        -------
+        np.ndarray
+            An array of COLOUR_LEVELS ** 3 counts.
+        '''
+        if self._colours is None:
+            self._colours = np.bincount(_colourBins(self.pixels).ravel(), minlength=COLOUR_LEVELS ** 3)
+        return self._colours
+
+
+class TemplateCache:
+    '''
+    A size-bounded LRU cache of decoded templates. Entries are keyed on the
+     template's path and are reloaded whenever the file's modification time changes.
+    '''
+
+    def __init__(self, max_templates : int = 512, max_bytes : int = 256 * 1024 * 1024):
+        '''
+        Initialize the 'TemplateCache' object.
+
+        Parameters
+        ----------
+        max_templates : int (Default = 512)
+            The most templates to hold before the least recently used are evicted.
+
+        max_bytes : int (Default = 256 MiB)
+            The most bytes of decoded pixels to hold before the least recently used are evicted.
+        '''
+        self.max_templates = max_templates
+        self.max_bytes = max_bytes
+
+        # Counters exposed through 'stats'
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._templates = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, path : str) -> Template:
+        '''
+        Return the decoded template for a path, loading it on a miss.
+
+        Parameters
+        ----------
+        path : str
+            The path to the template image.
+
+        Returns
+        -------
+        Template
+            The decoded template.
+        '''
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+
+        with self._lock:
+            template = self._templates.get(path)
+
+            # Serve the cached template if the file has not changed since it was loaded
+            if template != None and template.mtime == mtime:
+                self._templates.move_to_end(path)
+                self.hits += 1
+                return template
+
+            self.misses += 1
+
+        # Decode outside the lock so other lookups are not held up
+        template = Template(_toPixels(path), path, mtime)
+
+        with self._lock:
+            self._discard(path)
+            self._templates[path] = template
+            self._bytes += template.nbytes
+            self._evict()
+
+        return template
+
+    def clear(self):
+        '''
+        Remove every template from the cache and reset the counters.
+        '''
+        with self._lock:
+            self._templates.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        '''
+        Return the cache's counters.
+
+        Returns
+        -------
+        dict
+            The hits, misses, evictions, hit rate, number of templates and bytes held.
+        '''
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'templates': len(self._templates),
+                'bytes': self._bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __contains__(self, path : str) -> bool:
+        return os.path.abspath(path) in self._templates
+
+
+    #---Internal Methods---#
+    def _discard(self, path : str):
+        '''
+        Remove a template from the cache if it is present.
+        '''
+        template = self._templates.pop(path, None)
+        if template != None:
+            self._bytes -= template.nbytes
+
+    def _evict(self):
+        '''
+        Evict the least recently used templates until the cache is within its bounds.
+        '''
+        while len(self._templates) > 1 and (len(self._templates) > self.max_templates or self._bytes > self.max_bytes):
+            _, template = self._templates.popitem(last=False)
+            self._bytes -= template.nbytes
+            self.evictions += 1
+
+
+#---Default Cache---#
+_default_cache = TemplateCache()
+
+# Asset bundles that templates are looked up in by name before any file is decoded
+_bundles = []
+
+def getTemplateCache() -> TemplateCache:
+    '''
+    Return the template cache shared by every raddish search.
+    '''
+    return _default_cache
+
+def addBundle(bundle):
+    '''
+    Serve templates from an asset bundle. Names and paths are looked up in bundles in the
+     order they were added, before falling back to decoding the file.
+
+    Parameters
+    ----------
+    bundle : AssetBundle
+        The bundle, or anything with a 'find' method that returns a template or None.
+    '''
+    if bundle not in _bundles:
+        _bundles.append(bundle)
+
+def removeBundle(bundle):
+    '''
+    Stop serving templates from an asset bundle added with 'addBundle'.
+    '''
+    if bundle in _bundles:
+        _bundles.remove(bundle)
+
+def getTemplate(image) -> Template:
+    '''
+    Return a decoded template for an image.
+
+    Parameters
+    ----------
+    image : str | Template | np.ndarray | PIL.Image.Image
+        The template to decode. Names and paths are served from any added asset bundles,
+         then from the shared cache.
+
+    Returns
+    -------
+    Template
+        The decoded template.
+    '''
+    if isinstance(image, Template):
+        return image
+    if isinstance(image, str):
+        with phase('template'):
+            for bundle in _bundles:
+                template = bundle.find(image)
+                if template != None:
+                    return template
+            return _default_cache.get(image)
+    with phase('template'):
+        return Template(_toPixels(image))
+
+
+#---Internal Functions---#
+def _correlation(first : np.ndarray, second : np.ndarray) -> float:
+    '''
+    Return the normalized correlation of two arrays of the same shape, or 1 if either is flat.
+    '''
+    first = first - first.mean()
+    second = second - second.mean()
+    norm = float(np.sqrt(np.square(first, dtype=np.float64).sum() * np.square(second, dtype=np.float64).sum()))
+    return float((first * second).sum(dtype=np.float64) / norm) if norm > 0 else 1.0
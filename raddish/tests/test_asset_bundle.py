@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+from raddish.frame_source import ArrayFrameSource, setFrameSource
+from raddish.template_cache import Template, getTemplate
+from raddish.image_search import locateImage
+from raddish.asset_bundle import compileBundle, loadBundle, AssetBundle
+
+RESOURCES = os.path.join(os.path.dirname(__file__), 'resources')
+
+class TestAssetBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.templates = os.path.join(self.directory.name, 'templates')
+        shutil.copytree(RESOURCES, self.templates)
+
+        self.path = os.path.join(self.directory.name, 'templates.rdb')
+        compileBundle(self.templates, self.path)
+
+    def test_bundle_holds_every_template(self):
+        bundle = AssetBundle(self.path)
+        self.addCleanup(bundle.close)
+        self.assertEqual(sorted(bundle.names()), sorted(os.listdir(RESOURCES)))
+
+        for name in bundle.names():
+            decoded = Template(np.asarray(Image.open(os.path.join(RESOURCES, name)).convert('RGB')))
+            template = bundle[name]
+            np.testing.assert_array_equal(template.pixels, decoded.pixels)
+            np.testing.assert_array_equal(template.gray, decoded.gray)
+            self.assertAlmostEqual(template.norm, decoded.norm, places=3)
+
+            # Pyramid levels and phase scores come from the bundle, without being computed again
+            self.assertGreater(len(template._levels), 1)
+            np.testing.assert_array_equal(template.pyramid(1).centered, decoded.pyramid(1).centered)
+            self.assertEqual(template.phaseScore(1), decoded.phaseScore(1))
+
+            # The arrays are views of the mapped file
+            self.assertFalse(template.gray.flags.writeable)
+
+    def test_lookup_by_name_and_path(self):
+        bundle = AssetBundle(self.path)
+        self.addCleanup(bundle.close)
+        template = bundle['btn_search.PNG']
+        self.assertIs(bundle.find('btn_search'), template)
+        self.assertIs(bundle.find(os.path.join(self.templates, 'btn_search.PNG')), template)
+        self.assertIsNone(bundle.find('missing.png'))
+
+    def test_changed_file_is_not_served(self):
+        bundle = AssetBundle(self.path)
+        self.addCleanup(bundle.close)
+        path = os.path.join(self.templates, 'btn_search.PNG')
+        Image.new('RGB', (20, 20), (255, 0, 0)).save(path)
+        os.utime(path, ns=(1, 1))
+
+        self.assertIsNone(bundle.find(path))
+        self.assertIsNotNone(bundle.find('btn_search.PNG'))
+
+    def test_name_that_is_a_changed_file_is_not_served(self):
+        bundle = AssetBundle(self.path)
+        self.addCleanup(bundle.close)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.templates)
+
+        # The same file is served by name, but not once it has changed
+        self.assertIsNotNone(bundle.find('btn_search.PNG'))
+        Image.new('RGB', (20, 20), (255, 0, 0)).save('btn_search.PNG')
+        self.assertIsNone(bundle.find('btn_search.PNG'))
+        self.assertIsNotNone(bundle.find('btn_search'))
+
+    def test_search_by_name(self):
+        bundle = loadBundle(self.path)
+        self.addCleanup(bundle.close)
+
+        template = getTemplate('lbl_vscode')
+        self.assertIs(template, bundle['lbl_vscode.PNG'])
+
+        screen = np.full((300, 400, 3), 90, dtype=np.uint8)
+        screen[100:100 + template.height, 150:150 + template.width] = template.pixels
+        setFrameSource(ArrayFrameSource(screen))
+        self.addCleanup(setFrameSource, None)
+
+        box = locateImage('lbl_vscode', hints=False)
+        self.assertEqual((box.left, box.top), (150, 100))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import asyncio
+import unittest
+import numpy as np
+from raddish.frame_source import SequenceFrameSource, setFrameSource
+from raddish.template_cache import Template
+from raddish.async_search import waitAny, waitGone
+
+class TestAsyncSearch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.blank = rng.integers(0, 255, (200, 300, 3), dtype=np.uint8)
+        self.shown = self.blank.copy()
+        self.shown[50:80, 100:140] = rng.integers(0, 255, (30, 40, 3), dtype=np.uint8)
+        self.dialog = Template(self.shown[50:80, 100:140].copy())
+        self.addCleanup(setFrameSource, None)
+
+    def test_wait_any_resolves_on_first_image(self):
+        missing = Template(np.random.default_rng(1).integers(0, 255, (30, 40, 3), dtype=np.uint8))
+        setFrameSource(SequenceFrameSource([self.blank, self.blank, self.shown]))
+        found, location = asyncio.run(waitAny([missing, self.dialog], timeout=5))
+        self.assertIs(found, self.dialog)
+        self.assertEqual((location.left, location.top), (100, 50))
+
+    def test_wait_gone(self):
+        setFrameSource(SequenceFrameSource([self.shown, self.blank]))
+        asyncio.run(waitGone(self.dialog, timeout=5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import threading
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from raddish import text_search
+from raddish.frame_source import Frame, FrameSource, getFrameSource, setFrameSource
+from raddish.template_cache import Template
+from raddish.image_search import locateImage
+from raddish.ocr_engine import Word
+from raddish.text_search import TextNotFoundException
+from raddish.capture_service import CaptureService
+from raddish.utility import ImageNotFoundException
+
+class ChangingSource(FrameSource):
+
+    def __init__(self, pixels):
+        self.pixels = pixels
+        self.grabs = 0
+
+    def grab(self, region = None):
+        self.grabs += 1
+        frame = Frame(self.pixels.copy())
+        return frame if region == None else frame.crop(region)
+
+    def size(self):
+        return (self.pixels.shape[1], self.pixels.shape[0])
+
+class FakeEngine:
+
+    def __init__(self):
+        self.words = []
+
+    def readWords(self, image, language, psm):
+        return list(self.words)
+
+def waitUntil(condition, timeout = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('The condition did not hold within the timeout.')
+        time.sleep(0.01)
+
+class TestCaptureService(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.blank = rng.integers(0, 255, (300, 400, 3), dtype=np.uint8)
+        self.template = Template(rng.integers(0, 255, (30, 40, 3), dtype=np.uint8))
+        self.screen = self.blank.copy()
+        self.screen[120:150, 200:240] = self.template.pixels
+        self.source = ChangingSource(self.blank)
+        self.addCleanup(setFrameSource, None)
+
+    def start(self, **options) -> CaptureService:
+        service = CaptureService(source=self.source, **options).start()
+        self.addCleanup(service.stop)
+        return service
+
+    def test_grabs_share_captures(self):
+        service = self.start(rate=50)
+        self.assertIs(getFrameSource(), service)
+
+        frames = []
+        def search():
+            for _ in range(20):
+                frames.append(getFrameSource().grab([0, 0, 200, 100]))
+                time.sleep(0.005)
+        threads = [threading.Thread(target=search) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Only the service captured from the source, however many searches grabbed
+        service.stop()
+        self.assertEqual(self.source.grabs, service.captures)
+        self.assertLess(service.captures, len(frames))
+        self.assertFalse(frames[0].pixels.flags.writeable)
+        self.assertIsNot(getFrameSource(), service)
+
+    def test_ring_reuses_released_arrays(self):
+        service = CaptureService(source=self.source, buffer_size=3)
+        held = service._capture()
+        for _ in range(10):
+            service._capture()
+
+        # The held frame kept its array, the others took turns with the rest of the ring
+        self.assertEqual(len(service._ring), 3)
+        self.source.pixels = self.screen
+        for _ in range(3):
+            service._capture()
+        np.testing.assert_array_equal(held.pixels, self.blank)
+
+        # Holding every array grows the ring rather than overwriting one
+        latest = service.latest()
+        for _ in range(2):
+            service._capture()
+        self.assertEqual(len(service._ring), 4)
+        np.testing.assert_array_equal(latest.pixels, self.screen)
+
+    def test_image_watcher(self):
+        service = self.start(rate=50)
+        appeared, gone = [], []
+        watcher = service.watchImage(self.template, on_success=appeared.append, on_fail=gone.append, region=[100, 100, 200, 100])
+
+        self.source.pixels = self.screen
+        waitUntil(lambda: len(appeared) == 1)
+        self.assertEqual((appeared[0].left, appeared[0].top), (200, 120))
+
+        self.source.pixels = self.blank
+        waitUntil(lambda: len(gone) == 1)
+        self.assertIsInstance(gone[0], ImageNotFoundException)
+        self.assertIsNone(watcher.location)
+
+        # A cancelled watcher is no longer checked
+        watcher.cancel()
+        checks = watcher.checks
+        self.source.pixels = self.screen
+        waitUntil(lambda: service.latest().pixels[120, 200].tolist() == self.screen[120, 200].tolist())
+        time.sleep(0.1)
+        self.assertEqual(watcher.checks, checks)
+
+    def test_pixel_watcher(self):
+        service = self.start(rate=50)
+        changes = []
+        watcher = service.watchPixels(lambda frame, regions: changes.append(regions), region=[0, 0, 200, 150])
+        waitUntil(lambda: watcher.checks == 1)
+
+        # Changes outside the region are ignored
+        changed = self.blank.copy()
+        changed[200:250, 300:350] = 0
+        self.source.pixels = changed
+        waitUntil(lambda: service.latest().pixels[200, 300].tolist() == [0, 0, 0])
+        time.sleep(0.1)
+        self.assertEqual(changes, [])
+
+        changed = changed.copy()
+        changed[40:60, 50:70] = 0
+        self.source.pixels = changed
+        waitUntil(lambda: len(changes) == 1)
+        left, top, width, height = changes[0][0]
+        self.assertTrue(left <= 50 and top <= 40 and left + width >= 70 and top + height >= 60)
+
+    def test_text_watcher(self):
+        engine = FakeEngine()
+        patch = mock.patch.object(text_search, 'getOCREngine', return_value=engine)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        service = self.start(rate=50)
+        appeared, gone = [], []
+        service.watchText('Error', on_success=appeared.append, on_fail=gone.append)
+
+        engine.words = [Word('Error', 20, 30, 40, 12, 95.0)]
+        self.source.pixels = self.screen
+        waitUntil(lambda: len(appeared) == 1)
+        self.assertEqual(appeared[0], (20, 30, 40, 12))
+
+        engine.words = []
+        self.source.pixels = self.blank
+        waitUntil(lambda: len(gone) == 1)
+        self.assertIsInstance(gone[0], TextNotFoundException)
+
+    def test_watcher_errors_are_kept(self):
+        service = self.start(rate=50)
+        def broken(frame, regions):
+            raise ValueError('broken')
+        watcher = service.watchPixels(broken)
+        waitUntil(lambda: watcher.checks == 1)
+        self.source.pixels = self.screen
+        waitUntil(lambda: watcher.error != None)
+        self.assertIsInstance(watcher.error, ValueError)
+        self.assertTrue(service._threads[1].is_alive())
+
+    def test_searches_use_the_latest_capture(self):
+        self.source.pixels = self.screen
+        self.start(rate=2)
+        grabs = self.source.grabs
+        box = locateImage(self.template, hints=False)
+        self.assertEqual((box.left, box.top), (200, 120))
+        self.assertLessEqual(self.source.grabs - grabs, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from raddish.frame_source import Frame
+from raddish.change_detection import changedTiles, changedRegions, mergeTiles, AdaptivePoller
+
+class TestChangeDetection(unittest.TestCase):
+
+    def setUp(self):
+        self.before = Frame(np.zeros((256, 256, 3), dtype=np.uint8))
+        pixels = np.zeros((256, 256, 3), dtype=np.uint8)
+        pixels[100:110, 200:210] = 255
+        self.after = Frame(pixels)
+
+    def test_changed_tiles(self):
+        tiles = changedTiles(self.before, self.after)
+        self.assertEqual(tiles.shape, (8, 8))
+        self.assertEqual(list(zip(*np.nonzero(tiles))), [(3, 6)])
+
+    def test_first_frame_is_all_changed(self):
+        self.assertTrue(changedTiles(None, self.after).all())
+
+    def test_regions_grow_by_margin(self):
+        tiles = changedTiles(self.before, self.after)
+        self.assertEqual(changedRegions(tiles, self.after, 20, 20), [[160, 64, 96, 96]])
+
+    def test_small_changes_add_up(self):
+        pixels = np.zeros((256, 256, 3), dtype=np.uint8)
+        searched = mergeTiles(None, self.before, changedTiles(None, self.before))
+        for step in range(1, 6):
+            pixels[0:10, 0:10] = step * 3
+            current = Frame(pixels.copy())
+            tiles = changedTiles(searched, current)
+            searched = mergeTiles(searched, current, tiles)
+
+            # Each step is below the threshold, but the second one adds up to a change
+            self.assertEqual(list(zip(*np.nonzero(tiles))), [(0, 0)] if step in (2, 4) else [])
+        self.assertEqual(int(searched.pixels[5, 5, 0]), 12)
+        self.assertEqual(int(searched.pixels[100, 100, 0]), 0)
+
+    def test_poller_backs_off_when_idle(self):
+        poller = AdaptivePoller(min_interval=0.1, max_interval=0.4, backoff=2)
+        self.assertEqual([poller.next(0), poller.next(0), poller.next(0), poller.next(0.5)], [0.2, 0.4, 0.4, 0.1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from raddish.display_runner import shard, aggregate, formatSummary, runTests, _runSuite, _readReport, _freeDisplay
+
+_SAMPLE_TESTS = '''
+import unittest
+
+class TestSample(unittest.TestCase):
+
+    def test_pass(self):
+        pass
+
+    def test_fail(self):
+        self.fail('expected')
+
+class TestOther(unittest.TestCase):
+
+    def test_skip(self):
+        self.skipTest('not here')
+'''
+
+class TestDisplayRunner(unittest.TestCase):
+
+    def test_shards_are_balanced_by_class(self):
+        tests = [f'module.TestA.test_{i}' for i in range(4)] + [f'module.TestB.test_{i}' for i in range(2)] + \
+                [f'module.TestC.test_{i}' for i in range(2)]
+        shards = shard(tests, 2)
+        self.assertEqual(shards, [tests[:4], tests[4:]])
+
+        # Earlier timings outweigh the number of tests
+        timings = {'module.TestB.test_0': 10.0}
+        shards = shard(tests, 2, timings)
+        self.assertEqual(shards, [tests[4:6], tests[:4] + tests[6:]])
+
+    def test_more_workers_than_classes(self):
+        shards = shard(['module.TestA.test_0'], 3)
+        self.assertEqual(sorted(len(members) for members in shards), [0, 0, 1])
+
+    def test_outcomes_are_collected(self):
+        def test_pass(case):
+            pass
+        def test_fail(case):
+            case.fail('expected')
+        def test_error(case):
+            raise ValueError('broken')
+        Sample = type('Sample', (unittest.TestCase,), {'test_pass': test_pass, 'test_fail': test_fail, 'test_error': test_error})
+
+        records = _runSuite(unittest.defaultTestLoader.loadTestsFromTestCase(Sample))
+        outcomes = {record['id'].rsplit('.', 1)[1] : record['outcome'] for record in records}
+        self.assertEqual(outcomes, {'test_pass': 'passed', 'test_fail': 'failed', 'test_error': 'error'})
+        self.assertIn('ValueError: broken', [record['message'] for record in records if record['outcome'] == 'error'][0])
+
+        summary = aggregate([{'display': ':99', 'duration': 1.5, 'results': records}], 1.5)
+        self.assertEqual(summary['counts'], {'passed': 1, 'failed': 1, 'error': 1})
+        self.assertFalse(summary['passed'])
+        self.assertIn('Ran 3 tests', formatSummary(summary))
+
+    def test_failing_subtests_are_recorded(self):
+        def test_subtests(case):
+            for i in range(3):
+                with case.subTest(i=i):
+                    case.assertLess(i, 1)
+        Sample = type('Sample', (unittest.TestCase,), {'test_subtests': test_subtests})
+
+        records = _runSuite(unittest.defaultTestLoader.loadTestsFromTestCase(Sample))
+        self.assertEqual([record['outcome'] for record in records], ['failed'])
+        self.assertEqual(records[0]['message'].count('AssertionError'), 2)
+        self.assertFalse(aggregate([{'display': ':99', 'duration': 0.1, 'results': records}])['passed'])
+
+    def test_tests_missing_from_a_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'worker0.json')
+            with open(output, 'w') as file:
+                json.dump({'display': ':99', 'duration': 0.1, 'results': []}, file)
+            report = _readReport(output, ['module.TestA.test_0'], ':99', '')
+        self.assertEqual([result['outcome'] for result in report['results']], ['error'])
+        self.assertFalse(aggregate([report])['passed'])
+
+    def test_worker_that_died(self):
+        report = _readReport('/nonexistent/report.json', ['module.TestA.test_0'], ':100', 'Segmentation fault')
+        self.assertEqual(report['results'][0]['outcome'], 'error')
+        self.assertIn('Segmentation fault', report['results'][0]['message'])
+
+    def test_free_display_skips_locked(self):
+        with tempfile.TemporaryDirectory() as directory:
+            open(os.path.join(directory, '.X99-lock'), 'w').close()
+            os.makedirs(os.path.join(directory, '.X11-unix'))
+            open(os.path.join(directory, '.X11-unix', 'X100'), 'w').close()
+            self.assertEqual(_freeDisplay(99, directory), 101)
+
+    @unittest.skipIf(shutil.which('Xvfb') == None, 'Xvfb is not installed')
+    def test_run_on_virtual_displays(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'test_sample.py'), 'w') as file:
+                file.write(_SAMPLE_TESTS)
+
+            summary = runTests(directory, displays=2, timings_path=None)
+            self.assertEqual(summary['counts'], {'passed': 1, 'failed': 1, 'skipped': 1})
+            self.assertEqual(len({worker['display'] for worker in summary['workers']}), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import gc
+import json
+import os
+import tempfile
+import unittest
+import weakref
+from unittest import mock
+import numpy as np
+from PIL import Image
+from raddish.frame_source import ArrayFrameSource, setFrameSource
+from raddish.template_cache import Template
+from raddish.image_search import locateImage, locateAllImages, waitForImage
+from raddish import failure_artifacts
+from raddish.failure_artifacts import FailureArtifacts, INDEX_FILE
+from raddish.utility import ImageNotFoundException
+
+class TestFailureArtifacts(unittest.TestCase):
+
+    def setUp(self):
+        # Noise in 4 pixel blocks, so the template is still found on the coarser pyramid levels
+        rng = np.random.default_rng(0)
+        self.pixels = rng.integers(0, 255, (75, 100, 3), dtype=np.uint8).repeat(4, axis=0).repeat(4, axis=1)
+        self.template = Template(self.pixels[100:140, 200:260].copy())
+
+        # A template that only nearly matches, with part of it changed
+        near = self.template.pixels.copy()
+        near[:, :20] = 255 - near[:, :20]
+        self.near = Template(near)
+
+        setFrameSource(ArrayFrameSource(self.pixels))
+        self.addCleanup(setFrameSource, None)
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.artifacts = FailureArtifacts(self.directory.name)
+        self.addCleanup(self.artifacts.close)
+
+    def entries(self) -> list[dict]:
+        self.artifacts.flush()
+        with open(os.path.join(self.directory.name, INDEX_FILE)) as file:
+            return [json.loads(line) for line in file]
+
+    def test_failure_is_attached(self):
+        with self.assertRaises(ImageNotFoundException) as raised:
+            locateImage(self.near, region=[100, 50, 300, 200], hints=False)
+        failure = raised.exception.failure
+        self.assertEqual(failure.region, [100, 50, 300, 200])
+        self.assertEqual((failure.frame.left, failure.frame.top), (100, 50))
+        self.assertEqual((failure.nearMiss().left, failure.nearMiss().top), (200, 100))
+        self.assertLess(failure.nearMiss().score, 0.9)
+
+    def test_artifacts_are_written(self):
+        with self.assertRaises(ImageNotFoundException):
+            locateImage(self.near, on_fail=self.artifacts, hints=False)
+
+        entry, = self.entries()
+        self.assertEqual(entry['region'], [0, 0, 400, 300])
+        self.assertEqual(entry['near_miss'], [200, 100, 60, 40])
+        self.assertLess(entry['score'], 0.9)
+        self.assertEqual(entry['frame_origin'], [0, 0])
+
+        # The frame is stored losslessly, so the near miss can be checked again offline
+        with Image.open(os.path.join(self.directory.name, entry['frame_file'])) as image:
+            np.testing.assert_array_equal(np.asarray(image), self.pixels)
+        with Image.open(os.path.join(self.directory.name, entry['template_file'])) as image:
+            np.testing.assert_array_equal(np.asarray(image), self.near.pixels)
+
+    def test_kept_near_miss_is_not_searched_again(self):
+        with mock.patch.object(failure_artifacts, 'findBest') as findBest:
+            with self.assertRaises(ImageNotFoundException):
+                locateImage(self.near, on_fail=self.artifacts, hints=False)
+            entry, = self.entries()
+        findBest.assert_not_called()
+        self.assertEqual(entry['near_miss'], [200, 100, 60, 40])
+
+    def test_write_errors_are_logged(self):
+        with self.assertRaises(ImageNotFoundException) as raised:
+            locateImage(self.near, hints=False)
+        with mock.patch.object(self.artifacts, '_save', side_effect=OSError('disk full')):
+            with self.assertLogs('raddish.failure_artifacts', 'ERROR') as logs:
+                self.artifacts(raised.exception)
+                self.artifacts.flush()
+        self.assertIn('disk full', logs.output[0])
+
+    def test_unused_writers_are_collected(self):
+        artifacts = FailureArtifacts(self.directory.name)
+        reference = weakref.ref(artifacts)
+        artifacts.close()
+        del artifacts
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_repeated_failures_are_deduplicated(self):
+        for _ in range(3):
+            with self.assertRaises(ImageNotFoundException):
+                locateAllImages(self.near, on_fail=self.artifacts)
+
+        entries = self.entries()
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(len({entry['frame_file'] for entry in entries}), 1)
+        self.assertEqual(self.artifacts.written, 2)
+        self.assertEqual(self.artifacts.duplicates, 4)
+
+        # The near miss is searched for on the writer's thread when the search did not keep one
+        self.assertEqual(entries[0]['near_miss'], [200, 100, 60, 40])
+
+    def test_wait_failure(self):
+        with self.assertRaises(ImageNotFoundException) as raised:
+            waitForImage(self.near, timeout=0, hints=False)
+        self.artifacts(raised.exception)
+        self.assertEqual(self.entries()[0]['near_miss'], [200, 100, 60, 40])
+
+    def test_exceptions_without_failures_are_ignored(self):
+        self.artifacts(ImageNotFoundException('not from a search'))
+        self.artifacts.flush()
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, INDEX_FILE)))
+
+if __name__ == '__main__':
+    unittest.main()
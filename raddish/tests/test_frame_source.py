@@ -0,0 +1,52 @@
+import threading
+import unittest
+import numpy as np
+from raddish.frame_source import ArrayFrameSource, Frame, SequenceFrameSource
+
+class TestFrameSource(unittest.TestCase):
+
+    def setUp(self):
+        self.pixels = np.zeros((100, 200, 3), dtype=np.uint8)
+        self.pixels[10:20, 30:40] = 255
+        self.source = ArrayFrameSource(self.pixels)
+
+    def test_size(self):
+        self.assertEqual(self.source.size(), (200, 100))
+
+    def test_crop_keeps_screen_position(self):
+        frame = self.source.grab([30, 10, 10, 10])
+        self.assertEqual(frame.region, [30, 10, 10, 10])
+        self.assertTrue((frame.pixels == 255).all())
+
+    def test_crop_is_clipped(self):
+        frame = self.source.grab([190, 90, 50, 50])
+        self.assertEqual(frame.region, [190, 90, 10, 10])
+
+    def test_sequence_holds_last_frame(self):
+        source = SequenceFrameSource([np.zeros((4, 4, 3), dtype=np.uint8), np.ones((4, 4, 3), dtype=np.uint8)])
+        source.grab()
+        self.assertEqual(source.grab().pixels[0, 0, 0], 1)
+        self.assertEqual(source.grab().pixels[0, 0, 0], 1)
+
+    def test_conversions_are_shared_between_threads(self):
+        # Watchers and the script search the same capture at once, and must all see the same complete levels
+        pixels = np.random.default_rng(0).integers(0, 255, (540, 960, 3), dtype=np.uint8)
+        for _ in range(50):
+            frame = Frame(pixels)
+            barrier = threading.Barrier(4)
+            results = []
+            def search():
+                barrier.wait()
+                results.append((frame.pyramid(2), frame.integral(1)))
+            threads = [threading.Thread(target=search) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual({level.shape for level, _ in results}, {(135, 240)})
+            self.assertEqual(len({id(level) for level, _ in results}), 1)
+            self.assertEqual(len({id(tables) for _, tables in results}), 1)
+
+if __name__ == '__main__':
+    unittest.main()
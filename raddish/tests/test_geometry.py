@@ -0,0 +1,30 @@
+import unittest
+from raddish.geometry import Rect
+
+class TestRect(unittest.TestCase):
+
+    def setUp(self):
+        self.rect = Rect(100, 100, 200, 100)
+
+    def test_intersection(self):
+        self.assertEqual(self.rect.intersection(Rect(250, 150, 100, 100)), Rect(250, 150, 50, 50))
+        self.assertTrue(self.rect.intersection(Rect(0, 0, 10, 10)).isEmpty())
+
+    def test_union(self):
+        self.assertEqual(self.rect.union(Rect(0, 0, 10, 10)), Rect(0, 0, 300, 200))
+
+    def test_expand(self):
+        self.assertEqual(self.rect.expand(10), Rect(90, 90, 220, 120))
+        self.assertEqual(self.rect.expand(10, 0), Rect(90, 100, 220, 100))
+
+    def test_subdivide_covers_rect(self):
+        cells = Rect(0, 0, 101, 51).subdivide(2, 3)
+        self.assertEqual(len(cells), 6)
+        self.assertEqual(sum(cell.area for cell in cells), 101 * 51)
+
+    def test_usable_as_region(self):
+        self.assertEqual(list(self.rect), [100, 100, 200, 100])
+        self.assertEqual(self.rect[2], 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from raddish import instrumentation
+from raddish.frame_source import ArrayFrameSource, setFrameSource
+from raddish.template_cache import Template
+from raddish.image_search import locateImage
+from raddish.utility import ImageNotFoundException
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.pixels = rng.integers(0, 255, (300, 400, 3), dtype=np.uint8)
+        self.template = Template(self.pixels[100:140, 200:260].copy())
+        self.missing = Template(rng.integers(0, 255, (40, 60, 3), dtype=np.uint8))
+        setFrameSource(ArrayFrameSource(self.pixels))
+        self.addCleanup(setFrameSource, None)
+
+        instrumentation.reset()
+        instrumentation.enable()
+        self.addCleanup(instrumentation.disable)
+        self.addCleanup(instrumentation.reset)
+
+    def test_calls_are_recorded(self):
+        calls = []
+        instrumentation.addListener(calls.append)
+        self.addCleanup(instrumentation.removeListener, calls.append)
+
+        locateImage(self.template, hints=False)
+        with self.assertRaises(ImageNotFoundException):
+            locateImage(self.missing, hints=False)
+
+        self.assertEqual([call.function for call in calls], ['locateImage', 'locateImage'])
+        self.assertIn('capture', calls[0].phases)
+        self.assertIn('match', calls[0].phases)
+        self.assertGreater(calls[0].fields['score'], 0.99)
+        self.assertEqual(calls[0].fields['region_area'], 400 * 300)
+        self.assertEqual(calls[1].error, 'ImageNotFoundException')
+
+        summary = instrumentation.summary()
+        self.assertEqual(summary['functions']['locateImage']['count'], 2)
+        self.assertEqual(summary['counters']['locateImage.errors'], 1)
+        self.assertIn('locateImage', instrumentation.report())
+
+    def test_fields_are_aggregated(self):
+        locateImage(self.template, hints=False)
+        with self.assertRaises(ImageNotFoundException):
+            locateImage(self.missing, hints=False)
+
+        fields = instrumentation.summary()['fields']['locateImage']
+        self.assertEqual(fields['region_area']['count'], 2)
+        self.assertEqual(fields['region_area']['max'], 400 * 300)
+        self.assertGreaterEqual(fields['score']['count'], 1)
+        self.assertGreater(fields['score']['max'], 0.99)
+        self.assertIn('locateImage.score', instrumentation.report())
+        self.assertIn('locateImage.region_area', instrumentation.report())
+
+    def test_disabled_records_nothing(self):
+        instrumentation.disable()
+        locateImage(self.template, hints=False)
+        self.assertEqual(instrumentation.summary()['functions'], {})
+
+    def test_save_summary(self):
+        locateImage(self.template, hints=False)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'summary.json')
+            instrumentation.saveSummary(path)
+            with open(path) as file:
+                self.assertIn('locateImage', json.load(file)['functions'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+from pyscreeze import Box
+from raddish.frame_source import ArrayFrameSource, setFrameSource
+from raddish.image_search import locateImage
+from raddish.location_hints import HintStore, setHintStore
+
+class CountingSource(ArrayFrameSource):
+
+    def __init__(self, pixels):
+        super().__init__(pixels)
+        self.grabs = 0
+
+    def grab(self, region = None):
+        self.grabs += 1
+        return super().grab(region)
+
+class TestHintStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = HintStore()
+        self.region = [0, 0, 1920, 1080]
+
+    def test_no_hint_searches_region(self):
+        self.assertEqual(self.store.candidates('button.png', self.region), [('region', self.region)])
+
+    def test_hint_tiers_are_clipped(self):
+        self.store.record('button.png', self.region, Box(10, 10, 40, 30))
+        tiers = self.store.candidates('button.png', self.region)
+        self.assertEqual([tier for tier, _ in tiers], ['hint', 'neighbourhood', 'region'])
+        self.assertEqual(tiers[0][1], [8, 8, 44, 34])
+        self.assertEqual(tiers[1][1], [0, 0, 114, 104])
+
+    def test_hints_are_per_region(self):
+        self.store.record('button.png', self.region, Box(10, 10, 40, 30))
+        self.assertIsNone(self.store.get('button.png', [0, 0, 800, 600]))
+
+    def test_save_and_load(self):
+        path = os.path.join(tempfile.mkdtemp(), 'hints.json')
+        self.addCleanup(os.remove, path)
+        self.store.record('button.png', self.region, Box(10, 10, 40, 30))
+        self.store.save(path)
+        loaded = HintStore(path, autosave=False)
+        self.assertEqual(loaded.get('button.png', self.region), Box(10, 10, 40, 30))
+
+    def test_a_hint_miss_captures_once(self):
+        rng = np.random.default_rng(0)
+        pixels = rng.integers(0, 255, (300, 400, 3), dtype=np.uint8)
+        path = os.path.join(tempfile.mkdtemp(), 'button.png')
+        self.addCleanup(os.remove, path)
+        Image.fromarray(pixels[200:240, 300:360]).save(path)
+
+        # The image has moved far away from where it was last found
+        setHintStore(self.store)
+        self.addCleanup(setHintStore, None)
+        self.store.record(path, [0, 0, 400, 300], Box(10, 10, 60, 40))
+        source = CountingSource(pixels)
+        setFrameSource(source)
+        self.addCleanup(setFrameSource, None)
+
+        box = locateImage(path, region=[0, 0, 400, 300])
+        self.assertEqual((box.left, box.top), (300, 200))
+        self.assertEqual(source.grabs, 1)
+        self.assertEqual(self.store.stats()['hits']['region'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
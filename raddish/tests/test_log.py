@@ -1,14 +1,59 @@
+import json
+import logging
+import os
+import tempfile
 import unittest
-from unittest.mock import patch
+import numpy as np
+from raddish import log
 from raddish.log import Log
 
 class TestLog(unittest.TestCase):
 
     def setUp(self):
-        self.log = Log()
+        # Start each test with fresh handlers writing to a temporary directory
+        log._stopListener()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(log._stopListener)
+        self.log = Log(directory=self.directory.name, console=False)
+
+    def records(self):
+        self.log.flush()
+        with open(self.log.path) as file:
+            return [json.loads(line) for line in file]
 
     def test_write_debug(self):
         self.log.write('Debug message', 'DEBUG')
+        self.assertEqual(self.records()[0]['level'], 'DEBUG')
+
+    def test_handlers_are_shared(self):
+        second = Log()
+        self.assertEqual(second.path, self.log.path)
+        queue_handlers = [handler for handler in logging.getLogger(log.__name__).handlers if isinstance(handler, logging.handlers.QueueHandler)]
+        self.assertEqual(len(queue_handlers), 1)
+        second.write('Only once')
+        self.assertEqual(len(self.records()), 1)
+
+    def test_numpy_fields(self):
+        self.log.write('Found button', location=np.array([10, 20, 30, 40]), score=np.float32(0.5))
+        record, = self.records()
+        self.assertEqual(record['location'], [10, 20, 30, 40])
+        self.assertEqual(record['score'], 0.5)
+
+    def test_different_settings_warn(self):
+        with self.assertWarns(RuntimeWarning) as warned:
+            second = Log(directory=os.path.join(self.directory.name, 'other'), console=False)
+        self.assertIn('directory', str(warned.warning))
+        self.assertEqual(second.path, self.log.path)
+
+    def test_fields_and_steps(self):
+        with self.log.step('login'):
+            self.log.write('Found button', location=(10, 20, 30, 40), score=0.97)
+        first, timing = self.records()
+        self.assertEqual(first['step'], 'login')
+        self.assertEqual(first['location'], [10, 20, 30, 40])
+        self.assertEqual(timing['status'], 'passed')
+        self.assertIn('duration', timing)
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import numpy as np
+from raddish.frame_source import Frame
+from raddish.template_cache import Template
+import os
+from PIL import Image
+from raddish import instrumentation
+from raddish.matcher import matchTemplate, findBest, findAll, _pyramidLevel, _prefilter
+
+class TestMatcher(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.pixels = rng.integers(0, 255, (600, 800, 3), dtype=np.uint8)
+        self.template = Template(self.pixels[120:160, 300:350].copy())
+
+    def test_scores_match_template_exactly(self):
+        scores = matchTemplate(Frame(self.pixels).gray(), self.template)
+        self.assertEqual(scores.shape, (600 - 40 + 1, 800 - 50 + 1))
+        self.assertAlmostEqual(float(scores[120, 300]), 1.0, places=4)
+
+    def test_find_best_with_pyramid(self):
+        match = findBest(Frame(self.pixels), self.template)
+        self.assertEqual((match.left, match.top), (300, 120))
+        self.assertGreater(match.score, 0.99)
+
+    def test_find_best_without_pyramid(self):
+        match = findBest(Frame(self.pixels), self.template, pyramid=False)
+        self.assertEqual((match.left, match.top), (300, 120))
+
+    def test_find_all_in_screen_coordinates(self):
+        frame = Frame(self.pixels).crop([200, 100, 300, 200])
+        matches = findAll(frame, self.template)
+        self.assertEqual([(match.left, match.top) for match in matches], [(300, 120)])
+
+    def test_find_all_off_the_pyramid_grid(self):
+        # Thin details blur differently on a coarse level depending on where the pixel grid falls
+        with Image.open(os.path.join(os.path.dirname(__file__), 'resources', 'lbl_dots.PNG')) as image:
+            template = Template(np.asarray(image.convert('RGB')))
+        screen = np.full((600, 800, 3), 90, dtype=np.uint8)
+        positions = [(101, 51), (302, 203), (505, 401), (640, 97)]
+        for x, y in positions:
+            screen[y:y + template.height, x:x + template.width] = template.pixels
+
+        matches = findAll(Frame(screen), template)
+        self.assertEqual(sorted((match.left, match.top) for match in matches), positions)
+
+    def test_smooth_template_uses_the_pyramid(self):
+        ramp = np.linspace(0, 255, 64, dtype=np.float32)
+        gray = np.add.outer(ramp, ramp) / 2
+        template = Template(np.repeat(gray[:, :, None], 3, axis=2).astype(np.uint8))
+        self.assertGreater(_pyramidLevel(Frame(self.pixels), template), 0)
+        self.assertGreater(template.phaseScore(1), 0.9)
+
+    def _interface(self) -> np.ndarray:
+        # Flat coloured rectangles, like windows and buttons, which give many coarse candidates
+        rng = np.random.default_rng(1)
+        screen = np.full((600, 800, 3), 200, dtype=np.uint8)
+        for _ in range(400):
+            x, y = rng.integers(0, 780), rng.integers(0, 580)
+            width, height = rng.integers(10, 60, 2)
+            screen[y:y + height, x:x + width] = rng.integers(0, 255, 3)
+        return screen
+
+    def test_prefilter_keeps_every_window_that_can_match(self):
+        screen = self._interface()[:300, :400]
+        frame = Frame(screen)
+        template = Template(screen[100:140, 150:200].copy())
+        scores = matchTemplate(frame.gray(), template)
+
+        y, x = np.mgrid[0:scores.shape[0], 0:scores.shape[1]]
+        for threshold in (0.3, 0.6, 0.9):
+            kept = _prefilter(frame.integral(), template, threshold, y, x)
+            self.assertTrue(kept[scores >= threshold].all())
+        self.assertLess(kept.mean(), 0.5)
+
+    def test_prefilter_does_not_change_matches(self):
+        screen = self._interface()
+        template = Template(screen[100:140, 150:200].copy())
+        for confidence in (0.9, 0.5):
+            self.assertEqual(findAll(Frame(screen), template, confidence), findAll(Frame(screen), template, confidence, prefilter=False))
+
+    def test_full_resolution_tables_are_built_per_tile(self):
+        screen = np.tile(self._interface(), (2, 2, 1))
+        template = Template(screen[700:740, 950:1000].copy())
+        frame = Frame(screen)
+        for colour in (False, True):
+            self.assertEqual(findAll(frame, template, 0.5, colour=colour), findAll(Frame(screen), template, 0.5, prefilter=False, colour=colour))
+        self.assertIn(tuple(findBest(frame, template).box()[:2]), {(150, 100), (950, 100), (150, 700), (950, 700)})
+
+        # Only the coarse levels keep their tables on the frame
+        self.assertNotIn(0, frame._integrals)
+
+    def test_rejection_rate_is_reported(self):
+        instrumentation.reset()
+        instrumentation.enable()
+        self.addCleanup(instrumentation.disable)
+        self.addCleanup(instrumentation.reset)
+
+        screen = self._interface()
+        template = Template(screen[100:140, 150:200].copy())
+        search = instrumentation.instrument('search', template=True)(lambda template: findAll(Frame(screen), template, 0.5))
+        search(template)
+
+        entry = instrumentation.summary()['prefilter'][template.name]
+        self.assertGreater(entry['rejected'], 0)
+        self.assertAlmostEqual(entry['rejection_rate'], entry['rejected'] / entry['windows'])
+        self.assertIn('prefilter', instrumentation.report())
+
+    def test_colour_prefilter(self):
+        # The same pattern in two colours scores the same in grayscale
+        pattern = np.zeros((40, 60), dtype=bool)
+        pattern[5:35, 5:55] = True
+        red = np.where(pattern[:, :, None], np.uint8([200, 40, 40]), np.uint8([20, 20, 20]))
+        blue = np.where(pattern[:, :, None], np.uint8([40, 40, 200]), np.uint8([20, 20, 20]))
+        screen = np.full((300, 400, 3), 128, dtype=np.uint8)
+        screen[48:88, 48:108] = red
+        screen[148:188, 248:308] = blue
+
+        template = Template(red)
+        for pyramid in (True, False):
+            matches = findAll(Frame(screen), template, pyramid=pyramid)
+            self.assertEqual(sorted((match.left, match.top) for match in matches), [(48, 48), (248, 148)])
+            matches = findAll(Frame(screen), template, pyramid=pyramid, colour=True)
+            self.assertEqual([(match.left, match.top) for match in matches], [(48, 48)])
+
+    def test_find_best_among_look_alike_widgets(self):
+        # A grid of buttons that only differ by their labels gives more close coarse peaks than are always refined
+        rng = np.random.default_rng(2)
+        screen = np.full((720, 1280, 3), 235, dtype=np.uint8)
+        positions = []
+        for row in range(6):
+            for column in range(5):
+                x, y = 40 + column * 240 + row % 3, 40 + row * 110 + column % 2
+                screen[y:y + 40, x:x + 120] = 90
+                screen[y + 1:y + 39, x + 1:x + 119] = 225
+                screen[y + 14:y + 26, x + 20:x + 100] = np.where(rng.random((12, 80, 1)) < 0.3, 0, 225)
+                positions.append((x, y))
+
+        frame = Frame(screen)
+        for x, y in positions:
+            template = Template(screen[y:y + 40, x:x + 120].copy())
+            for prefilter in (True, False):
+                match = findBest(frame, template, prefilter=prefilter)
+                self.assertEqual((match.left, match.top), (x, y))
+        self.assertGreater(_pyramidLevel(frame, template), 0)
+
+    def test_template_larger_than_frame(self):
+        self.assertIsNone(findBest(Frame(self.pixels[:10, :10]), self.template))
+
+if __name__ == '__main__':
+    unittest.main()
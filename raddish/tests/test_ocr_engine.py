@@ -0,0 +1,122 @@
+import queue
+import threading
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from raddish import ocr_engine
+from raddish.ocr_engine import OCREngine, Word
+
+class FakeWorker:
+
+    def __init__(self, language):
+        self.language = language
+        self.closed = False
+
+    def read(self, gray, psm):
+        return f'{self.language}:{gray.shape}:{psm}'
+
+    def close(self):
+        self.closed = True
+
+class TestOCREngine(unittest.TestCase):
+
+    def setUp(self):
+        self.patch = mock.patch.object(ocr_engine, '_startWorker', side_effect=FakeWorker)
+        self.start = self.patch.start()
+        self.engine = OCREngine(workers=2)
+
+    def tearDown(self):
+        self.engine.close()
+        self.patch.stop()
+
+    def test_workers_are_reused(self):
+        image = np.zeros((20, 40, 3), dtype=np.uint8)
+        self.assertEqual(self.engine.read(image), 'eng:(20, 40):3')
+        self.engine.read(image, psm=7)
+        self.assertEqual(self.start.call_count, 1)
+
+    def test_workers_per_language(self):
+        image = np.zeros((20, 40), dtype=np.uint8)
+        self.engine.read(image, 'eng')
+        self.assertEqual(self.engine.read(image, 'deu'), 'deu:(20, 40):3')
+        self.assertEqual(self.start.call_count, 2)
+
+    def test_pool_is_bounded(self):
+        image = np.zeros((20, 40), dtype=np.uint8)
+        threads = [threading.Thread(target=self.engine.read, args=(image,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(self.start.call_count, 2)
+
+    def test_close_stops_workers(self):
+        self.engine.read(np.zeros((20, 40), dtype=np.uint8))
+        worker = self.engine._all[0]
+        self.engine.close()
+        self.assertTrue(worker.closed)
+
+    def test_close_fails_waiting_threads(self):
+        class WaitingQueue(queue.LifoQueue):
+            def get(self, *args, **kwargs):
+                waiting.release()
+                return super().get(*args, **kwargs)
+        waiting = threading.Semaphore(0)
+
+        engine = OCREngine(workers=1)
+        engine._idle['eng'] = WaitingQueue()
+        worker = engine._acquire('eng')
+        errors = []
+        def read():
+            try:
+                engine.read(np.zeros((20, 40), dtype=np.uint8))
+            except RuntimeError as e:
+                errors.append(e)
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for _ in threads:
+            self.assertTrue(waiting.acquire(timeout=5))
+
+        # Every thread waiting for the only worker is woken with an error
+        engine.close()
+        for thread in threads:
+            thread.join(5)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(len(errors), 2)
+        engine._release('eng', worker)
+        self.assertTrue(worker.closed)
+
+    def test_library_is_loaded_once(self):
+        loads = []
+        def find():
+            loads.append(threading.get_ident())
+            time.sleep(0.05)
+            return 'library'
+        with mock.patch.object(ocr_engine, '_findLibrary', side_effect=find), \
+             mock.patch.multiple(ocr_engine, _library=None, _library_loaded=False):
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(ocr_engine._loadLibrary())) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results, ['library'] * 4)
+        self.assertEqual(len(loads), 1)
+
+class TestCommandWorker(unittest.TestCase):
+
+    def test_read_words_parses_tsv(self):
+        tsv = 'level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n' \
+              '4\t1\t1\t1\t1\t0\t5\t5\t90\t20\t-1\t\n' \
+              '5\t1\t1\t1\t1\t1\t5\t5\t40\t20\t96.5\tHello\n' \
+              '5\t1\t1\t1\t1\t2\t50\t5\t45\t20\t91.0\tworld\n'
+        worker = ocr_engine._CommandWorker('eng')
+        with mock.patch.object(worker, '_run', return_value=tsv.encode()):
+            words = worker.readWords(np.zeros((30, 100), dtype=np.uint8), 3)
+        self.assertEqual(words, [Word('Hello', 5, 5, 40, 20, 96.5), Word('world', 50, 5, 45, 20, 91.0)])
+        self.assertEqual(words[1].box(), (50, 5, 45, 20))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from PIL import Image
+from raddish.ocr_preprocess import Pipeline, adaptiveThreshold, getPipeline, invert, otsuThreshold, pad, toGray, upscale
+
+class TestOCRPreprocess(unittest.TestCase):
+
+    def setUp(self):
+        # Dark text on a light background
+        self.gray = np.full((20, 40), 220, dtype=np.uint8)
+        self.gray[5:15, 10:30] = 40
+
+    def test_gray_matches_pil(self):
+        rgb = np.random.default_rng(0).integers(0, 255, (10, 10, 3), dtype=np.uint8)
+        expected = np.asarray(Image.fromarray(rgb).convert('L')).astype(int)
+        self.assertLessEqual(np.abs(toGray(rgb).astype(int) - expected).max(), 1)
+
+    def test_upscale(self):
+        scaled = upscale(self.gray, 3)
+        self.assertEqual(scaled.shape, (60, 120))
+        self.assertTrue((scaled[::3, ::3] == self.gray).all())
+
+    def test_otsu_separates_text(self):
+        binary = otsuThreshold(self.gray)
+        self.assertEqual(set(np.unique(binary)), {0, 255})
+        self.assertTrue((binary[5:15, 10:30] == 0).all())
+
+    def test_adaptive_handles_gradient(self):
+        gradient = np.tile(np.linspace(60, 250, 40, dtype=np.uint8), (20, 1))
+        gradient[8:12, 5:35] -= 50
+        binary = adaptiveThreshold(gradient, block=15)
+        self.assertTrue((binary[8:12, 5:35] == 0).all())
+        self.assertTrue((binary[0:4, 8:32] == 255).all())
+
+    def test_adaptive_profile_handles_dark_theme(self):
+        # Light text on a dark background comes out as solid dark text on white
+        dark = np.full((40, 80), 30, dtype=np.uint8)
+        dark[15:25, 20:60] = 220
+        binary = getPipeline('adaptive')(dark, copy=True)
+        self.assertEqual(binary.shape, (100, 180))
+        text = binary[10 + 30:10 + 50, 10 + 40:10 + 120]
+        self.assertTrue((text == 0).all())
+        self.assertGreater((binary == 255).mean(), 0.7)
+        self.assertTrue((binary[:10] == 255).all())
+
+    def test_invert_only_dark_backgrounds(self):
+        self.assertIs(invert(self.gray), self.gray)
+        dark = 255 - self.gray
+        self.assertTrue((invert(dark) == self.gray).all())
+
+    def test_pad_uses_background(self):
+        padded = pad(self.gray, 5)
+        self.assertEqual(padded.shape, (30, 50))
+        self.assertEqual(padded[0, 0], 220)
+
+    def test_pipeline_reuses_buffers(self):
+        pipeline = getPipeline('screen')
+        first = pipeline(self.gray)
+        second = pipeline(self.gray)
+        self.assertIs(first, second)
+        self.assertIsNot(pipeline(self.gray, copy=True), second)
+
+    def test_unknown_stage(self):
+        with self.assertRaises(ValueError):
+            Pipeline(['sharpen'])
+        with self.assertRaises(ValueError):
+            getPipeline('missing')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import queue
+import unittest
+from raddish.overlay import Overlay
+
+class TestOverlay(unittest.TestCase):
+
+    def setUp(self):
+        # Collect commands without starting the overlay process
+        self.overlay = Overlay()
+        self.overlay.commands = queue.Queue()
+        self.overlay.start = lambda: None
+
+    def test_draw_returns_unique_keys(self):
+        first = self.overlay.draw([0, 0, 10, 10])
+        second = self.overlay.draw([5, 5, 10, 10], color='blue', label='second', timeout=None)
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.overlay.commands.get_nowait(), ('draw', first, [0, 0, 10, 10], 'red', None, 2500))
+        self.assertEqual(self.overlay.commands.get_nowait(), ('draw', second, [5, 5, 10, 10], 'blue', 'second', None))
+
+    def test_clear(self):
+        key = self.overlay.draw([0, 0, 10, 10])
+        self.overlay.clear(key)
+        self.overlay.commands.get_nowait()
+        self.assertEqual(self.overlay.commands.get_nowait(), ('clear', key))
+
+if __name__ == '__main__':
+    unittest.main()
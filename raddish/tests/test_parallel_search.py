@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+from raddish.frame_source import Frame
+from raddish.template_cache import Template
+from raddish.matcher import Match, findAll
+from raddish.parallel_search import findAllParallel, _tiles, _dedupe, _templateState, _workerTemplate
+
+class TestParallelSearch(unittest.TestCase):
+
+    def test_tiles_cover_every_window(self):
+        frame = Frame(np.zeros((1080, 1920, 3), dtype=np.uint8))
+        template = Template(np.zeros((30, 40, 3), dtype=np.uint8))
+        covered = np.zeros((1080 - 30 + 1, 1920 - 40 + 1), dtype=bool)
+        for x, y, width, height in _tiles(frame, template, 8):
+            covered[y:y + height - 30 + 1, x:x + width - 40 + 1] = True
+        self.assertTrue(covered.all())
+
+    def test_dedupe_keeps_best_along_seam(self):
+        matches = [Match(100, 100, 40, 30, 0.95), Match(101, 100, 40, 30, 0.97), Match(300, 100, 40, 30, 0.91)]
+        self.assertEqual(_dedupe(matches), [matches[1], matches[2]])
+
+    def test_pool_matches_single_process(self):
+        rng = np.random.default_rng(0)
+        screen = rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8)
+        template = Template(rng.integers(0, 255, (30, 40, 3), dtype=np.uint8))
+        for x, y in ((100, 50), (955, 530), (1870, 1040), (500, 700)):
+            screen[y:y + 30, x:x + 40] = template.pixels
+        frame = Frame(screen, 10, 20)
+
+        parallel = findAllParallel(frame, template, 0.9, workers=2)
+        self.assertEqual(sorted(match[:4] for match in parallel), sorted(match[:4] for match in findAll(frame, template, 0.9)))
+        self.assertEqual(len(parallel), 4)
+
+    def test_workers_reuse_prepared_templates(self):
+        template = Template(np.random.default_rng(0).integers(0, 255, (30, 40, 3), dtype=np.uint8))
+        template.phaseScore(1)
+        prepared = _workerTemplate(_templateState(template))
+        self.assertIs(_workerTemplate(_templateState(template)), prepared)
+        self.assertEqual(prepared.phaseScore(1), template.phaseScore(1))
+        self.assertIs(prepared.centered, template.centered)
+
+if __name__ == '__main__':
+    unittest.main()
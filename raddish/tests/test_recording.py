@@ -0,0 +1,130 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import numpy as np
+from raddish import instrumentation
+from raddish.frame_source import SequenceFrameSource, setFrameSource, getFrameSource
+from raddish.template_cache import Template
+from raddish.image_search import locateImage, waitForImage
+from raddish.recording import Recorder, Recording, ReplayFrameSource, KEYFRAME_INTERVAL
+
+class TestRecording(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.blank = rng.integers(0, 255, (300, 400, 3), dtype=np.uint8)
+        self.template = Template(rng.integers(0, 255, (30, 40, 3), dtype=np.uint8))
+        self.screen = self.blank.copy()
+        self.screen[120:150, 200:240] = self.template.pixels
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'run.rdrec')
+        self.addCleanup(setFrameSource, None)
+        self.addCleanup(instrumentation.reset)
+
+    def record(self, frames : list):
+        setFrameSource(SequenceFrameSource(frames))
+        with Recorder(self.path) as recorder:
+            self.assertIs(getFrameSource(), recorder)
+            waitForImage(self.template, timeout=5, hints=False)
+            locateImage(self.template, region=[150, 100, 150, 100], hints=False)
+        self.assertNotIsInstance(getFrameSource(), Recorder)
+        self.assertFalse(instrumentation.isEnabled())
+        return recorder
+
+    def test_frames_round_trip(self):
+        recorder = self.record([self.blank, self.blank, self.screen])
+        self.assertEqual(recorder.frames, 4)
+
+        with Recording(self.path) as recording:
+            self.assertEqual(len(recording), 4)
+            self.assertEqual(recording.size, (400, 300))
+            np.testing.assert_array_equal(recording.frame(0).pixels, self.blank)
+            np.testing.assert_array_equal(recording.frame(2).pixels, self.screen)
+            np.testing.assert_array_equal(recording.frame(1).pixels, self.blank)
+
+            region = recording.frame(3)
+            self.assertEqual((region.left, region.top, region.width, region.height), (150, 100, 150, 100))
+            np.testing.assert_array_equal(region.pixels, self.screen[100:200, 150:300])
+
+    def test_deltas_are_small(self):
+        self.record([self.blank, self.blank, self.screen])
+
+        # Only the keyframe holds a whole screen, the frames after it only what changed
+        size = os.path.getsize(self.path)
+        self.assertLess(size, self.blank.nbytes * 1.2 + self.template.pixels.nbytes * 2)
+
+    def test_calls_and_results(self):
+        self.record([self.blank, self.blank, self.screen])
+
+        with Recording(self.path) as recording:
+            self.assertEqual([call['function'] for call in recording.calls], ['waitForImage', 'locateImage'])
+            self.assertEqual(recording.calls[0]['result'], [200, 120, 40, 30])
+            self.assertEqual(recording.calls[0]['fields']['attempts'], 3)
+            self.assertEqual(recording.framesDuring(recording.calls[0]), [0, 1, 2])
+
+    def test_keyframes_bound_seeking(self):
+        frames = [self.blank.copy() for _ in range(KEYFRAME_INTERVAL + 5)]
+        for index, frame in enumerate(frames):
+            frame[0, index] = 0
+        setFrameSource(SequenceFrameSource(frames))
+        with Recorder(self.path):
+            for _ in frames:
+                getFrameSource().grab()
+
+        with Recording(self.path) as recording:
+            for index in (len(frames) - 1, 3, KEYFRAME_INTERVAL, 4):
+                np.testing.assert_array_equal(recording.frame(index).pixels, frames[index])
+
+    def test_replay(self):
+        self.record([self.blank, self.blank, self.screen])
+
+        source = ReplayFrameSource(self.path)
+        self.addCleanup(source.close)
+        setFrameSource(source)
+        self.assertEqual(source.size(), (400, 300))
+
+        # The replay serves the same frames in the same order, without waiting between them
+        box = waitForImage(self.template, timeout=5, hints=False)
+        self.assertEqual((box.left, box.top), (200, 120))
+        self.assertEqual(source.index, 3)
+
+        # A region the recorded frame does not cover falls back to the last full frame, which is kept
+        with mock.patch.object(source.recording, 'frame', wraps=source.recording.frame) as decode:
+            frame = source.grab([0, 0, 100, 100])
+            decode.assert_not_called()
+        self.assertEqual((frame.left, frame.top, frame.width, frame.height), (0, 0, 100, 100))
+        np.testing.assert_array_equal(frame.pixels, self.screen[:100, :100])
+
+    def test_stop_while_grabbing(self):
+        recorder = Recorder(self.path, SequenceFrameSource([self.blank])).start()
+        self.addCleanup(recorder.stop)
+
+        # Stop recording from another thread between the capture and writing it out
+        class StoppingFrame:
+            left, top, timestamp = 0, 0, 0.0
+            @property
+            def pixels(frame):
+                thread = threading.Thread(target=recorder.stop)
+                thread.start()
+                thread.join()
+                return self.blank
+
+        recorder.source = mock.Mock(grab=mock.Mock(return_value=StoppingFrame()))
+        recorder.grab()
+        self.assertEqual(recorder.frames, 0)
+
+    def test_truncated_recording(self):
+        self.record([self.blank, self.blank, self.screen])
+        with open(self.path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.path) - 10)
+
+        with Recording(self.path) as recording:
+            self.assertGreater(len(recording), 0)
+            recording.frame(len(recording) - 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import itertools
+import unittest
+from unittest import mock
+import numpy as np
+from raddish.matcher import Match
+from raddish.results import MatchStream, _travelPath
+from raddish.frame_source import Frame, ArrayFrameSource, setFrameSource
+from raddish.template_cache import Template
+from raddish.image_search import clickAllImages, ClickNotRegisteredException
+
+def pathLength(points, path):
+    return sum(np.hypot(*(points[a] - points[b])) for a, b in zip(path, path[1:]))
+
+class TestMatchStream(unittest.TestCase):
+
+    def setUp(self):
+        self.matches = [
+            Match(300, 100, 40, 30, 0.99),
+            Match(302, 101, 40, 30, 0.95),
+            Match(100, 100, 40, 30, 0.97),
+            Match(100, 300, 40, 30, 0.93),
+        ]
+        self.consumed = 0
+
+    def source(self):
+        for match in self.matches:
+            self.consumed += 1
+            yield match
+
+    def test_suppresses_duplicates(self):
+        boxes = list(MatchStream(self.source()))
+        self.assertEqual([(box.left, box.top) for box in boxes], [(300, 100), (100, 100), (100, 300)])
+
+    def test_max_results_stops_scan(self):
+        boxes = list(MatchStream(self.source(), max_results=1))
+        self.assertEqual(len(boxes), 1)
+        self.assertEqual(self.consumed, 1)
+
+    def test_stop_when(self):
+        boxes = list(MatchStream(self.source(), stop_when=lambda box: box.left == 100))
+        self.assertEqual(len(boxes), 2)
+        self.assertEqual(self.consumed, 3)
+
+    def test_row_order(self):
+        boxes = list(MatchStream(self.source(), order='row'))
+        self.assertEqual([(box.left, box.top) for box in boxes], [(100, 100), (300, 100), (100, 300)])
+
+    def test_empty_stream(self):
+        self.assertIsNone(MatchStream([]).first())
+
+    def test_travel_orders(self):
+        # A grid of checkboxes, found in no particular order
+        rng = np.random.default_rng(0)
+        matches = [Match(100 + 60 * column, 100 + 40 * row, 20, 20, 0.95) for row in range(5) for column in range(8)]
+        matches = [matches[index] for index in rng.permutation(len(matches))]
+
+        for order in ('nearest', 'shortest'):
+            boxes = list(MatchStream(iter(matches), order=order))
+            self.assertEqual(len(boxes), len(matches))
+            self.assertEqual((boxes[0].left, boxes[0].top), (100, 100))
+            steps = [np.hypot(a.left - b.left, a.top - b.top) for a, b in zip(boxes, boxes[1:])]
+            self.assertLessEqual(sum(steps), 39 * 60)
+
+    def test_shortest_improves_on_nearest(self):
+        rng = np.random.default_rng(1)
+        for _ in range(5):
+            points = rng.uniform(0, 1000, (30, 2))
+            nearest = _travelPath(points, 'nearest')
+            shortest = _travelPath(points, 'shortest')
+            self.assertEqual(sorted(shortest), list(range(30)))
+            self.assertEqual(shortest[0], 0)
+            self.assertLessEqual(pathLength(points, shortest), pathLength(points, nearest) + 1e-6)
+
+        # Small sets reach the best open path from the first point
+        points = rng.uniform(0, 1000, (7, 2))
+        best = min(pathLength(points, (0,) + rest) for rest in itertools.permutations(range(1, 7)))
+        self.assertLess(pathLength(points, _travelPath(points, 'shortest')), best * 1.1)
+
+class LiveScreen(ArrayFrameSource):
+    '''
+    An in-memory screen that stamps every grab with the time it was captured, as the live screen does.
+    '''
+
+    def grab(self, region = None):
+        frame = Frame(self.frame.pixels)
+        return frame if region == None else frame.crop(region)
+
+class TestClickAllImages(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.template = Template(rng.integers(0, 255, (20, 20, 3), dtype=np.uint8))
+        screen = np.full((200, 300, 3), 90, dtype=np.uint8)
+        for left, top in [(200, 20), (20, 20), (110, 120)]:
+            screen[top:top + 20, left:left + 20] = self.template.pixels
+        self.source = LiveScreen(screen)
+        setFrameSource(self.source)
+        self.addCleanup(setFrameSource, None)
+
+        # pyautogui is imported when a click is made, so stand in for it before then
+        self.gui = mock.Mock()
+        patcher = mock.patch.dict('sys.modules', pyautogui=self.gui)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.gui.PAUSE = 0
+        self.gui.position.return_value = (0, 0)
+        self.gui.click.side_effect = self.tick
+        self.ignored = set()
+
+    def tick(self, box, **options):
+        # Clicking a box toggles it, unless the click is dropped
+        if (box.left, box.top) in self.ignored:
+            self.ignored.discard((box.left, box.top))
+            return
+        pixels = self.source.frame.pixels.copy()
+        area = pixels[box.top:box.top + box.height, box.left:box.left + box.width]
+        pixels[box.top:box.top + box.height, box.left:box.left + box.width] = self.template.pixels if (area == 0).all() else 0
+        self.source.frame = Frame(pixels)
+
+    def test_batch_clicks_without_pausing(self):
+        clicked = clickAllImages(self.template, order='shortest', batch=True, region=[0, 0, 300, 200])
+        self.assertEqual([(box.left, box.top) for box in clicked], [(20, 20), (110, 120), (200, 20)])
+        for call in self.gui.click.call_args_list:
+            self.assertEqual(call.kwargs, {'_pause': False})
+
+    def test_travel_orders_start_from_the_mouse(self):
+        self.gui.position.return_value = (290, 10)
+        clicked = clickAllImages(self.template, order='nearest', region=[0, 0, 300, 200])
+        self.assertEqual([(box.left, box.top) for box in clicked], [(200, 20), (110, 120), (20, 20)])
+
+    def test_batch_reports_dropped_clicks_without_retrying(self):
+        self.ignored = {(110, 120)}
+        with mock.patch('raddish.image_search.VERIFY_TIMEOUT', 0.1):
+            with self.assertRaises(ClickNotRegisteredException) as raised:
+                clickAllImages(self.template, order='row', batch=True, region=[0, 0, 300, 200])
+        self.assertEqual([(box.left, box.top) for box in raised.exception.locations], [(110, 120)])
+        self.assertEqual(self.gui.click.call_count, 3)
+
+    def test_batch_retries_dropped_clicks(self):
+        self.ignored = {(110, 120)}
+        with mock.patch('raddish.image_search.VERIFY_TIMEOUT', 0.1):
+            clicked = clickAllImages(self.template, order='row', batch=True, retry=True, region=[0, 0, 300, 200])
+        self.assertEqual(len(clicked), 3)
+        self.assertEqual(self.gui.click.call_count, 4)
+
+    def test_batch_waits_for_late_repaints(self):
+        # The three captures after the search still show the screen from before the clicks, as a
+        #  capture service's latest frame or a slow app would
+        stale = Frame(self.source.frame.pixels)
+        captures = []
+        grab = self.source.grab
+        def capture(region = None):
+            captures.append(region)
+            return stale.crop(region) if 1 < len(captures) <= 4 else grab(region)
+        self.source.grab = capture
+
+        clicked = clickAllImages(self.template, batch=True, region=[0, 0, 300, 200])
+        self.assertEqual(len(clicked), 3)
+        self.assertEqual(self.gui.click.call_count, 3)
+        self.assertTrue((self.source.frame.pixels[20:40, 20:40] == 0).all())
+
+    def test_batch_reports_clicks_that_never_register(self):
+        self.gui.click.side_effect = lambda box, **options: None
+        with mock.patch('raddish.image_search.VERIFY_TIMEOUT', 0.1):
+            with self.assertRaises(ClickNotRegisteredException) as raised:
+                clickAllImages(self.template, batch=True, region=[0, 0, 300, 200])
+        self.assertEqual(len(raised.exception.locations), 3)
+        self.assertEqual(self.gui.click.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+import numpy as np
+from pyscreeze import Box
+from raddish.frame_source import Frame, FrameSource, setFrameSource
+from raddish.template_cache import Template
+from raddish.steps import Plan, Find, Wait, Click, Type
+from raddish.utility import ImageNotFoundException
+
+class _Screens(FrameSource):
+    '''
+    A screen that moves on to the next of several images whenever something is clicked.
+    '''
+
+    def __init__(self, screens : list):
+        self.screens = screens
+        self.index = 0
+
+    def click(self, *args, **kwargs):
+        self.index = min(self.index + 1, len(self.screens) - 1)
+
+    def grab(self, region : list[int] = None) -> Frame:
+        frame = Frame(self.screens[self.index])
+        return frame if region == None else frame.crop(region)
+
+    def size(self) -> tuple[int]:
+        return (self.screens[0].shape[1], self.screens[0].shape[0])
+
+
+class TestSteps(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.first = Template(rng.integers(0, 255, (30, 40, 3), dtype=np.uint8))
+        self.second = Template(rng.integers(0, 255, (30, 40, 3), dtype=np.uint8))
+
+        blank = rng.integers(0, 255, (300, 400, 3), dtype=np.uint8)
+        before, after = blank.copy(), blank.copy()
+        before[50:80, 60:100] = self.first.pixels
+        after[200:230, 300:340] = self.second.pixels
+
+        self.screens = _Screens([before, after])
+        setFrameSource(self.screens)
+        self.addCleanup(setFrameSource, None)
+
+        # pyautogui is imported when a click is made, so stand in for it before then
+        self.gui = mock.Mock()
+        patcher = mock.patch.dict('sys.modules', pyautogui=self.gui)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.gui.click.side_effect = self.screens.click
+
+    def test_speculative_plan(self):
+        plan = Plan([Click(self.first), Click(self.second), Type('done')], settle=0.05)
+        values = plan.run()
+
+        self.assertEqual(values, [Box(60, 50, 40, 30), Box(300, 200, 40, 30), 'done'])
+        self.assertEqual([call.args[0] for call in self.gui.click.call_args_list], values[:2])
+        self.gui.write.assert_called_once_with('done', interval=0.0)
+        self.assertEqual((plan.speculated, plan.hits), (1, 1))
+
+    def test_plan_without_speculation(self):
+        plan = Plan([Click(self.first), Wait(self.second, timeout=1)], settle=0, speculate=False)
+        self.assertEqual(plan.run(), [Box(60, 50, 40, 30), Box(300, 200, 40, 30)])
+        self.assertEqual(plan.speculated, 0)
+
+    def test_stale_speculation_is_thrown_away(self):
+        # A speculative result found on a screen that has since changed under it
+        stale = Future()
+        stale.set_result((Frame(self.screens.screens[0]), Box(60, 50, 40, 30)))
+        self.screens.index = 1
+
+        plan = Plan([])
+        step = Find(self.first)
+        with self.assertRaises(ImageNotFoundException):
+            plan._resolve(step, (step, mock.Mock(), stale))
+        self.assertEqual(plan.hits, 0)
+
+    def test_missing_image_fails(self):
+        with self.assertRaises(ImageNotFoundException):
+            Plan([Click(self.second)], settle=0).run()
+        self.gui.click.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
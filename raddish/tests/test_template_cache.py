@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy as np
+from raddish.template_cache import Template, TemplateCache
+
+RESOURCES = os.path.join(os.path.dirname(__file__), 'resources')
+
+class TestTemplateCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TemplateCache(max_templates=2)
+
+    def test_hit_after_miss(self):
+        path = os.path.join(RESOURCES, 'btn_search.PNG')
+        first = self.cache.get(path)
+        second = self.cache.get(path)
+        self.assertIs(first, second)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test_eviction(self):
+        for name in ['btn_search.PNG', 'btn_Ports.PNG', 'lbl_dots.PNG']:
+            self.cache.get(os.path.join(RESOURCES, name))
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        self.assertNotIn(os.path.join(RESOURCES, 'btn_search.PNG'), self.cache)
+
+    def test_reload_on_mtime_change(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'template.png')
+        shutil.copy(os.path.join(RESOURCES, 'btn_search.PNG'), path)
+
+        first = self.cache.get(path)
+        os.utime(path, ns=(first.mtime + 10**9, first.mtime + 10**9))
+        self.assertIsNot(self.cache.get(path), first)
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def test_levels_are_shared_between_threads(self):
+        # Cached templates are searched from several threads at once, such as by concurrent async waits
+        pixels = np.random.default_rng(0).integers(0, 255, (1024, 1280, 3), dtype=np.uint8)
+        for _ in range(20):
+            template = Template(pixels)
+            barrier = threading.Barrier(4)
+            levels = []
+            def search():
+                barrier.wait()
+                levels.append(template.pyramid(3))
+            threads = [threading.Thread(target=search) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual({level.gray.shape for level in levels}, {(128, 160)})
+            self.assertEqual(len({id(level) for level in levels}), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+import numpy as np
+from raddish import text_reader
+from raddish.frame_source import ArrayFrameSource, setFrameSource
+from raddish.ocr_engine import Word
+from raddish.text_reader import readTextMany
+
+class FakeEngine:
+    '''
+    Reads every distinct dark shade in an image as a word named after the shade.
+    '''
+    workers = 2
+
+    def __init__(self):
+        self.calls = 0
+
+    def readWords(self, image, language, psm):
+        self.calls += 1
+        words = []
+        for shade in np.unique(image[image < 100]):
+            rows, columns = np.nonzero(image == shade)
+            words.append(Word(f'w{shade}', columns.min(), rows.min(), columns.max() - columns.min() + 1, rows.max() - rows.min() + 1, 95.0))
+        return words
+
+class TestReadTextMany(unittest.TestCase):
+
+    def setUp(self):
+        self.pixels = np.full((400, 600, 3), 255, dtype=np.uint8)
+        self.regions = [[10 + 50 * index, 20 + 30 * index, 40, 20] for index in range(6)]
+        for index, (x, y, width, height) in enumerate(self.regions):
+            self.pixels[y + 5:y + 15, x + 5:x + 15] = 10 + index
+        setFrameSource(ArrayFrameSource(self.pixels))
+        self.addCleanup(setFrameSource, None)
+        self.engine = FakeEngine()
+        patch = mock.patch.object(text_reader, 'getOCREngine', return_value=self.engine)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_words_map_back_to_regions(self):
+        results = readTextMany(self.regions)
+        self.assertEqual(results, {tuple(region) : f'w{10 + index}' for index, region in enumerate(self.regions)})
+        self.assertEqual(self.engine.calls, 1)
+
+    def test_tall_stacks_are_split(self):
+        with mock.patch.object(text_reader, 'MAX_STACK_HEIGHT', 100):
+            results = readTextMany(self.regions)
+        self.assertGreater(self.engine.calls, 1)
+        self.assertEqual(results[tuple(self.regions[5])], 'w15')
+
+    def test_join_words_by_line(self):
+        words = [Word('world', 60, 2, 40, 20, 90.0), Word('Hello', 5, 0, 40, 20, 90.0), Word('again', 5, 30, 40, 20, 90.0)]
+        self.assertEqual(text_reader._joinWords(words), 'Hello world\nagain')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest import mock
+import numpy as np
+from raddish import text_search
+from raddish.frame_source import ArrayFrameSource, setFrameSource
+from raddish.ocr_engine import Word
+from raddish.ocr_preprocess import Pipeline
+from raddish.text_search import TextNotFoundException, WordIndex, findText, indexText, waitForText
+
+WORDS = [Word('File', 10, 10, 30, 12, 95.0), Word('Submit', 100, 200, 50, 12, 96.0), Word('Order', 155, 200, 45, 12, 94.0),
+         Word('Cancel', 400, 201, 50, 12, 93.0), Word('Total:', 10, 300, 40, 12, 90.0), Word('$1,299.00', 55, 300, 70, 12, 88.0)]
+
+class FakeEngine:
+
+    def __init__(self, words):
+        self.words = words
+        self.calls = 0
+
+    def readWords(self, image, language, psm):
+        self.calls += 1
+        return list(self.words)
+
+class TestWordIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = WordIndex(WORDS)
+
+    def test_phrase_spans_words(self):
+        found = self.index.find('Submit Order')
+        self.assertEqual(len(found), 1)
+        self.assertEqual(found[0].box(), (100, 200, 100, 12))
+
+    def test_distant_words_are_separate_phrases(self):
+        self.assertEqual(self.index.find('Order Cancel'), [])
+
+    def test_match_modes(self):
+        self.assertEqual(self.index.find('submit'), [])
+        self.assertEqual(len(self.index.find('submit', match='ignorecase')), 1)
+        self.assertEqual(self.index.find('Cancle', match='fuzzy')[0].text, 'Cancel')
+        found = self.index.find(r'\$[\d,.]+', match='regex')
+        self.assertEqual((found[0].text, found[0].left), ('$1,299.00', 55))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            self.index.find('File', match='glob')
+
+class TestFindText(unittest.TestCase):
+
+    def setUp(self):
+        self.pixels = np.random.default_rng(0).integers(0, 255, (400, 600, 3), dtype=np.uint8)
+        setFrameSource(ArrayFrameSource(self.pixels))
+        self.addCleanup(setFrameSource, None)
+        text_search.clearTextCache()
+        self.engine = FakeEngine(WORDS)
+        patch = mock.patch.object(text_search, 'getOCREngine', return_value=self.engine)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_unchanged_screen_is_read_once(self):
+        self.assertEqual(findText('File'), (10, 10, 30, 12))
+        self.assertEqual(findText('Cancel'), (400, 201, 50, 12))
+        self.assertEqual(findText('order', match='ignorecase'), (155, 200, 45, 12))
+        self.assertEqual(self.engine.calls, 1)
+
+    def test_changed_screen_is_read_again(self):
+        findText('File')
+        self.pixels[0, 0] += 1
+        findText('File')
+        self.assertEqual(self.engine.calls, 2)
+
+    def test_not_found(self):
+        with self.assertRaises(TextNotFoundException):
+            waitForText('Missing', timeout=0)
+
+    def test_preprocessing_is_undone(self):
+        self.engine.words = [Word('File', 50, 50, 120, 48, 95.0)]
+        pipeline = Pipeline(['gray', ('upscale', {'factor': 4}), ('pad', {'border': 10})])
+        self.assertEqual(indexText(preprocess=pipeline).words[0].box(), (10, 10, 30, 12))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,16 +5,34 @@
 -----------------'''
 
 #---Imports---#
-import pytesseract
-import pyautogui
-from image_search import locateImage
-from utility import _determineRegion
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .frame_source import Frame, captureFrame
+from .geometry import Rect
+from .instrumentation import instrument, note, phase
+from .ocr_engine import DEFAULT_PSM, Word, getOCREngine
+from .ocr_preprocess import Pipeline, getPipeline, _borderShade
+from .search_rectangle import SearchRectangle
+from .utility import _determineRegion
 from pyscreeze import Box
 
+#---Constants---#
+# The page segmentation mode used to read many regions at once, which finds sparse text in any order
+SPARSE_PSM = 11
 
-def readText(region : Box = None, language : str = 'eng') -> str:
+# The number of blank pixels kept between regions stacked into one image, so words never run together
+STACK_GAP = 16
+
+# The tallest stacked image handed to Tesseract at once, larger batches are split up and read in parallel
+MAX_STACK_HEIGHT = 4096
+
+
+@instrument()
+def readText(region : Box = None, language : str = 'eng', search_rectangle : SearchRectangle = None, frame : Frame = None, \
+             psm : int = None, preprocess : Pipeline = None) -> str:
     '''
-    Read text from the screen using the Tesseract OCR engine.
+    Read text from the screen using the Tesseract OCR engine. Reads are handed to a pool of
+     warm Tesseract workers in memory, so no process is started and no file is written per call.
 
     Parameters
     ----------
@@ -25,28 +43,167 @@ def readText(region : Box = None, language : str = 'eng') -> str:
     language : str (Default = 'eng')
         The language that the Tesseract engine should use to read the text.
 
+    search_rectangle : SearchRectangle (Optional)
+        A search rectangle to read text in, used if no region is given.
+
+    frame : Frame (Optional)
+        A frame that has already been captured, to read from instead of capturing a new one.
+
+    psm : int (Optional)
+        The Tesseract page segmentation mode, such as 7 for a single line of text. Defaults
+          to the mode suited to the preprocessing profile, or 3 (fully automatic).
+
+    preprocess : str, list or Pipeline (Optional)
+        How to prepare the image before reading it, either the name of a profile in
+          'ocr_preprocess.PROFILES' such as 'screen' or 'label', a list of stages, or a pipeline.
+          By default the image is only converted to grayscale.
+
     Returns
     -------
     str
         The text that was read from the screen.
     '''
 
-    #---WIP---#
-
     # Check if a region is provided
-    #image = _determineRegion(region=region)
-
-    #region = (top, left, width, height)
+    region = _determineRegion(region, search_rectangle)
+    note(region_area=region[2] * region[3])
 
     # Take a screenshot of the region
-    # TODO: Region only works with hardcoded pixel values, need to fix this
-    screenshot = pyautogui.screenshot(region=Box(left=700, top=39, width=142, height=25))
+    frame = captureFrame(region) if frame == None else frame.crop(region)
 
-    # Upscale the image
-    enhanced_screenshot = screenshot.convert('L')
+    # Prepare the image for Tesseract
+    pipeline = getPipeline(preprocess)
+    with phase('preprocess'):
+        enhanced_screenshot = pipeline(frame.pixels)
+    psm = psm if psm != None else pipeline.psm if pipeline.psm != None else DEFAULT_PSM
     
     # Adjust the language parameter, translate to text
-    text = pytesseract.image_to_string(enhanced_screenshot, lang=language)
+    text = getOCREngine().read(enhanced_screenshot, language, psm)
 
     # Return the text
-    return text
\ No newline at end of file
+    return text
+
+
+@instrument()
+def readTextMany(regions : list, language : str = 'eng', frame : Frame = None, preprocess : Pipeline = None) -> dict:
+    '''
+    Read the text in many regions of the screen at once, such as every field of a form.
+     The screen is captured once and the regions are stacked into as few images as possible,
+     which are read in a single Tesseract pass each. Every word is then mapped back to the
+     region it came from by its bounding box.
+
+    Parameters
+    ----------
+    regions : list
+        The regions to read, each a list of four integers [left, top, width, height],
+          a Box, a Rect or a SearchRectangle.
+
+    language : str (Default = 'eng')
+        The language that the Tesseract engine should use to read the text.
+
+    frame : Frame (Optional)
+        A frame that has already been captured, to read from instead of capturing a new one.
+
+    preprocess : str, list or Pipeline (Optional)
+        How to prepare each region before it is stacked, as in 'readText'.
+
+    Returns
+    -------
+    dict
+        The text read in each region, keyed by the region as it was given. Regions given as
+          lists are keyed by the equivalent tuple.
+    '''
+    if len(regions) == 0:
+        return {}
+
+    # Resolve every region, then capture the area covering all of them once
+    areas = [_determineRegion(None, region) if isinstance(region, SearchRectangle) else _determineRegion(region) for region in regions]
+    if frame == None:
+        covered = Rect.fromRegion(areas[0])
+        for area in areas[1:]:
+            covered = covered.union(Rect.fromRegion(area))
+        frame = captureFrame(covered.toList())
+    # Cut every region out of the shared frame and prepare it on its own
+    pipeline = getPipeline(preprocess)
+    with phase('preprocess'):
+        crops = [pipeline(frame.crop(area).pixels, copy=True) for area in areas]
+
+    # Stack the crops into batches and read each batch in one pass
+    batches = _stackBatches(crops)
+    engine = getOCREngine()
+    with ThreadPoolExecutor(max_workers=max(min(len(batches), engine.workers), 1)) as pool:
+        readings = list(pool.map(lambda batch: engine.readWords(batch[0], language, SPARSE_PSM), batches))
+
+    # Hand every word back to the region it was placed in
+    words = [[] for _ in crops]
+    for (image, placements), batch_words in zip(batches, readings):
+        for word in batch_words:
+            center_x, center_y = word.left + word.width / 2, word.top + word.height / 2
+            for index, (x, y, width, height) in placements:
+                if x <= center_x < x + width and y <= center_y < y + height:
+                    words[index].append(word)
+                    break
+
+    return {_regionKey(region) : _joinWords(region_words) for region, region_words in zip(regions, words)}
+
+
+#---Internal Functions---#
+def _stackBatches(crops : list[np.ndarray]) -> list[tuple]:
+    '''
+    Stack crops on top of each other, separated by blank gaps, into batches no taller than 'MAX_STACK_HEIGHT'.
+     Returns each batch's image along with where each crop was placed in it as (index, [x, y, width, height]).
+    '''
+    # Group the crops into batches
+    groups, height = [[]], STACK_GAP
+    for index, crop in enumerate(crops):
+        if crop.size == 0:
+            continue
+        if len(groups[-1]) > 0 and height + crop.shape[0] + STACK_GAP > MAX_STACK_HEIGHT:
+            groups.append([])
+            height = STACK_GAP
+        groups[-1].append(index)
+        height += crop.shape[0] + STACK_GAP
+
+    batches = []
+    for group in groups:
+        if len(group) == 0:
+            continue
+
+        # Lay the crops out top to bottom on a blank image
+        width = max(crops[index].shape[1] for index in group) + STACK_GAP * 2
+        height = sum(crops[index].shape[0] + STACK_GAP for index in group) + STACK_GAP
+        image = np.empty((height, width), dtype=np.uint8)
+        placements = []
+        y = STACK_GAP
+        for index in group:
+            crop = crops[index]
+
+            # Fill the space around each crop with its own background so dark themes keep their contrast
+            image[y - STACK_GAP:y + crop.shape[0], :] = _borderShade(crop)
+            image[y:y + crop.shape[0], STACK_GAP:STACK_GAP + crop.shape[1]] = crop
+            placements.append((index, [STACK_GAP, y, crop.shape[1], crop.shape[0]]))
+            y += crop.shape[0] + STACK_GAP
+        image[y - STACK_GAP:, :] = _borderShade(crops[group[-1]])
+        batches.append((image, placements))
+
+    return batches
+
+def _joinWords(words : list[Word]) -> str:
+    '''
+    Join words into text, putting words that share a line together from left to right.
+    '''
+    lines = []
+    for word in sorted(words, key=lambda word: word.top + word.height / 2):
+        center = word.top + word.height / 2
+        if len(lines) > 0 and abs(center - lines[-1][0]) < word.height / 2:
+            lines[-1][1].append(word)
+        else:
+            lines.append((center, [word]))
+
+    return '\n'.join(' '.join(word.text for word in sorted(line, key=lambda word: word.left)) for _, line in lines)
+
+def _regionKey(region):
+    '''
+    Return the key a region's result is stored under, which is the region itself unless it is a list.
+    '''
+    return tuple(region) if isinstance(region, list) else region
@@ -0,0 +1,410 @@
+'''-----------------
+# Author: Parker Clark
+# Date: 10/18/2026
+# Description: A file containing functions related to finding and clicking text on the screen.
+-----------------'''
+
+#---Imports---#
+import difflib
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+import numpy as np
+from pyscreeze import Box
+from .frame_source import Frame, captureFrame
+from .change_detection import AdaptivePoller
+from .ocr_engine import Word, getOCREngine
+from .ocr_preprocess import Pipeline, getPipeline
+from .search_rectangle import SearchRectangle
+from .utility import _determineRegion, ImageNotFoundException
+from .instrumentation import instrument, phase, count
+
+#---Constants---#
+# The ways text can be matched against a query
+MATCH_MODES = ('exact', 'ignorecase', 'fuzzy', 'regex')
+
+# The page segmentation mode used to index the screen, which finds sparse text in any order
+INDEX_PSM = 11
+
+# The number of word indexes kept, one for each recently read frame
+INDEX_CACHE_SIZE = 16
+
+# Words further apart than this many times their height are not treated as one phrase
+PHRASE_GAP = 1.5
+
+
+class TextMatch(namedtuple('TextMatch', ['text', 'left', 'top', 'width', 'height', 'score'])):
+    '''
+    A phrase found on the screen, along with how closely it matched the query from 0 to 1.
+    '''
+    __slots__ = ()
+
+    def box(self) -> Box:
+        '''
+        Return the location of the phrase as a pyscreeze Box.
+        '''
+        return Box(self.left, self.top, self.width, self.height)
+
+
+class WordIndex:
+    '''
+    Every word read from a frame, grouped into phrases of words that sit next to each other
+     on a line. Any number of queries can be answered from an index without reading the
+     screen again.
+    '''
+
+    def __init__(self, words : list[Word]):
+        '''
+        Initialize the 'WordIndex' object.
+
+        Parameters
+        ----------
+        words : list[Word]
+            The words read from the screen, located in screen coordinates.
+        '''
+        self.words = words
+        self.phrases = _groupPhrases(words)
+
+    def find(self, query : str, match : str = 'exact', fuzziness : float = 0.8) -> list[TextMatch]:
+        '''
+        Find every place the query appears in the index.
+
+        Parameters
+        ----------
+        query : str
+            The text to find, which may span several words.
+
+        match : str (Default = 'exact')
+            How to compare text with the query, one of 'exact', 'ignorecase', 'fuzzy' (ignoring case
+              and allowing for OCR mistakes) or 'regex' (a regular expression searched for in each phrase).
+
+        fuzziness : float (Default = 0.8)
+            The lowest similarity from 0 to 1 that a 'fuzzy' match may have.
+
+        Returns
+        -------
+        list[TextMatch]
+            The matches, best first and then top to bottom.
+        '''
+        if match not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode '{match}', expected one of {MATCH_MODES}.")
+
+        matches = []
+        if match == 'regex':
+            pattern = re.compile(query)
+            for phrase in self.phrases:
+                text, starts = _phraseText(phrase)
+                for found in pattern.finditer(text):
+                    if found.end() > found.start():
+                        words = [word for word, start in zip(phrase, starts) if start < found.end() and start + len(word.text) > found.start()]
+                        matches.append(_textMatch(found.group(0), words, 1.0))
+        else:
+            # Compare the query with every run of the same number of words
+            terms = query.split()
+            if len(terms) == 0:
+                return []
+            wanted = ' '.join(terms) if match == 'exact' else ' '.join(terms).casefold()
+            for phrase in self.phrases:
+                for index in range(len(phrase) - len(terms) + 1):
+                    words = phrase[index:index + len(terms)]
+                    text = ' '.join(word.text for word in words)
+                    score = _similarity(text if match == 'exact' else text.casefold(), wanted, match)
+                    if score >= (fuzziness if match == 'fuzzy' else 1.0):
+                        matches.append(_textMatch(text, words, score))
+
+        return sorted(matches, key=lambda found: (-found.score, found.top, found.left))
+
+    def text(self) -> str:
+        '''
+        Return every phrase in the index, one per line.
+        '''
+        return '\n'.join(_phraseText(phrase)[0] for phrase in self.phrases)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+def indexText(region : list[int] = None, search_rectangle : SearchRectangle = None, language : str = 'eng', frame : Frame = None, \
+              preprocess : Pipeline = None) -> WordIndex:
+    '''
+    Read every word in a region of the screen into an index. Indexes are cached by the pixels
+     they were read from, so indexing a screen that has not changed does not run OCR again.
+
+    Parameters
+    ----------
+    region : list[int] (Optional)
+        A list of four integers that represent a region on the screen.
+          The list should be in this format: [x, y, width, height]
+
+    search_rectangle : SearchRectangle (Optional)
+        A SearchRectangle object that represents a region on the screen.
+
+    language : str (Default = 'eng')
+        The language that the Tesseract engine should use to read the text.
+
+    frame : Frame (Optional)
+        A frame that has already been captured, to read from instead of capturing a new one.
+
+    preprocess : str, list or Pipeline (Optional)
+        How to prepare the image before reading it, as in 'readText'.
+
+    Returns
+    -------
+    WordIndex
+        The words in the region, located in screen coordinates.
+    '''
+    region = _determineRegion(region, search_rectangle)
+    frame = captureFrame(region) if frame == None else frame.crop(region)
+    return _indexFrame(frame, language, getPipeline(preprocess))
+
+
+@instrument(template=True)
+def findText(text : str, region : list[int] = None, search_rectangle : SearchRectangle = None, match : str = 'exact', \
+             fuzziness : float = 0.8, language : str = 'eng', frame : Frame = None, preprocess : Pipeline = None) -> Box:
+    '''
+    Find text on the screen.
+
+    Parameters
+    ----------
+    text : str
+        The text to find, which may span several words.
+
+    region : list[int] (Optional)
+        A list of four integers that represent a region on the screen.
+          The list should be in this format: [x, y, width, height]
+
+    search_rectangle : SearchRectangle (Optional)
+        A SearchRectangle object that represents a region on the screen.
+
+    match : str (Default = 'exact')
+        How to compare text with the query, one of 'exact', 'ignorecase', 'fuzzy' or 'regex'.
+
+    fuzziness : float (Default = 0.8)
+        The lowest similarity from 0 to 1 that a 'fuzzy' match may have.
+
+    language : str (Default = 'eng')
+        The language that the Tesseract engine should use to read the text.
+
+    frame : Frame (Optional)
+        A frame that has already been captured, to search instead of capturing a new one.
+
+    preprocess : str, list or Pipeline (Optional)
+        How to prepare the image before reading it, as in 'readText'.
+
+    Returns
+    -------
+    Box
+        The location of the best match on the screen.
+    '''
+    matches = indexText(region, search_rectangle, language, frame, preprocess).find(text, match, fuzziness)
+    if len(matches) == 0:
+        raise TextNotFoundException(f"The text: '{text}' was not found on the screen.")
+    return matches[0].box()
+
+
+@instrument(template=True)
+def clickText(text : str, region : list[int] = None, search_rectangle : SearchRectangle = None, match : str = 'exact', \
+              fuzziness : float = 0.8, timeout = 0, language : str = 'eng', preprocess : Pipeline = None):
+    '''
+    Click on text on the screen. Will wait for the text to appear if a timeout is provided.
+
+    Parameters
+    ----------
+    text : str
+        The text to click on, which may span several words.
+
+    region : list[int] (Optional)
+        A list of four integers that represent a region on the screen.
+          The list should be in this format: [x, y, width, height]
+
+    search_rectangle : SearchRectangle (Optional)
+        A SearchRectangle object that represents a region on the screen.
+
+    match : str (Default = 'exact')
+        How to compare text with the query, one of 'exact', 'ignorecase', 'fuzzy' or 'regex'.
+
+    fuzziness : float (Default = 0.8)
+        The lowest similarity from 0 to 1 that a 'fuzzy' match may have.
+
+    timeout : int (Optional)
+        The amount of time in seconds to wait for the text to appear on the screen.
+
+    language : str (Default = 'eng')
+        The language that the Tesseract engine should use to read the text.
+
+    preprocess : str, list or Pipeline (Optional)
+        How to prepare the image before reading it, as in 'readText'.
+    '''
+    text_location = waitForText(text, region, search_rectangle, match, fuzziness, timeout, language, preprocess)
+    import pyautogui
+    with phase('click'):
+        pyautogui.click(text_location)
+
+
+@instrument(template=True)
+def waitForText(text : str, region : list[int] = None, search_rectangle : SearchRectangle = None, match : str = 'exact', \
+                fuzziness : float = 0.8, timeout = 0, language : str = 'eng', preprocess : Pipeline = None) -> Box:
+    '''
+    Wait for text to appear on the screen. Frames that have not changed since the last capture
+     are answered from the cached index, so OCR only runs when the screen does.
+
+    Parameters
+    ----------
+    text : str
+        The text to wait for, which may span several words.
+
+    region : list[int] (Optional)
+        A list of four integers that represent a region on the screen.
+          The list should be in this format: [x, y, width, height]
+
+    search_rectangle : SearchRectangle (Optional)
+        A SearchRectangle object that represents a region on the screen.
+
+    match : str (Default = 'exact')
+        How to compare text with the query, one of 'exact', 'ignorecase', 'fuzzy' or 'regex'.
+
+    fuzziness : float (Default = 0.8)
+        The lowest similarity from 0 to 1 that a 'fuzzy' match may have.
+
+    timeout : int (Optional)
+        The amount of time in seconds to wait for the text to appear on the screen.
+
+    language : str (Default = 'eng')
+        The language that the Tesseract engine should use to read the text.
+
+    preprocess : str, list or Pipeline (Optional)
+        How to prepare the image before reading it, as in 'readText'.
+
+    Returns
+    -------
+    Box
+        The location of the best match on the screen.
+    '''
+    region = _determineRegion(region, search_rectangle)
+    pipeline = getPipeline(preprocess)
+    poller = AdaptivePoller()
+    start_time = time.time()
+    previous = None
+
+    while True:
+        count('attempts')
+        frame = captureFrame(region)
+        index = _indexFrame(frame, language, pipeline)
+        matches = index.find(text, match, fuzziness)
+        if len(matches) > 0:
+            return matches[0].box()
+
+        if time.time() - start_time > timeout:
+            raise TextNotFoundException(f"The text: '{text}' was not found within the timeout period.")
+
+        # Back off while the screen shows the same index, without sleeping past the timeout
+        remaining = timeout - (time.time() - start_time)
+        with phase('poll'):
+            time.sleep(max(min(poller.next(0.0 if index is previous else 1.0), remaining), 0))
+        previous = index
+
+
+def clearTextCache():
+    '''
+    Forget every cached word index.
+    '''
+    with _cache_lock:
+        _cache.clear()
+
+
+#---Internal Functions---#
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _indexFrame(frame : Frame, language : str, pipeline : Pipeline) -> WordIndex:
+    '''
+    Return the word index of a frame, reading it only if the same pixels have not been read before.
+    '''
+    key = (_frameHash(frame), frame.left, frame.top, language, repr(pipeline))
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    # Read every word and move it from the prepared image back onto the screen
+    words = []
+    for word in getOCREngine().readWords(pipeline(frame.pixels), language, INDEX_PSM):
+        left, top, width, height = pipeline.unmap(word.left, word.top, word.width, word.height)
+        words.append(word._replace(left=frame.left + left, top=frame.top + top, width=width, height=height))
+    index = WordIndex(words)
+
+    with _cache_lock:
+        _cache[key] = index
+        while len(_cache) > INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+def _frameHash(frame : Frame) -> bytes:
+    '''
+    Hash the pixels of a frame.
+    '''
+    pixels = np.ascontiguousarray(frame.pixels)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(pixels.shape).encode())
+    digest.update(memoryview(pixels).cast('B'))
+    return digest.digest()
+
+def _groupPhrases(words : list[Word]) -> list[list[Word]]:
+    '''
+    Group words into lines, then split each line wherever there is a wide gap between two words.
+    '''
+    lines = []
+    for word in sorted(words, key=lambda word: word.top + word.height / 2):
+        center = word.top + word.height / 2
+        if len(lines) > 0 and abs(center - lines[-1][0]) < word.height / 2:
+            lines[-1][1].append(word)
+        else:
+            lines.append((center, [word]))
+
+    phrases = []
+    for _, line in lines:
+        line = sorted(line, key=lambda word: word.left)
+        phrases.append([line[0]])
+        for previous, word in zip(line, line[1:]):
+            if word.left - (previous.left + previous.width) > PHRASE_GAP * max(word.height, previous.height):
+                phrases.append([])
+            phrases[-1].append(word)
+    return phrases
+
+def _phraseText(phrase : list[Word]) -> tuple:
+    '''
+    Join the words of a phrase with spaces, returning the text and where each word starts in it.
+    '''
+    starts, position = [], 0
+    for word in phrase:
+        starts.append(position)
+        position += len(word.text) + 1
+    return ' '.join(word.text for word in phrase), starts
+
+def _similarity(text : str, query : str, match : str) -> float:
+    '''
+    Score how closely text matches a query.
+    '''
+    if match == 'fuzzy':
+        return difflib.SequenceMatcher(None, text, query).ratio()
+    return 1.0 if text == query else 0.0
+
+def _textMatch(text : str, words : list[Word], score : float) -> TextMatch:
+    '''
+    Build a match covering every one of the given words.
+    '''
+    left = min(word.left for word in words)
+    top = min(word.top for word in words)
+    right = max(word.left + word.width for word in words)
+    bottom = max(word.top + word.height for word in words)
+    return TextMatch(text, left, top, right - left, bottom - top, score)
+
+
+#---Exceptions---#
+class TextNotFoundException(ImageNotFoundException):
+    '''
+    An exception to be raised when text could not be found on the screen. It is a kind of
+     'ImageNotFoundException', so code that handles failed image searches handles it too.
+    '''
@@ -5,10 +5,18 @@
 -----------------'''
 
 #---Imports---#
-import pyautogui
-from pyautogui import ImageNotFoundException
 from pyscreeze import Box
-from search_rectangle import SearchRectangle
+from .search_rectangle import SearchRectangle
+from .frame_source import getFrameSource
+from .geometry import Rect
+
+# pyautogui connects to the display as soon as it is imported, which fails on a machine without
+#  one. Searches against file, array and replayed frames never need the display, so they raise
+#  the PyScreeze exception that pyautogui's own wraps whenever pyautogui cannot be loaded.
+try:
+    from pyautogui import ImageNotFoundException
+except Exception:
+    from pyscreeze import ImageNotFoundException
 
 def _validateArea(region : list[int]):
         '''
@@ -18,9 +26,12 @@ def _validateArea(region : list[int]):
         # Check if the SR is off the screen
         if region[0] < 0 or region[1] < 0:
             raise ImageNotFoundException("The region is off the screen.")
-        elif region[2] == 0 or region[3] == 0:
+        elif region[2] <= 0 or region[3] <= 0:
             raise ImageNotFoundException("The region has a negative/zero width or height.")
-        elif region[0] + region[2] > pyautogui.size()[0] or region[1] + region[3] > pyautogui.size()[1]:
+        
+        # Compare against the size of whatever the active frame source captures
+        screen_width, screen_height = getFrameSource().size()
+        if region[0] + region[2] > screen_width or region[1] + region[3] > screen_height:
             raise ImageNotFoundException("The region exceeds the screen.")
         
 def _determineRegion(region : list[int] = None, search_rectangle : SearchRectangle = None) -> list[int]:
@@ -31,9 +42,11 @@ def _determineRegion(region : list[int] = None, search_rectangle : SearchRectang
     # Check if a region is provided
     if region != None:
 
-        # If the region is a Box object, convert it to a list
+        # If the region is a Box or Rect object, convert it to a list
         if isinstance(region, Box):
             region = [region.left, region.top, region.width, region.height]
+        elif isinstance(region, Rect):
+            region = region.toList()
 
         # Validate the given points provided
         _validateArea(region)
@@ -50,7 +63,7 @@ def _determineRegion(region : list[int] = None, search_rectangle : SearchRectang
     else:
         
         # Get the screen size
-        width, height = pyautogui.size()
+        width, height = getFrameSource().size()
 
         # Return the entire screen
         return [0, 0, width, height]